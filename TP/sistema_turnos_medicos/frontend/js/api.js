@@ -200,6 +200,15 @@ class APIClient {
         return this.request(`/turnos/calendario/${medicoId}?${params}`);
     }
 
+    async getHorariosPorEspecialidad(especialidadId, dias = 14, limite = 10, duracion = 30) {
+        const params = new URLSearchParams({
+            dias: dias,
+            limite: limite,
+            duracion: duracion,
+        });
+        return this.request(`/turnos/disponibles/especialidad/${especialidadId}?${params}`);
+    }
+
     async getTurnosByMedico(medicoId) {
         return this.request(`/turnos/medico/${medicoId}`);
     }
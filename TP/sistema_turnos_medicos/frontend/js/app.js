@@ -895,7 +895,8 @@ async function cargarMisTurnos(page = null) {
         
         const params = new URLSearchParams({
             page: misTurnosState.currentPage,
-            page_size: misTurnosState.pageSize
+            page_size: misTurnosState.pageSize,
+            incluir_total: true  // la paginación numerada necesita total_pages
         });
         
         if (misTurnosState.currentDNI) {
@@ -1,7 +1,21 @@
 """
 Script principal del Sistema de Gestión de Turnos Médicos.
 Inicia el servidor web con FastAPI y Uvicorn.
+
+Modos de ejecución:
+    python main.py                   Un proceso: API + scheduler
+    python main.py --workers 4       4 workers de API + 1 proceso de scheduler
+    python main.py --solo-scheduler  Solo el scheduler de recordatorios
+    python main.py --reconstruir-estadisticas [--desde AAAA-MM-DD] [--hasta AAAA-MM-DD]
+                                     Recalcula el resumen diario de turnos y termina
+    python main.py --barrer-inasistencias
+                                     Marca INAS los turnos PEND/CONF vencidos y termina
+    python main.py --archivar        Mueve al archivo los turnos más viejos que ARCHIVO_HORIZONTE_DIAS y termina
 """
+import argparse
+import multiprocessing
+from datetime import date
+import os
 import sys
 import uvicorn
 from pathlib import Path
@@ -9,39 +23,217 @@ from pathlib import Path
 # Agregar el directorio src al path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
+from src.config.settings import config
+
+
+def preparar_base_datos():
+    """
+    Crea tablas, aplica migraciones y carga datos base una sola vez,
+    antes de levantar los workers, para que no compitan entre ellos.
+    """
+    from src.repositories.database import db_manager
+    from src.repositories.init_data import inicializar_datos_base
+
+    db_manager.initialize()
+    db_manager.create_tables()
+    inicializar_datos_base()
+    db_manager.close()
+
+    # Los procesos hijos heredan el entorno y omiten la inicialización
+    os.environ["INICIALIZAR_BD"] = "false"
+
+
+def ejecutar_scheduler():
+    """Ejecuta el scheduler de recordatorios en el proceso actual."""
+    import asyncio
+    from src.repositories.database import db_manager
+    from src.utils.scheduler import start_scheduler
+
+    db_manager.initialize()
+    try:
+        asyncio.run(start_scheduler())
+    except KeyboardInterrupt:
+        pass
+
+
+def reconstruir_estadisticas(desde: date = None, hasta: date = None):
+    """
+    Recalcula la tabla estadisticas_diarias desde los turnos (backfill).
+
+    Args:
+        desde: Primer día a reconstruir (todos si es None)
+        hasta: Último día a reconstruir (todos si es None)
+    """
+    from src.repositories.database import db_manager
+    from src.repositories.unit_of_work import UnitOfWork
+
+    db_manager.initialize()
+    db_manager.create_tables()
+
+    with UnitOfWork() as uow:
+        filas = uow.estadisticas.reconstruir(desde, hasta)
+        uow.commit()
+
+    db_manager.close()
+    print(f"Resumen diario reconstruido: {filas} filas")
+
+
+def ejecutar_proceso_unico():
+    """Ejecuta servidor y scheduler concurrentemente en un solo proceso."""
+    import asyncio
+    from src.utils.scheduler import start_scheduler
+
+    server_config = uvicorn.Config(
+        "src.api.app:app",
+        host=config.SERVER_HOST,
+        port=config.SERVER_PORT,
+        log_level="info"
+    )
+    server = uvicorn.Server(server_config)
+
+    async def iniciar_scheduler():
+        # Esperar a que la API cree las tablas y los datos base
+        while not server.started and not server.should_exit:
+            await asyncio.sleep(0.1)
+        await start_scheduler()
+
+    async def run_system():
+        # Ejecutar servidor y scheduler concurrentemente
+        await asyncio.gather(
+            server.serve(),
+            iniciar_scheduler()
+        )
+
+    asyncio.run(run_system())
+
+
+def ejecutar_multiproceso(workers: int):
+    """
+    Ejecuta N workers de uvicorn para la API y un único proceso de scheduler.
+
+    Args:
+        workers: Cantidad de procesos worker para la API
+    """
+    preparar_base_datos()
+    # Los workers lo leen de la configuración (ej. cache de reportes local a cada proceso)
+    os.environ["WEB_WORKERS"] = str(workers)
+
+    scheduler = multiprocessing.Process(target=ejecutar_scheduler, name="scheduler", daemon=True)
+    scheduler.start()
+    print(f"Scheduler iniciado en proceso {scheduler.pid}")
+
+    try:
+        uvicorn.run(
+            "src.api.app:app",
+            host=config.SERVER_HOST,
+            port=config.SERVER_PORT,
+            workers=workers,
+            log_level="info"
+        )
+    finally:
+        scheduler.terminate()
+        scheduler.join()
+
+
+def barrer_inasistencias():
+    """Ejecuta una vez el barrido de turnos vencidos del scheduler."""
+    from src.repositories.database import db_manager
+    from src.utils.scheduler import barrer_turnos_vencidos
+
+    db_manager.initialize()
+    db_manager.create_tables()
+    barrer_turnos_vencidos()
+    db_manager.close()
+
+
+def archivar():
+    """Ejecuta una vez el archivo de turnos históricos del scheduler."""
+    from src.repositories.database import db_manager
+    from src.utils.scheduler import archivar_historicos
+
+    db_manager.initialize()
+    db_manager.create_tables()
+    archivar_historicos()
+    db_manager.close()
+
 
 def main():
     """Función principal que inicia el servidor web."""
+    parser = argparse.ArgumentParser(description=config.APP_NAME)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=config.WEB_WORKERS,
+        help="Cantidad de procesos worker para la API (default: WEB_WORKERS o 1)"
+    )
+    parser.add_argument(
+        "--solo-scheduler",
+        action="store_true",
+        help="Ejecutar solo el scheduler de recordatorios, sin la API"
+    )
+    parser.add_argument(
+        "--reconstruir-estadisticas",
+        action="store_true",
+        help="Recalcular el resumen diario de turnos desde la tabla turnos y salir"
+    )
+    parser.add_argument(
+        "--desde",
+        type=date.fromisoformat,
+        help="Primer día a reconstruir (AAAA-MM-DD, con --reconstruir-estadisticas)"
+    )
+    parser.add_argument(
+        "--hasta",
+        type=date.fromisoformat,
+        help="Último día a reconstruir (AAAA-MM-DD, con --reconstruir-estadisticas)"
+    )
+    parser.add_argument(
+        "--barrer-inasistencias",
+        action="store_true",
+        help="Marcar como inasistidos los turnos pendientes/confirmados vencidos y salir"
+    )
+    parser.add_argument(
+        "--archivar",
+        action="store_true",
+        help="Mover al archivo histórico los turnos cerrados más viejos que ARCHIVO_HORIZONTE_DIAS y salir"
+    )
+    args = parser.parse_args()
+
+    if args.reconstruir_estadisticas:
+        reconstruir_estadisticas(args.desde, args.hasta)
+        return
+
+    if args.barrer_inasistencias:
+        barrer_inasistencias()
+        return
+
+    if args.archivar:
+        archivar()
+        return
+
+    if args.solo_scheduler:
+        print("Iniciando scheduler de recordatorios...")
+        ejecutar_scheduler()
+        return
+
     print("=" * 60)
     print("SISTEMA DE GESTIÓN DE TURNOS MÉDICOS")
     print("Universidad - Diseño y Arquitectura Orientada a Objetos")
     print("=" * 60)
     print()
-    print("Iniciando servidor web...")
+    print(f"Iniciando servidor web ({max(args.workers, 1)} worker/s)...")
     print()
     print("Acceda a la aplicación en:")
-    print("  → http://localhost:8000")
+    print(f"  → http://localhost:{config.SERVER_PORT}")
     print()
     print("Documentación de la API:")
-    print("  → http://localhost:8000/api/docs")
+    print(f"  → http://localhost:{config.SERVER_PORT}/api/docs")
     print("=" * 60)
     print()
-    
-    # Iniciar servidor Uvicorn y Scheduler
-    import asyncio
-    from src.utils.scheduler import start_scheduler
-    
-    config = uvicorn.Config("src.api.app:app", host="0.0.0.0", port=8000, log_level="info")
-    server = uvicorn.Server(config)
-    
-    async def run_system():
-        # Ejecutar servidor y scheduler concurrentemente
-        await asyncio.gather(
-            server.serve(),
-            start_scheduler()
-        )
-        
-    asyncio.run(run_system())
+
+    if args.workers > 1:
+        ejecutar_multiproceso(args.workers)
+    else:
+        ejecutar_proceso_unico()
 
 
 if __name__ == "__main__":
@@ -9,6 +9,8 @@ from fastapi.responses import HTMLResponse
 from pathlib import Path
 
 from src.api.routes import pacientes, medicos, especialidades, turnos, reportes
+from src.config.settings import config
+from src.repositories.async_database import async_db_manager
 from src.repositories.database import db_manager
 from src.repositories.init_data import inicializar_datos_base
 
@@ -51,13 +53,19 @@ async def startup_event():
     db_manager.initialize()
     print("✓ Gestor de BD inicializado")
     
-    # Crear tablas
-    db_manager.create_tables()
-    print("✓ Tablas creadas/verificadas")
+    # Motor async para los endpoints de alta concurrencia
+    async_db_manager.initialize()
+    print("✓ Gestor de BD async inicializado")
     
-    # Inicializar datos base
-    inicializar_datos_base()
-    print("✓ Datos base inicializados")
+    # Con varios workers el lanzador ya preparó la BD una sola vez
+    if config.INICIALIZAR_BD:
+        # Crear tablas
+        db_manager.create_tables()
+        print("✓ Tablas creadas/verificadas")
+        
+        # Inicializar datos base
+        inicializar_datos_base()
+        print("✓ Datos base inicializados")
     
     print("=" * 60)
     print("✓ SISTEMA LISTO")
@@ -68,6 +76,7 @@ async def startup_event():
 async def shutdown_event():
     """Cierra conexiones al apagar la aplicación."""
     print("\nCerrando sistema...")
+    await async_db_manager.close()
 
 
 # ============================================================
@@ -2,8 +2,9 @@
 Dependencias para la API.
 Maneja la inyección de dependencias de FastAPI.
 """
-from typing import Generator
+from typing import AsyncGenerator, Generator
 from sqlalchemy.orm import Session
+from src.repositories.async_unit_of_work import AsyncUnitOfWork
 from src.repositories.database import db_manager
 from src.repositories.unit_of_work import UnitOfWork
 
@@ -26,8 +27,17 @@ def get_uow() -> Generator[UnitOfWork, None, None]:
     Se usa como dependencia en FastAPI.
     """
     uow = UnitOfWork()
-    uow.__enter__()  # Inicializar repositorios y sesión
+    uow.__enter__()  # Repositorios y sesión se crean bajo demanda
     try:
         yield uow
     finally:
         uow.__exit__(None, None, None)  # Cerrar sesión correctamente
+
+
+async def get_async_uow() -> AsyncGenerator[AsyncUnitOfWork, None]:
+    """
+    Generador de Unit of Work async.
+    Se usa como dependencia en los endpoints async de FastAPI.
+    """
+    async with AsyncUnitOfWork() as uow:
+        yield uow
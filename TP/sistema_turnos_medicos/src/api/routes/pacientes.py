@@ -1,24 +1,42 @@
 """
 Rutas para gestión de pacientes.
 """
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from src.api.schemas import PacienteResponse, PacienteCreate, SuccessResponse
 from src.api.dependencies import get_uow
 from src.repositories.unit_of_work import UnitOfWork
 from src.domain.paciente import Paciente
+from src.utils.exceptions import ValidationException
+from src.utils.paginacion import codificar_cursor_id, decodificar_cursor_id
 
 router = APIRouter(prefix="/pacientes", tags=["Pacientes"])
 
 
 @router.get("/", response_model=List[PacienteResponse])
 def listar_pacientes(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Cursor de la página anterior (header X-Next-Cursor)"),
     uow: UnitOfWork = Depends(get_uow)
 ):
-    """Lista todos los pacientes activos."""
-    pacientes = uow.pacientes.get_all(skip=skip, limit=limit)
+    """
+    Lista todos los pacientes activos.
+    Si se envía cursor se pagina por clave y se ignora skip.
+    """
+    if cursor:
+        try:
+            despues_de_id = decodificar_cursor_id(cursor)
+        except ValidationException as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        pacientes = uow.pacientes.get_pagina(limit=limit, despues_de_id=despues_de_id)
+    else:
+        pacientes = uow.pacientes.get_all(skip=skip, limit=limit)
+    
+    if len(pacientes) == limit:
+        response.headers["X-Next-Cursor"] = codificar_cursor_id(pacientes[-1].id)
+    
     return pacientes
 
 
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, Query
-from typing import List, Optional
+from fastapi.responses import StreamingResponse
+from typing import Iterator, List, Literal, Optional
 from datetime import date
 
 from src.services.reporte_service import ReporteService
@@ -13,6 +14,21 @@ from src.api.schemas import (
 router = APIRouter(prefix="/reportes", tags=["Reportes"])
 reporte_service = ReporteService()
 
+TIPOS_EXPORTACION = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson; charset=utf-8",
+}
+
+
+def _respuesta_exportacion(contenido: Iterator[str], formato: str, nombre: str) -> StreamingResponse:
+    """Envuelve un generador de texto en una descarga que se transmite a medida que se genera."""
+    return StreamingResponse(
+        (bloque.encode("utf-8") for bloque in contenido),
+        media_type=TIPOS_EXPORTACION[formato],
+        headers={"Content-Disposition": f'attachment; filename="{nombre}.{formato}"'}
+    )
+
+
 @router.get("/turnos-medico", response_model=List[TurnoReporteResponse])
 def get_turnos_por_medico(
     fecha_inicio: date,
@@ -60,3 +76,31 @@ def get_estadisticas_asistencia(
     Calcula la cantidad de asistencias e inasistencias con filtros opcionales.
     """
     return reporte_service.get_estadisticas_asistencia(fecha_inicio, fecha_fin, medico_id, especialidad_id)
+
+@router.get("/turnos-medico/exportar")
+def exportar_turnos_por_medico(
+    fecha_inicio: date,
+    fecha_fin: date,
+    medico_id: Optional[int] = None,
+    especialidad_id: Optional[int] = None,
+    formato: Literal["csv", "ndjson"] = Query("csv", description="Formato de exportación")
+):
+    """
+    Exporta el listado de turnos en CSV o NDJSON sin armarlo completo en memoria.
+    """
+    contenido = reporte_service.exportar_turnos_por_medico(formato, fecha_inicio, fecha_fin, medico_id, especialidad_id)
+    return _respuesta_exportacion(contenido, formato, f"turnos_medico_{fecha_inicio}_{fecha_fin}")
+
+@router.get("/pacientes-atendidos/exportar")
+def exportar_pacientes_atendidos(
+    fecha_inicio: date,
+    fecha_fin: date,
+    medico_id: Optional[int] = None,
+    especialidad_id: Optional[int] = None,
+    formato: Literal["csv", "ndjson"] = Query("csv", description="Formato de exportación")
+):
+    """
+    Exporta los pacientes atendidos en CSV o NDJSON sin armarlo completo en memoria.
+    """
+    contenido = reporte_service.exportar_pacientes_atendidos(formato, fecha_inicio, fecha_fin, medico_id, especialidad_id)
+    return _respuesta_exportacion(contenido, formato, f"pacientes_atendidos_{fecha_inicio}_{fecha_fin}")
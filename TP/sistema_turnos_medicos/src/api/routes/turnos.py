@@ -2,72 +2,81 @@
 Rutas para gestión de turnos.
 Endpoint principal del sistema.
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta, date
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from pydantic import BaseModel
+from sqlalchemy.exc import IntegrityError
 from src.api.schemas import (
     TurnoResponse, TurnoCreate, TurnoUpdate, 
-    SuccessResponse, HorarioDisponibleResponse
+    SuccessResponse, HorarioDisponibleResponse, HorarioEspecialidadResponse,
+    TurnoLoteCreate, TurnoLoteResponse, ResultadoTurnoLoteResponse,
+    CambioEstadoLoteCreate, CambioEstadoLoteResponse, ResultadoCambioEstadoLoteResponse
 )
-from src.api.dependencies import get_uow
+from src.api.dependencies import get_async_uow, get_uow
+from src.repositories.async_unit_of_work import AsyncUnitOfWork
 from src.repositories.unit_of_work import UnitOfWork
-from src.services.turno_service import TurnoService
+from src.services.cache_reportes import cache_reportes
+from src.services.recordatorio_service import RecordatorioService
+from src.services.turno_service import SolicitudTurno, TurnoService
 from src.utils.exceptions import *
+from src.utils.paginacion import codificar_cursor_turno, decodificar_cursor_turno
 
 router = APIRouter(prefix="/turnos", tags=["Turnos"])
 
 
 class MisTurnosResponse(BaseModel):
     turnos: List[TurnoResponse]
-    total: int
+    total: Optional[int] = None
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 @router.get("/", response_model=List[TurnoResponse])
 def listar_turnos(
+    response: Response,
     fecha_desde: datetime = None,
     fecha_hasta: datetime = None,
     id_paciente: int = None,
     id_medico: int = None,
     codigo_estado: str = None,
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Cursor de la página anterior (header X-Next-Cursor)"),
     uow: UnitOfWork = Depends(get_uow)
 ):
     """
-    Lista turnos con filtros opcionales.
+    Lista turnos con filtros opcionales, ordenados por fecha.
     Útil para ver la agenda completa o filtrada.
+    Si se envía cursor se pagina por clave y se ignora skip.
     """
-    from sqlalchemy.orm import joinedload
     from src.domain.turno import Turno
-    from src.domain.medico import Medico
-    
-    # Aplicar filtros básicos con eager loading
-    query = uow.session.query(Turno).options(
-        joinedload(Turno.paciente),
-        joinedload(Turno.medico).joinedload(Medico.especialidades),
-        joinedload(Turno.especialidad),
-        joinedload(Turno.estado)
-    )
     
+    condiciones = []
     if fecha_desde:
-        query = query.filter(Turno.fecha_hora >= fecha_desde)
+        condiciones.append(Turno.fecha_hora >= fecha_desde)
     if fecha_hasta:
-        query = query.filter(Turno.fecha_hora <= fecha_hasta)
+        condiciones.append(Turno.fecha_hora <= fecha_hasta)
     if id_paciente:
-        query = query.filter(Turno.id_paciente == id_paciente)
+        condiciones.append(Turno.id_paciente == id_paciente)
     if id_medico:
-        query = query.filter(Turno.id_medico == id_medico)
+        condiciones.append(Turno.id_medico == id_medico)
     if codigo_estado:
-        estado = uow.estados_turno.get_by_codigo(codigo_estado)
-        if estado:
-            query = query.filter(Turno.id_estado == estado.id)
+        estado_id = uow.estados_turno.get_id_por_codigo(codigo_estado)
+        if estado_id:
+            condiciones.append(Turno.id_estado == estado_id)
+    
+    try:
+        clave = decodificar_cursor_turno(cursor) if cursor else None
+    except ValidationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    turnos = uow.turnos.get_pagina_turnos(condiciones, limit=limit, cursor=clave, offset=skip)
     
-    query = query.filter(Turno.activo == True)
-    turnos = query.offset(skip).limit(limit).all()
+    if len(turnos) == limit:
+        response.headers["X-Next-Cursor"] = codificar_cursor_turno(turnos[-1].fecha_hora, turnos[-1].id)
     
     return turnos
 
@@ -137,11 +146,11 @@ def obtener_turnos_medico(
 
 
 @router.get("/disponibles", response_model=List[HorarioDisponibleResponse])
-def obtener_horarios_disponibles(
+async def obtener_horarios_disponibles(
     id_medico: int = Query(..., description="ID del médico"),
     fecha: date = Query(..., description="Fecha para buscar disponibilidad"),
     duracion: int = Query(30, description="Duración del turno en minutos"),
-    uow: UnitOfWork = Depends(get_uow)
+    uow: AsyncUnitOfWork = Depends(get_async_uow)
 ):
     """
     Obtiene los horarios disponibles de un médico para una fecha específica.
@@ -155,8 +164,9 @@ def obtener_horarios_disponibles(
         )
     
     try:
-        turno_service = TurnoService(uow)
-        horarios = turno_service.obtener_horarios_disponibles(id_medico, fecha, duracion)
+        horarios = await uow.run_sync(
+            lambda sync_uow: TurnoService(sync_uow).obtener_horarios_disponibles(id_medico, fecha, duracion)
+        )
         
         return [
             HorarioDisponibleResponse(fecha_hora=h, disponible=True)
@@ -172,12 +182,42 @@ def obtener_horarios_disponibles(
         )
 
 
+@router.get("/disponibles/especialidad/{especialidad_id}", response_model=List[HorarioEspecialidadResponse])
+def buscar_horarios_por_especialidad(
+    especialidad_id: int,
+    dias: int = Query(14, ge=1, le=90, description="Cantidad de días a explorar desde hoy"),
+    limite: int = Query(10, ge=1, le=100, description="Cantidad máxima de horarios"),
+    duracion: int = Query(30, description="Duración del turno en minutos"),
+    uow: UnitOfWork = Depends(get_uow)
+):
+    """
+    Obtiene los primeros horarios libres de una especialidad entre todos sus médicos,
+    ordenados por fecha y hora.
+    """
+    try:
+        turno_service = TurnoService(uow)
+        return turno_service.buscar_horarios_por_especialidad(
+            especialidad_id, date.today(), dias, limite, duracion
+        )
+        
+    except EntityNotFoundException as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al buscar horarios: {str(e)}"
+        )
+
+
 @router.get("/calendario/{id_medico}")
-def obtener_calendario_disponibilidad(
+async def obtener_calendario_disponibilidad(
     id_medico: int,
     dias: int = Query(14, description="Cantidad de días a mostrar desde hoy"),
     duracion: int = Query(30, description="Duración del turno en minutos"),
-    uow: UnitOfWork = Depends(get_uow)
+    uow: AsyncUnitOfWork = Depends(get_async_uow)
 ) -> Dict[str, Dict]:
     """
     Obtiene un calendario con todos los horarios disponibles del médico
@@ -185,56 +225,17 @@ def obtener_calendario_disponibilidad(
     Formato: {fecha: {"horarios": [horarios], "bloqueado": bool, "motivo_bloqueo": str}}
     """
     try:
-        turno_service = TurnoService(uow)
-        calendario = {}
-        fecha_actual = date.today()
-        
-        # Obtener bloqueos del médico en el rango de fechas
-        fecha_fin = fecha_actual + timedelta(days=dias)
-        bloqueos = uow.bloqueos.get_por_medico(
-            medico_id=id_medico,
-            fecha_desde=fecha_actual,
-            fecha_hasta=fecha_fin
+        return await uow.run_sync(
+            lambda sync_uow: TurnoService(sync_uow).obtener_calendario_disponibilidad(
+                id_medico, date.today(), dias, duracion
+            )
         )
         
-        for i in range(dias):
-            fecha = fecha_actual + timedelta(days=i)
-            fecha_str = fecha.isoformat()
-            
-            # Verificar si hay bloqueo para esta fecha
-            bloqueado = False
-            motivo_bloqueo = None
-            
-            for bloqueo in bloqueos:
-                # Verificar si la fecha cae dentro del bloqueo
-                if bloqueo.inicio.date() <= fecha <= bloqueo.fin.date():
-                    bloqueado = True
-                    motivo_bloqueo = bloqueo.motivo or "Médico no disponible"
-                    break
-            
-            try:
-                if bloqueado:
-                    # Si está bloqueado, no mostrar horarios pero indicar el bloqueo
-                    calendario[fecha_str] = {
-                        "horarios": [],
-                        "bloqueado": True,
-                        "motivo_bloqueo": motivo_bloqueo
-                    }
-                else:
-                    horarios = turno_service.obtener_horarios_disponibles(id_medico, fecha, duracion)
-                    if horarios:
-                        # Convertir a string ISO format
-                        calendario[fecha_str] = {
-                            "horarios": [h.isoformat() for h in horarios],
-                            "bloqueado": False,
-                            "motivo_bloqueo": None
-                        }
-            except DisponibilidadException:
-                # El médico no atiende ese día
-                continue
-        
-        return calendario
-        
+    except EntityNotFoundException as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -258,31 +259,31 @@ def obtener_turno(
 
 
 @router.post("/", response_model=TurnoResponse, status_code=status.HTTP_201_CREATED)
-def crear_turno(
+async def crear_turno(
     turno_data: TurnoCreate,
-    uow: UnitOfWork = Depends(get_uow)
+    uow: AsyncUnitOfWork = Depends(get_async_uow)
 ):
     """
     Crea un nuevo turno.
     Valida disponibilidad, solapamiento y todas las reglas de negocio.
+    La reserva del horario es atómica: si dos solicitudes compiten por él, solo una lo obtiene.
     """
     try:
-        turno_service = TurnoService(uow)
-        
-        turno = turno_service.crear_turno(
-            paciente_id=turno_data.id_paciente,
-            medico_id=turno_data.id_medico,
-            especialidad_id=turno_data.id_especialidad,
-            fecha_hora=turno_data.fecha_hora,
-            duracion_minutos=turno_data.duracion_minutos,
-            observaciones=turno_data.motivo
+        turno_id = await uow.run_sync(
+            lambda sync_uow: TurnoService(sync_uow).reservar_turno(
+                paciente_id=turno_data.id_paciente,
+                medico_id=turno_data.id_medico,
+                especialidad_id=turno_data.id_especialidad,
+                fecha_hora=turno_data.fecha_hora,
+                duracion_minutos=turno_data.duracion_minutos,
+                observaciones=turno_data.motivo
+            ).id
         )
         
-        uow.commit()
-        
         # Recargar el turno con todas las relaciones para la respuesta
-        turno_completo = uow.turnos.get_by_id_completo(turno.id)
-        return turno_completo
+        return await uow.run_sync(
+            lambda sync_uow: TurnoResponse.model_validate(sync_uow.turnos.get_by_id_completo(turno_id))
+        )
         
     except (
         DisponibilidadException,
@@ -290,19 +291,127 @@ def crear_turno(
         ValidationException,
         EntityNotFoundException
     ) as e:
-        uow.rollback()
+        await uow.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
     except Exception as e:
-        uow.rollback()
+        await uow.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error al crear turno: {str(e)}"
         )
 
 
+@router.post("/lote", response_model=TurnoLoteResponse)
+async def crear_turnos_lote(
+    lote: TurnoLoteCreate,
+    uow: AsyncUnitOfWork = Depends(get_async_uow)
+):
+    """
+    Crea varios turnos en una sola transacción (ej. 10 sesiones semanales).
+    Cada turno se valida con las mismas reglas que POST /turnos/; los rechazados
+    no impiden crear el resto. Retorna el resultado de cada turno en el mismo orden.
+    """
+    solicitudes = [
+        SolicitudTurno(
+            paciente_id=t.id_paciente,
+            medico_id=t.id_medico,
+            especialidad_id=t.id_especialidad,
+            fecha_hora=t.fecha_hora,
+            duracion_minutos=t.duracion_minutos,
+            observaciones=t.motivo
+        )
+        for t in lote.turnos
+    ]
+    
+    try:
+        resultados = await uow.run_sync(
+            lambda sync_uow: [
+                ResultadoTurnoLoteResponse(
+                    indice=i,
+                    creado=r.turno is not None,
+                    id_turno=r.turno.id if r.turno else None,
+                    fecha_hora=r.solicitud.fecha_hora,
+                    error=r.error
+                )
+                for i, r in enumerate(TurnoService(sync_uow).reservar_turnos_lote(solicitudes))
+            ]
+        )
+    except TurnoSolapamientoException as e:
+        await uow.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except Exception as e:
+        await uow.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al crear turnos: {str(e)}"
+        )
+    
+    creados = sum(1 for r in resultados if r.creado)
+    return TurnoLoteResponse(
+        creados=creados,
+        rechazados=len(resultados) - creados,
+        resultados=resultados
+    )
+
+
+@router.post("/lote/estados", response_model=CambioEstadoLoteResponse)
+async def cambiar_estados_lote(
+    lote: CambioEstadoLoteCreate,
+    uow: AsyncUnitOfWork = Depends(get_async_uow)
+):
+    """
+    Cambia el estado de muchos turnos en una sola transacción (ej. cierre del
+    día: asistidos e inasistidos). Estados destino: CONF, CANC, ASIS, INAS.
+    Los turnos cuyo estado actual no admite la transición quedan sin cambios
+    y se informan en no_actualizados.
+    """
+    cambios: Dict[str, List[int]] = {}
+    for cambio in lote.cambios:
+        cambios.setdefault(cambio.codigo_estado.upper(), []).extend(cambio.turno_ids)
+    
+    try:
+        modificados = await uow.run_sync(
+            lambda sync_uow: TurnoService(sync_uow).cambiar_estados_lote(cambios)
+        )
+    except ValidationException as e:
+        await uow.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except TurnoSolapamientoException as e:
+        await uow.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except Exception as e:
+        await uow.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al cambiar estados: {str(e)}"
+        )
+    
+    resultados = []
+    for codigo, turno_ids in cambios.items():
+        actualizados = set(modificados[codigo])
+        resultados.append(ResultadoCambioEstadoLoteResponse(
+            codigo_estado=codigo,
+            actualizados=sorted(actualizados),
+            no_actualizados=sorted(set(turno_ids) - actualizados)
+        ))
+    return CambioEstadoLoteResponse(
+        total_actualizados=sum(len(r.actualizados) for r in resultados),
+        resultados=resultados
+    )
+
+
 @router.patch("/{turno_id}", response_model=TurnoResponse)
 def actualizar_turno(
     turno_id: int,
@@ -322,19 +431,26 @@ def actualizar_turno(
             turno.motivo = turno_update.motivo
         
         if turno_update.codigo_estado is not None:
-            estado = uow.estados_turno.get_by_codigo(turno_update.codigo_estado)
-            if not estado:
+            estado_id = uow.estados_turno.get_id_por_codigo(turno_update.codigo_estado)
+            if not estado_id:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"Estado '{turno_update.codigo_estado}' no válido"
                 )
-            turno.id_estado = estado.id
+            uow.turnos.cambiar_estado(turno, estado_id)
         
         uow.commit()
+        cache_reportes.invalidar_turno(turno.fecha_hora.date(), turno.id_medico, turno.id_especialidad)
         return turno
         
     except HTTPException:
         raise
+    except IntegrityError:
+        uow.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="El horario del turno ya fue reservado por otro turno"
+        )
     except Exception as e:
         uow.rollback()
         raise HTTPException(
@@ -358,15 +474,17 @@ def confirmar_turno(
             )
         
         # Obtener estado CONFIRMADO
-        estado_conf = uow.estados_turno.get_by_codigo("CONF")
-        if not estado_conf:
+        estado_conf_id = uow.estados_turno.get_id_por_codigo("CONF")
+        if not estado_conf_id:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Estado CONFIRMADO no encontrado en el sistema"
             )
         
-        turno.id_estado = estado_conf.id
+        uow.turnos.cambiar_estado(turno, estado_conf_id)
+        RecordatorioService(uow).programar_recordatorio(turno.id, turno.fecha_hora)
         uow.commit()
+        cache_reportes.invalidar_turno(turno.fecha_hora.date(), turno.id_medico, turno.id_especialidad)
         
         return SuccessResponse(message="Turno confirmado exitosamente")
         
@@ -393,15 +511,16 @@ def cancelar_turno(
             )
         
         # Obtener estado CANCELADO
-        estado_canc = uow.estados_turno.get_by_codigo("CANC")
-        if not estado_canc:
+        estado_canc_id = uow.estados_turno.get_id_por_codigo("CANC")
+        if not estado_canc_id:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Estado CANCELADO no encontrado en el sistema"
             )
         
-        turno.id_estado = estado_canc.id
+        uow.turnos.cambiar_estado(turno, estado_canc_id)
         uow.commit()
+        cache_reportes.invalidar_turno(turno.fecha_hora.date(), turno.id_medico, turno.id_especialidad)
         
         return SuccessResponse(message="Turno cancelado exitosamente")
         
@@ -414,41 +533,48 @@ def cancelar_turno(
 
 
 @router.get("/mis-turnos/listar", response_model=MisTurnosResponse)
-def listar_mis_turnos(
+async def listar_mis_turnos(
     dni: str = None,
     page: int = Query(1, ge=1),
     page_size: int = Query(15, ge=1, le=100),
-    uow: UnitOfWork = Depends(get_uow)
+    cursor: Optional[str] = Query(None, description="Cursor devuelto en next_cursor"),
+    incluir_total: bool = Query(False, description="Calcular total y total_pages (solo sin cursor)"),
+    uow: AsyncUnitOfWork = Depends(get_async_uow)
 ):
     """
     Lista todos los turnos no cancelados con paginación.
     Si se proporciona DNI, filtra por paciente.
+    Con cursor se pagina por clave (fecha_hora, id) y se ignora page.
+    El total (un SELECT COUNT) solo se calcula si se pide con incluir_total
+    y no hay cursor: al avanzar por cursor cada página cuesta lo mismo.
     """
-    from sqlalchemy.orm import joinedload
-    from src.domain.turno import Turno
-    from src.domain.medico import Medico
-    
-    # Query base con eager loading
-    query = uow.session.query(Turno).options(
-        joinedload(Turno.paciente),
-        joinedload(Turno.medico).joinedload(Medico.especialidades),
-        joinedload(Turno.especialidad),
-        joinedload(Turno.estado)
+    return await uow.run_sync(
+        lambda sync_uow: _listar_mis_turnos(sync_uow, dni, page, page_size, cursor, incluir_total)
     )
+
+
+def _listar_mis_turnos(
+    uow: UnitOfWork,
+    dni: Optional[str],
+    page: int,
+    page_size: int,
+    cursor: Optional[str],
+    incluir_total: bool
+) -> MisTurnosResponse:
+    """Consulta sincrónica de listar_mis_turnos, ejecutada sobre la sesión async."""
+    from src.domain.turno import Turno
     
-    # Filtrar solo turnos activos y no cancelados
-    query = query.filter(Turno.activo == True)
-    
-    # Obtener estado cancelado
-    estado_cancelado = uow.estados_turno.get_by_codigo('cancelado')
-    if estado_cancelado:
-        query = query.filter(Turno.id_estado != estado_cancelado.id)
+    # Filtrar turnos no cancelados (activo se aplica en el repositorio)
+    condiciones = []
+    estado_cancelado_id = uow.estados_turno.get_id_por_codigo("CANC")
+    if estado_cancelado_id:
+        condiciones.append(Turno.id_estado != estado_cancelado_id)
     
     # Filtrar por DNI si se proporciona
     if dni:
         paciente = uow.pacientes.get_by_dni(dni)
         if paciente:
-            query = query.filter(Turno.id_paciente == paciente.id)
+            condiciones.append(Turno.id_paciente == paciente.id)
         else:
             # Si el DNI no existe, retornar vacío
             return MisTurnosResponse(
@@ -459,18 +585,30 @@ def listar_mis_turnos(
                 total_pages=0
             )
     
-    # Ordenar por fecha descendente
-    query = query.order_by(Turno.fecha_hora.desc())
+    try:
+        clave = decodificar_cursor_turno(cursor) if cursor else None
+    except ValidationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
-    # Contar total
-    total = query.count()
+    # Ordenar por fecha descendente
+    turnos = uow.turnos.get_pagina_turnos(
+        condiciones,
+        limit=page_size,
+        cursor=clave,
+        descendente=True,
+        offset=(page - 1) * page_size
+    )
     
-    # Aplicar paginación
-    offset = (page - 1) * page_size
-    turnos = query.offset(offset).limit(page_size).all()
+    # Contar total con SELECT COUNT(*) (opcional y nunca al paginar por cursor)
+    total = None
+    total_pages = None
+    if incluir_total and clave is None:
+        total = uow.turnos.count_where(*condiciones)
+        total_pages = (total + page_size - 1) // page_size
     
-    # Calcular total de páginas
-    total_pages = (total + page_size - 1) // page_size
+    next_cursor = None
+    if len(turnos) == page_size:
+        next_cursor = codificar_cursor_turno(turnos[-1].fecha_hora, turnos[-1].id)
     
     # Convertir a TurnoResponse
     turnos_response = [TurnoResponse.model_validate(turno) for turno in turnos]
@@ -480,7 +618,8 @@ def listar_mis_turnos(
         total=total,
         page=page,
         page_size=page_size,
-        total_pages=total_pages
+        total_pages=total_pages,
+        next_cursor=next_cursor
     )
 
 
@@ -498,7 +637,7 @@ def eliminar_turno(
                 detail=f"Turno con ID {turno_id} no encontrado"
             )
         
-        uow.turnos.delete(turno_id)
+        uow.turnos.eliminar(turno)
         uow.commit()
         
         return SuccessResponse(message="Turno eliminado correctamente")
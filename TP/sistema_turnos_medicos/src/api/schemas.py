@@ -6,6 +6,8 @@ from datetime import datetime, date, time
 from typing import Optional, List
 from pydantic import BaseModel, EmailStr, Field, field_validator
 
+from src.config.settings import config
+
 
 # ============================================================
 # ESQUEMAS DE RESPUESTA
@@ -110,6 +112,19 @@ class DisponibilidadResponse(BaseModel):
         from_attributes = True
 
 
+def _validar_alineacion_disponibilidad(v):
+    """
+    Los horarios libres empiezan en hora_desde y avanzan de a duracion_slot:
+    ambos deben ser múltiplos de RESERVA_BLOQUE_MINUTOS, como los turnos.
+    """
+    if v is None:
+        return v
+    minutos = v if isinstance(v, int) else v.minute
+    if minutos % config.RESERVA_BLOQUE_MINUTOS or (isinstance(v, time) and (v.second or v.microsecond)):
+        raise ValueError(f"Los horarios deben ser múltiplos de {config.RESERVA_BLOQUE_MINUTOS} minutos")
+    return v
+
+
 class DisponibilidadCreate(BaseModel):
     """Esquema para crear una disponibilidad."""
     dia_semana: int = Field(..., ge=0, le=6, description="0=Domingo, 1=Lunes, ..., 6=Sábado")
@@ -132,6 +147,12 @@ class DisponibilidadCreate(BaseModel):
         if 'hora_desde' in info.data and v <= info.data['hora_desde']:
             raise ValueError("La hora de fin debe ser posterior a la hora de inicio")
         return v
+    
+    @field_validator('hora_desde', 'duracion_slot')
+    @classmethod
+    def validar_alineacion(cls, v):
+        """Valida que los horarios ofrecidos se puedan reservar (ver TurnoCreate)."""
+        return _validar_alineacion_disponibilidad(v)
 
 
 class DisponibilidadUpdate(BaseModel):
@@ -147,6 +168,12 @@ class DisponibilidadUpdate(BaseModel):
         if v and 'hora_desde' in info.data and info.data['hora_desde'] and v <= info.data['hora_desde']:
             raise ValueError("La hora de fin debe ser posterior a la hora de inicio")
         return v
+    
+    @field_validator('hora_desde', 'duracion_slot')
+    @classmethod
+    def validar_alineacion(cls, v):
+        """Valida que los horarios ofrecidos se puedan reservar (ver TurnoCreate)."""
+        return _validar_alineacion_disponibilidad(v)
 
 
 class BloqueoResponse(BaseModel):
@@ -205,6 +232,13 @@ class HorarioDisponibleResponse(BaseModel):
     disponible: bool
 
 
+class HorarioEspecialidadResponse(BaseModel):
+    """Esquema de respuesta para horarios disponibles de una especialidad."""
+    fecha_hora: datetime
+    id_medico: int
+    medico: str
+
+
 # ============================================================
 # ESQUEMAS DE SOLICITUD
 # ============================================================
@@ -279,9 +313,65 @@ class TurnoCreate(BaseModel):
         if fecha_turno < hoy:
             raise ValueError("La fecha del turno no puede ser del pasado")
         
+        if v.minute % config.RESERVA_BLOQUE_MINUTOS or v.second or v.microsecond:
+            raise ValueError(f"La hora del turno debe ser múltiplo de {config.RESERVA_BLOQUE_MINUTOS} minutos")
+        
+        return v
+    
+    @field_validator('duracion_minutos')
+    @classmethod
+    def validar_duracion(cls, v: int) -> int:
+        """Valida que la duración cubra bloques de agenda enteros (RESERVA_BLOQUE_MINUTOS)."""
+        if v % config.RESERVA_BLOQUE_MINUTOS:
+            raise ValueError(f"La duración del turno debe ser múltiplo de {config.RESERVA_BLOQUE_MINUTOS} minutos")
         return v
 
 
+class TurnoLoteCreate(BaseModel):
+    """Esquema para crear varios turnos en una sola operación (series, campañas)."""
+    turnos: List[TurnoCreate] = Field(..., min_length=1, max_length=200)
+
+
+class ResultadoTurnoLoteResponse(BaseModel):
+    """Resultado de un turno del lote."""
+    indice: int
+    creado: bool
+    id_turno: Optional[int] = None
+    fecha_hora: datetime
+    error: Optional[str] = None
+
+
+class TurnoLoteResponse(BaseModel):
+    """Esquema de respuesta para la creación de turnos por lote."""
+    creados: int
+    rechazados: int
+    resultados: List[ResultadoTurnoLoteResponse]
+
+
+class CambioEstadoLote(BaseModel):
+    """Turnos a pasar a un mismo estado (CONF, CANC, ASIS o INAS)."""
+    codigo_estado: str = Field(..., max_length=10)
+    turno_ids: List[int] = Field(..., min_length=1, max_length=1000)
+
+
+class CambioEstadoLoteCreate(BaseModel):
+    """Esquema para cambiar el estado de muchos turnos en una sola operación (cierre del día)."""
+    cambios: List[CambioEstadoLote] = Field(..., min_length=1)
+
+
+class ResultadoCambioEstadoLoteResponse(BaseModel):
+    """Resultado de un estado destino del lote."""
+    codigo_estado: str
+    actualizados: List[int]
+    no_actualizados: List[int]
+
+
+class CambioEstadoLoteResponse(BaseModel):
+    """Esquema de respuesta para el cambio de estado por lote."""
+    total_actualizados: int
+    resultados: List[ResultadoCambioEstadoLoteResponse]
+
+
 class TurnoUpdate(BaseModel):
     """Esquema para actualizar un turno."""
     motivo: Optional[str] = Field(None, max_length=255)
@@ -2,6 +2,7 @@
 Configuración base del sistema.
 Implementa el patrón Singleton para la configuración global.
 """
+import os
 from pathlib import Path
 from typing import Optional
 
@@ -25,15 +26,65 @@ class Config:
         self.BASE_DIR = Path(__file__).resolve().parent.parent.parent
         self.DB_PATH = self.BASE_DIR / "data" / "turnos_medicos.db"
         self.DB_PATH.parent.mkdir(exist_ok=True)
-        self.DATABASE_URL = f"sqlite:///{self.DB_PATH}"
+        # Cualquier URL de SQLAlchemy (por defecto, SQLite local)
+        self.DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{self.DB_PATH}")
+        self.DB_ECHO = os.getenv("DB_ECHO", "false").lower() == "true"
+        # URL para el motor async (si no se define, se deriva de DATABASE_URL)
+        self.ASYNC_DATABASE_URL: Optional[str] = os.getenv("ASYNC_DATABASE_URL")
+        
+        # Pool de conexiones (no aplica a SQLite en memoria)
+        self.DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+        self.DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+        self.DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # segundos
+        self.DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # segundos, -1 = nunca
+        self.DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+        
+        # Perfil de rendimiento de SQLite (PRAGMAs aplicados en cada conexión)
+        self.SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+        self.SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+        self.SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))  # bytes
+        self.SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))  # negativo = KiB
+        self.SQLITE_TEMP_STORE = os.getenv("SQLITE_TEMP_STORE", "MEMORY")
+        self.SQLITE_BUSY_TIMEOUT = int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000"))  # milisegundos
         
         # Configuración de la aplicación
         self.APP_NAME = "Sistema de Gestión de Turnos Médicos"
         self.VERSION = "1.0.0"
         
+        # Servidor web y procesos
+        self.SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+        self.SERVER_PORT = int(os.getenv("SERVER_PORT", "8000"))
+        self.WEB_WORKERS = int(os.getenv("WEB_WORKERS", "1"))
+        # False cuando el lanzador ya creó tablas y datos base antes de levantar los workers
+        self.INICIALIZAR_BD = os.getenv("INICIALIZAR_BD", "true").lower() == "true"
+        
+        # Elección de líder del scheduler (un único proceso envía recordatorios)
+        self.SCHEDULER_LOCK_PATH = Path(os.getenv("SCHEDULER_LOCK_PATH", str(self.DB_PATH.parent / "scheduler.lock")))
+        self.SCHEDULER_REINTENTO_LIDER = int(os.getenv("SCHEDULER_REINTENTO_LIDER", "30"))  # segundos
+        
         # Configuración de turnos
         self.DURACION_TURNO_DEFAULT = 30  # minutos
         self.ANTICIPACION_RECORDATORIO = 24  # horas
+        self.RECORDATORIOS_LOTE = int(os.getenv("RECORDATORIOS_LOTE", "50"))
+        # Espera máxima entre revisiones de la cola (toma recordatorios encolados por otros procesos)
+        self.RECORDATORIOS_ESPERA_MAXIMA = int(os.getenv("RECORDATORIOS_ESPERA_MAXIMA", "300"))  # segundos
+        
+        # Reserva de agenda: granularidad de los bloques y reintentos ante reservas concurrentes
+        self.RESERVA_BLOQUE_MINUTOS = int(os.getenv("RESERVA_BLOQUE_MINUTOS", "5"))
+        self.RESERVA_REINTENTOS = int(os.getenv("RESERVA_REINTENTOS", "3"))
+        
+        # Barrido diario: turnos PEND/CONF ya pasados se marcan INAS (BARRIDO_INASISTENCIAS_LOTE=0 lo deshabilita)
+        self.BARRIDO_INASISTENCIAS_HORA = int(os.getenv("BARRIDO_INASISTENCIAS_HORA", "23"))  # hora del día
+        self.BARRIDO_INASISTENCIAS_MARGEN = int(os.getenv("BARRIDO_INASISTENCIAS_MARGEN", "120"))  # minutos
+        self.BARRIDO_INASISTENCIAS_LOTE = int(os.getenv("BARRIDO_INASISTENCIAS_LOTE", "500"))  # turnos por UPDATE
+        
+        # Archivo histórico: turnos más viejos que el horizonte pasan a tablas *_archivo (0 = deshabilitado)
+        self.ARCHIVO_HORIZONTE_DIAS = int(os.getenv("ARCHIVO_HORIZONTE_DIAS", "730"))
+        self.ARCHIVO_LOTE = int(os.getenv("ARCHIVO_LOTE", "1000"))  # turnos por lote
+        
+        # Cache de resultados de reportes (0 entradas = deshabilitado)
+        self.REPORTES_CACHE_TTL = int(os.getenv("REPORTES_CACHE_TTL", "60"))  # segundos
+        self.REPORTES_CACHE_MAXIMO = int(os.getenv("REPORTES_CACHE_MAXIMO", "256"))  # entradas
         
         self._initialized = True
 
@@ -12,6 +12,9 @@ from .disponibilidad import DisponibilidadMedico, BloqueoMedico
 from .consulta import Consulta
 from .receta import Receta, ItemReceta
 from .recordatorio import Recordatorio
+from .estadistica_diaria import EstadisticaDiaria
+from .reserva_agenda import ReservaAgenda
+from .archivo import TurnoArchivado, ConsultaArchivada, RecordatorioArchivado
 
 __all__ = [
     'Base',
@@ -28,4 +31,9 @@ __all__ = [
     'Receta',
     'ItemReceta',
     'Recordatorio',
+    'EstadisticaDiaria',
+    'ReservaAgenda',
+    'TurnoArchivado',
+    'ConsultaArchivada',
+    'RecordatorioArchivado',
 ]
@@ -0,0 +1,117 @@
+"""
+Entidades del archivo histórico.
+Turnos viejos (y sus consultas y recordatorios) que se movieron fuera de las
+tablas de trabajo para que estas contengan solo turnos recientes y futuros.
+"""
+from typing import List, Optional, TYPE_CHECKING
+
+from sqlalchemy import ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from .base import Base
+from .consulta import ColumnasConsulta
+from .recordatorio import ColumnasRecordatorio
+from .turno import ColumnasTurno
+
+if TYPE_CHECKING:
+    from .paciente import Paciente
+    from .medico import Medico
+    from .especialidad import Especialidad
+    from .estado_turno import EstadoTurno
+
+
+class TurnoArchivado(ColumnasTurno, Base):
+    """
+    Turno movido al archivo histórico. Conserva el ID y todas las columnas
+    del turno original, por lo que se serializa igual que un Turno.
+    Es de solo lectura: no participa de la agenda ni de las reservas.
+
+    Attributes:
+        paciente: Paciente asociado
+        medico: Médico asociado
+        especialidad: Especialidad del turno
+        estado: Estado final del turno
+        consulta: Consulta archivada (si fue atendido)
+        recordatorios: Recordatorios archivados
+    """
+
+    __tablename__ = "turnos_archivo"
+    __table_args__ = (
+        Index("ix_turnos_archivo_medico_fecha_hora", "id_medico", "fecha_hora"),
+        Index("ix_turnos_archivo_paciente_fecha_hora", "id_paciente", "fecha_hora"),
+    )
+
+    # Relaciones (sin back_populates: las entidades maestras solo ven turnos vigentes)
+    paciente: Mapped["Paciente"] = relationship("Paciente", viewonly=True)
+    medico: Mapped["Medico"] = relationship("Medico", viewonly=True)
+    especialidad: Mapped["Especialidad"] = relationship("Especialidad", viewonly=True)
+    estado: Mapped["EstadoTurno"] = relationship("EstadoTurno", viewonly=True)
+    consulta: Mapped[Optional["ConsultaArchivada"]] = relationship(
+        "ConsultaArchivada",
+        back_populates="turno",
+        uselist=False,
+        viewonly=True
+    )
+    recordatorios: Mapped[List["RecordatorioArchivado"]] = relationship(
+        "RecordatorioArchivado",
+        back_populates="turno",
+        viewonly=True
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<TurnoArchivado(id={self.id}, paciente_id={self.id_paciente}, "
+            f"medico_id={self.id_medico}, fecha={self.fecha_hora})>"
+        )
+
+
+class ConsultaArchivada(ColumnasConsulta, Base):
+    """
+    Consulta de un turno archivado.
+
+    Attributes:
+        id_turno: ID del turno archivado (único)
+        turno: Turno archivado asociado
+    """
+
+    __tablename__ = "consultas_archivo"
+    __table_args__ = (
+        Index("ix_consultas_archivo_fecha_atencion", "fecha_atencion"),
+    )
+
+    id_turno: Mapped[int] = mapped_column(ForeignKey("turnos_archivo.id"), unique=True, nullable=False)
+
+    turno: Mapped["TurnoArchivado"] = relationship(
+        "TurnoArchivado",
+        back_populates="consulta",
+        viewonly=True
+    )
+
+    def __repr__(self) -> str:
+        return f"<ConsultaArchivada(id={self.id}, turno_id={self.id_turno}, fecha={self.fecha_atencion})>"
+
+
+class RecordatorioArchivado(ColumnasRecordatorio, Base):
+    """
+    Recordatorio de un turno archivado.
+
+    Attributes:
+        id_turno: ID del turno archivado
+        turno: Turno archivado asociado
+    """
+
+    __tablename__ = "recordatorios_archivo"
+
+    id_turno: Mapped[int] = mapped_column(ForeignKey("turnos_archivo.id"), nullable=False, index=True)
+
+    turno: Mapped["TurnoArchivado"] = relationship(
+        "TurnoArchivado",
+        back_populates="recordatorios",
+        viewonly=True
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<RecordatorioArchivado(id={self.id}, turno_id={self.id_turno}, "
+            f"canal='{self.canal}', estado='{self.estado}')>"
+        )
@@ -5,8 +5,17 @@ Define la clase base para todas las entidades.
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy import DateTime, func, select
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, object_session
+from sqlalchemy.orm.exc import DetachedInstanceError
+
+
+def formatear_nombre_completo(apellido: str, nombre: str) -> str:
+    """
+    Formato "Apellido, Nombre" de médicos y pacientes (ver nombre_completo).
+    Se usa también con columnas sueltas, cuando no se cargan las entidades.
+    """
+    return f"{apellido}, {nombre}"
 
 
 class Base(DeclarativeBase):
@@ -41,6 +50,37 @@ class Base(DeclarativeBase):
         """Restaura una entidad borrada lógicamente."""
         self.activo = True
         self.fecha_modificacion = datetime.now()
+    
+    def _contar_turnos_activos(self, columna_fk: str) -> int:
+        """
+        Cuenta los turnos activos que referencian a la entidad.
+        Si la relación `turnos` ya está cargada se cuenta en memoria;
+        si no, se usa un SELECT COUNT en la sesión de la entidad.
+        
+        Args:
+            columna_fk: Columna de Turno que apunta a la entidad (ej. "id_medico")
+        
+        Raises:
+            DetachedInstanceError: Si la relación no está cargada y la entidad no tiene sesión
+        """
+        if "turnos" in self.__dict__:
+            return len([t for t in self.turnos if t.activo])
+        
+        from .turno import Turno
+        
+        session = object_session(self)
+        if session is None:
+            raise DetachedInstanceError(
+                f"{self.__class__.__name__} {self.id} no está asociado a una sesión "
+                "y sus turnos no fueron cargados"
+            )
+        
+        return session.scalar(
+            select(func.count(Turno.id)).where(
+                getattr(Turno, columna_fk) == self.id,
+                Turno.activo.is_(True)
+            )
+        ) or 0
 
 
 # Alias para compatibilidad con código existente
@@ -15,7 +15,17 @@ if TYPE_CHECKING:
     from .receta import Receta
 
 
-class Consulta(Base):
+class ColumnasConsulta:
+    """Columnas propias de una consulta, compartidas por Consulta y ConsultaArchivada."""
+    
+    motivo: Mapped[str] = mapped_column(Text, nullable=True)
+    observaciones: Mapped[str] = mapped_column(Text, nullable=True)
+    diagnostico: Mapped[str] = mapped_column(Text, nullable=True)
+    indicaciones: Mapped[str] = mapped_column(Text, nullable=True)
+    fecha_atencion: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now)
+
+
+class Consulta(ColumnasConsulta, Base):
     """
     Entidad que representa una consulta médica (historia clínica).
     
@@ -32,12 +42,6 @@ class Consulta(Base):
     
     __tablename__ = "consultas"
     
-    motivo: Mapped[str] = mapped_column(Text, nullable=True)
-    observaciones: Mapped[str] = mapped_column(Text, nullable=True)
-    diagnostico: Mapped[str] = mapped_column(Text, nullable=True)
-    indicaciones: Mapped[str] = mapped_column(Text, nullable=True)
-    fecha_atencion: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now)
-    
     # Foreign Keys
     id_turno: Mapped[int] = mapped_column(ForeignKey("turnos.id"), unique=True, nullable=False)
     
@@ -55,7 +55,7 @@ class Especialidad(Base):
     @property
     def cantidad_turnos(self) -> int:
         """Retorna la cantidad de turnos activos de la especialidad."""
-        return len([t for t in self.turnos if t.activo])
+        return self._contar_turnos_activos("id_especialidad")
     
     def tiene_medicos_o_turnos(self) -> bool:
         """Verifica si la especialidad tiene médicos o turnos asociados."""
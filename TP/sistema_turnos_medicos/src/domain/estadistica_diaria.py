@@ -0,0 +1,48 @@
+"""
+Entidad EstadisticaDiaria del dominio.
+Resumen precalculado de turnos por día, médico, especialidad y estado.
+"""
+from datetime import date
+
+from sqlalchemy import Date, ForeignKey, Index, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class EstadisticaDiaria(Base):
+    """
+    Cantidad de turnos de un día para una combinación médico/especialidad/estado.
+
+    Se mantiene incrementalmente en cada alta o cambio de estado de un turno
+    (ver EstadisticaDiariaRepository) y puede reconstruirse desde la tabla turnos.
+
+    Attributes:
+        fecha: Día del turno
+        id_medico: ID del médico
+        id_especialidad: ID de la especialidad
+        id_estado: ID del estado del turno
+        cantidad: Cantidad de turnos
+    """
+
+    __tablename__ = "estadisticas_diarias"
+    __table_args__ = (
+        Index(
+            "ux_estadisticas_diarias_clave",
+            "fecha", "id_medico", "id_especialidad", "id_estado",
+            unique=True
+        ),
+    )
+
+    fecha: Mapped[date] = mapped_column(Date, nullable=False)
+    id_medico: Mapped[int] = mapped_column(ForeignKey("medicos.id"), nullable=False)
+    id_especialidad: Mapped[int] = mapped_column(ForeignKey("especialidades.id"), nullable=False)
+    id_estado: Mapped[int] = mapped_column(ForeignKey("estados_turno.id"), nullable=False)
+    cantidad: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return (
+            f"<EstadisticaDiaria(fecha={self.fecha}, medico_id={self.id_medico}, "
+            f"especialidad_id={self.id_especialidad}, estado_id={self.id_estado}, "
+            f"cantidad={self.cantidad})>"
+        )
@@ -7,7 +7,7 @@ from typing import List, TYPE_CHECKING
 from sqlalchemy import String, Table, Column, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from .base import Base, BaseEntity
+from .base import Base, BaseEntity, formatear_nombre_completo
 
 if TYPE_CHECKING:
     from .especialidad import Especialidad
@@ -87,12 +87,12 @@ class Medico(Base):
     @property
     def nombre_completo(self) -> str:
         """Retorna el nombre completo del médico."""
-        return f"{self.apellido}, {self.nombre}"
+        return formatear_nombre_completo(self.apellido, self.nombre)
     
     @property
     def cantidad_turnos(self) -> int:
         """Retorna la cantidad de turnos activos del médico."""
-        return len([t for t in self.turnos if t.activo])
+        return self._contar_turnos_activos("id_medico")
     
     def tiene_turnos_pendientes(self) -> bool:
         """Verifica si el médico tiene turnos pendientes o confirmados."""
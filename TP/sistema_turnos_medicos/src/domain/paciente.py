@@ -8,7 +8,7 @@ from typing import List, TYPE_CHECKING
 from sqlalchemy import String, Date
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from .base import Base
+from .base import Base, formatear_nombre_completo
 
 if TYPE_CHECKING:
     from .turno import Turno
@@ -61,7 +61,7 @@ class Paciente(Base):
     @property
     def nombre_completo(self) -> str:
         """Retorna el nombre completo del paciente."""
-        return f"{self.apellido}, {self.nombre}"
+        return formatear_nombre_completo(self.apellido, self.nombre)
     
     @property
     def edad(self) -> int:
@@ -75,7 +75,7 @@ class Paciente(Base):
     @property
     def cantidad_turnos(self) -> int:
         """Retorna la cantidad de turnos activos del paciente."""
-        return len([t for t in self.turnos if t.activo])
+        return self._contar_turnos_activos("id_paciente")
     
     def tiene_turnos_futuros(self) -> bool:
         """Verifica si el paciente tiene turnos futuros."""
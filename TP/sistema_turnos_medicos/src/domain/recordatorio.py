@@ -5,7 +5,7 @@ Representa recordatorios automáticos de turnos.
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import String, DateTime, ForeignKey
+from sqlalchemy import String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -14,7 +14,17 @@ if TYPE_CHECKING:
     from .turno import Turno
 
 
-class Recordatorio(Base):
+class ColumnasRecordatorio:
+    """Columnas propias de un recordatorio, compartidas por Recordatorio y RecordatorioArchivado."""
+    
+    canal: Mapped[str] = mapped_column(String(20), nullable=False, default="EMAIL")
+    programado_para: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    enviado_en: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    estado: Mapped[str] = mapped_column(String(20), nullable=False, default="PENDIENTE")
+    error_mensaje: Mapped[str] = mapped_column(String(200), nullable=True)
+
+
+class Recordatorio(ColumnasRecordatorio, Base):
     """
     Entidad que representa un recordatorio de turno.
     
@@ -23,18 +33,16 @@ class Recordatorio(Base):
         canal: Canal de envío (EMAIL, PUSH, SMS)
         programado_para: Fecha y hora programada para envío
         enviado_en: Fecha y hora de envío real
-        estado: Estado del recordatorio (PENDIENTE, ENVIADO, ERROR)
+        estado: Estado del recordatorio (PENDIENTE, ENVIANDO, ENVIADO, ERROR)
         error_mensaje: Mensaje de error si falló
         turno: Turno asociado
     """
     
     __tablename__ = "recordatorios"
-    
-    canal: Mapped[str] = mapped_column(String(20), nullable=False, default="EMAIL")
-    programado_para: Mapped[datetime] = mapped_column(DateTime, nullable=False)
-    enviado_en: Mapped[datetime] = mapped_column(DateTime, nullable=True)
-    estado: Mapped[str] = mapped_column(String(20), nullable=False, default="PENDIENTE")
-    error_mensaje: Mapped[str] = mapped_column(String(200), nullable=True)
+    __table_args__ = (
+        Index("ix_recordatorios_estado_programado", "estado", "programado_para"),
+        Index("ix_recordatorios_turno_canal", "id_turno", "canal"),
+    )
     
     # Foreign Keys
     id_turno: Mapped[int] = mapped_column(ForeignKey("turnos.id"), nullable=False)
@@ -0,0 +1,43 @@
+"""
+Entidad ReservaAgenda del dominio.
+Representa la ocupación de un bloque de la agenda de un médico por un turno.
+"""
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class ReservaAgenda(Base):
+    """
+    Bloque de RESERVA_BLOQUE_MINUTOS de la agenda de un médico ocupado por un turno.
+
+    Un turno activo (PEND, CONF, ASIS) reserva los bloques que cubre por
+    completo. Como los turnos empiezan y duran múltiplos del bloque, dos que
+    se solapan comparten al menos uno, y el índice único (id_medico, inicio)
+    hace que la base de datos rechace el segundo aunque se reserven en
+    transacciones concurrentes.
+
+    Attributes:
+        id_medico: ID del médico
+        inicio: Inicio del bloque
+        id_turno: ID del turno que ocupa el bloque
+    """
+
+    __tablename__ = "reservas_agenda"
+    __table_args__ = (
+        Index("ux_reservas_agenda_medico_inicio", "id_medico", "inicio", unique=True),
+        Index("ix_reservas_agenda_turno", "id_turno"),
+    )
+
+    id_medico: Mapped[int] = mapped_column(ForeignKey("medicos.id"), nullable=False)
+    inicio: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    id_turno: Mapped[int] = mapped_column(ForeignKey("turnos.id"), nullable=False)
+
+    def __repr__(self) -> str:
+        return (
+            f"<ReservaAgenda(medico_id={self.id_medico}, inicio={self.inicio}, "
+            f"turno_id={self.id_turno})>"
+        )
@@ -5,7 +5,7 @@ Representa una reserva de turno médico.
 from datetime import datetime, timedelta
 from typing import Optional, TYPE_CHECKING
 
-from sqlalchemy import String, DateTime, SmallInteger, ForeignKey, Text
+from sqlalchemy import String, DateTime, SmallInteger, ForeignKey, Index, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -19,7 +19,25 @@ if TYPE_CHECKING:
     from .recordatorio import Recordatorio
 
 
-class Turno(Base):
+class ColumnasTurno:
+    """
+    Columnas propias de un turno, compartidas por Turno y TurnoArchivado
+    (ver archivo.py) para que ambas tablas tengan siempre el mismo esquema.
+    """
+    
+    fecha_hora: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    duracion_minutos: Mapped[int] = mapped_column(SmallInteger, nullable=False, default=30)
+    lugar: Mapped[str] = mapped_column(String(120), nullable=True)
+    observaciones: Mapped[str] = mapped_column(Text, nullable=True)
+    
+    # Foreign Keys
+    id_paciente: Mapped[int] = mapped_column(ForeignKey("pacientes.id"), nullable=False)
+    id_medico: Mapped[int] = mapped_column(ForeignKey("medicos.id"), nullable=False)
+    id_especialidad: Mapped[int] = mapped_column(ForeignKey("especialidades.id"), nullable=False)
+    id_estado: Mapped[int] = mapped_column(ForeignKey("estados_turno.id"), nullable=False)
+
+
+class Turno(ColumnasTurno, Base):
     """
     Entidad que representa un turno médico.
     
@@ -41,17 +59,11 @@ class Turno(Base):
     """
     
     __tablename__ = "turnos"
-    
-    fecha_hora: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
-    duracion_minutos: Mapped[int] = mapped_column(SmallInteger, nullable=False, default=30)
-    lugar: Mapped[str] = mapped_column(String(120), nullable=True)
-    observaciones: Mapped[str] = mapped_column(Text, nullable=True)
-    
-    # Foreign Keys
-    id_paciente: Mapped[int] = mapped_column(ForeignKey("pacientes.id"), nullable=False)
-    id_medico: Mapped[int] = mapped_column(ForeignKey("medicos.id"), nullable=False)
-    id_especialidad: Mapped[int] = mapped_column(ForeignKey("especialidades.id"), nullable=False)
-    id_estado: Mapped[int] = mapped_column(ForeignKey("estados_turno.id"), nullable=False)
+    __table_args__ = (
+        Index("ix_turnos_medico_activo_fecha_hora", "id_medico", "activo", "fecha_hora"),
+        Index("ix_turnos_paciente_activo_fecha_hora", "id_paciente", "activo", "fecha_hora"),
+        Index("ix_turnos_estado_fecha_hora", "id_estado", "fecha_hora"),
+    )
     
     # Relaciones
     paciente: Mapped["Paciente"] = relationship(
@@ -2,6 +2,9 @@
 Módulo de repositorios.
 Exports para facilitar el acceso a los repositorios.
 """
+from src.repositories.async_database import AsyncDatabaseManager, async_db_manager
+from src.repositories.archivo_repository import ArchivoRepository, ResultadoArchivoLote
+from src.repositories.async_unit_of_work import AsyncUnitOfWork
 from src.repositories.base_repository import BaseRepository
 from src.repositories.consulta_repository import ConsultaRepository
 from src.repositories.database import DatabaseManager, db_manager
@@ -10,11 +13,17 @@ from src.repositories.disponibilidad_repository import (
     DisponibilidadMedicoRepository,
 )
 from src.repositories.especialidad_repository import EspecialidadRepository
-from src.repositories.estado_turno_repository import EstadoTurnoRepository
+from src.repositories.estadistica_diaria_repository import EstadisticaDiariaRepository
+from src.repositories.estado_turno_repository import (
+    CacheEstadosTurno,
+    EstadoTurnoRepository,
+    cache_estados_turno,
+)
 from src.repositories.medico_repository import MedicoRepository
 from src.repositories.paciente_repository import PacienteRepository
 from src.repositories.receta_repository import ItemRecetaRepository, RecetaRepository
 from src.repositories.recordatorio_repository import RecordatorioRepository
+from src.repositories.reserva_agenda_repository import ReservaAgendaRepository
 from src.repositories.turno_repository import TurnoRepository
 from src.repositories.unit_of_work import UnitOfWork
 
@@ -22,15 +31,21 @@ __all__ = [
     # Database
     "DatabaseManager",
     "db_manager",
+    "AsyncDatabaseManager",
+    "async_db_manager",
     # Base
     "BaseRepository",
     # Unit of Work
     "UnitOfWork",
+    "AsyncUnitOfWork",
     # Repositorios específicos
     "PacienteRepository",
     "MedicoRepository",
     "EspecialidadRepository",
     "EstadoTurnoRepository",
+    # Cache de estados
+    "CacheEstadosTurno",
+    "cache_estados_turno",
     "TurnoRepository",
     "DisponibilidadMedicoRepository",
     "BloqueoMedicoRepository",
@@ -38,4 +53,8 @@ __all__ = [
     "RecetaRepository",
     "ItemRecetaRepository",
     "RecordatorioRepository",
+    "EstadisticaDiariaRepository",
+    "ReservaAgendaRepository",
+    "ArchivoRepository",
+    "ResultadoArchivoLote",
 ]
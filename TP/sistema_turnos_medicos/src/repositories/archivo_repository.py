@@ -0,0 +1,156 @@
+"""Repositorio del archivo histórico de turnos."""
+from datetime import date, datetime, time
+from typing import Callable, List, NamedTuple, Optional, Type
+
+from sqlalchemy import Select, delete, func, insert, or_, select
+from sqlalchemy.orm import Session
+
+from src.domain.archivo import ConsultaArchivada, RecordatorioArchivado, TurnoArchivado
+from src.domain.consulta import Consulta
+from src.domain.receta import Receta
+from src.domain.recordatorio import Recordatorio
+from src.domain.turno import Turno
+from src.repositories.base_repository import BaseRepository
+from src.repositories.estado_turno_repository import EstadoTurnoRepository
+from src.repositories.reserva_agenda_repository import ReservaAgendaRepository
+
+
+class ResultadoArchivoLote(NamedTuple):
+    """Filas movidas al archivo en un lote."""
+    turnos: int
+    consultas: int
+    recordatorios: int
+
+
+class ArchivoRepository(BaseRepository[TurnoArchivado]):
+    """
+    Repositorio del archivo histórico.
+
+    archivar_lote() mueve turnos viejos (con sus consultas y recordatorios) a
+    las tablas *_archivo conservando los IDs. consultar() ejecuta una consulta
+    sobre la tabla vigente y, solo si el rango pedido llega hasta el archivo,
+    también sobre la tabla archivada, y combina los resultados.
+    """
+
+    # Columna de fecha por la que se decide si un rango alcanza el archivo
+    _FECHAS = {
+        TurnoArchivado: "fecha_hora",
+        ConsultaArchivada: "fecha_atencion",
+    }
+
+    def __init__(self, session: Session):
+        super().__init__(session, TurnoArchivado)
+
+    def get_limite(self, modelo: Type = TurnoArchivado) -> Optional[datetime]:
+        """
+        Fecha más reciente archivada de una tabla (una búsqueda por índice).
+
+        Returns:
+            Fecha/hora máxima, o None si el archivo está vacío
+        """
+        return self.session.scalar(select(func.max(getattr(modelo, self._FECHAS[modelo]))))
+
+    def alcanza(self, desde: Optional[date], modelo: Type = TurnoArchivado) -> bool:
+        """
+        Indica si un rango que empieza en `desde` puede incluir filas archivadas.
+
+        Args:
+            desde: Inicio del rango (sin límite si es None)
+            modelo: Entidad archivada a consultar
+        """
+        limite = self.get_limite(modelo)
+        if limite is None:
+            return False
+        if desde is None:
+            return True
+        if not isinstance(desde, datetime):
+            desde = datetime.combine(desde, time.min)
+        return desde <= limite
+
+    def consultar(
+        self,
+        consulta: Callable[[Type], Select],
+        vigente: Type,
+        archivado: Type,
+        desde: Optional[date],
+        descendente: bool = False
+    ) -> List:
+        """
+        Ejecuta una consulta de entidades sobre la tabla vigente y, si el rango
+        alcanza el archivo, también sobre la archivada (ambas comparten columnas
+        y relaciones, por lo que la misma función arma las dos consultas).
+
+        Args:
+            consulta: Función que recibe la clase (vigente o archivada) y arma el SELECT
+            vigente: Entidad de la tabla de trabajo (ej. Turno)
+            archivado: Entidad archivada equivalente (ej. TurnoArchivado)
+            desde: Inicio del rango consultado (sin límite si es None)
+            descendente: Orden de la fecha en el resultado combinado
+
+        Returns:
+            Entidades vigentes y archivadas ordenadas por fecha
+        """
+        filas = list(self.session.scalars(consulta(vigente)).unique().all())
+        if not self.alcanza(desde, archivado):
+            return filas
+
+        filas.extend(self.session.scalars(consulta(archivado)).unique().all())
+        columna = self._FECHAS[archivado]
+        return sorted(filas, key=lambda fila: getattr(fila, columna), reverse=descendente)
+
+    def archivar_lote(self, antes_de: datetime, lote: int) -> ResultadoArchivoLote:
+        """
+        Mueve al archivo hasta `lote` turnos cerrados anteriores a `antes_de`,
+        junto con sus consultas y recordatorios: un INSERT ... SELECT y un
+        DELETE por tabla. No hace commit automático.
+
+        Se archivan los turnos dados de baja y los que ya no están PEND/CONF.
+        Los que tienen recetas quedan en la tabla vigente, porque las recetas
+        referencian a la consulta por clave foránea.
+
+        Args:
+            antes_de: Solo turnos con fecha_hora anterior a este momento
+            lote: Cantidad máxima de turnos a mover
+
+        Returns:
+            Cantidad de turnos, consultas y recordatorios movidos
+        """
+        abiertos = EstadoTurnoRepository(self.session).get_ids_por_codigos(["PEND", "CONF"])
+        tiene_recetas = select(Receta.id).join(
+            Consulta, Receta.id_consulta == Consulta.id
+        ).where(Consulta.id_turno == Turno.id).exists()
+
+        turno_ids = list(self.session.scalars(
+            select(Turno.id).where(
+                Turno.fecha_hora < antes_de,
+                or_(Turno.activo.is_(False), Turno.id_estado.notin_(abiertos)),
+                ~tiene_recetas
+            ).order_by(Turno.fecha_hora).limit(lote)
+        ).all())
+        if not turno_ids:
+            return ResultadoArchivoLote(0, 0, 0)
+
+        turnos = self._copiar(Turno, TurnoArchivado, Turno.id.in_(turno_ids))
+        consultas = self._copiar(Consulta, ConsultaArchivada, Consulta.id_turno.in_(turno_ids))
+        recordatorios = self._copiar(Recordatorio, RecordatorioArchivado, Recordatorio.id_turno.in_(turno_ids))
+
+        ReservaAgendaRepository(self.session).liberar(turno_ids)
+        for modelo, condicion in (
+            (Recordatorio, Recordatorio.id_turno.in_(turno_ids)),
+            (Consulta, Consulta.id_turno.in_(turno_ids)),
+            (Turno, Turno.id.in_(turno_ids)),
+        ):
+            self.session.execute(delete(modelo).where(condicion).execution_options(synchronize_session=False))
+
+        return ResultadoArchivoLote(turnos, consultas, recordatorios)
+
+    def _copiar(self, vigente: Type, archivado: Type, condicion) -> int:
+        """Copia con INSERT ... SELECT las filas que cumplen la condición; retorna cuántas."""
+        origen = vigente.__table__
+        columnas = [columna.name for columna in origen.columns]
+        resultado = self.session.execute(
+            insert(archivado.__table__).from_select(
+                columnas, select(*(origen.c[nombre] for nombre in columnas)).where(condicion)
+            )
+        )
+        return resultado.rowcount
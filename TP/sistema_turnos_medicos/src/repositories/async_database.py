@@ -0,0 +1,102 @@
+"""
+Gestión asíncrona de la base de datos usando el patrón Singleton.
+Provee un motor async (AsyncEngine) y sesiones AsyncSession para los
+endpoints que no deben ocupar un hilo del threadpool mientras esperan a la BD.
+"""
+from typing import Optional
+
+from sqlalchemy import event, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from src.config.settings import config
+from src.repositories.database import DatabaseManager, url_sqlite_compartida
+
+# Driver async equivalente para cada dialecto sincrónico
+DRIVERS_ASYNC = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+
+def url_async(database_url: str) -> str:
+    """
+    Convierte una URL de SQLAlchemy sincrónica en su equivalente async.
+    Si la URL ya usa un driver async se devuelve sin cambios.
+    """
+    url = make_url(database_url)
+    driver = DRIVERS_ASYNC.get(url.get_backend_name())
+    if driver is None or url.drivername in DRIVERS_ASYNC.values():
+        return database_url
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
+
+class AsyncDatabaseManager:
+    """
+    Gestor de base de datos async con patrón Singleton.
+    Comparte la configuración de pool y el perfil de SQLite con DatabaseManager.
+    """
+
+    _instance: Optional["AsyncDatabaseManager"] = None
+    _engine: Optional[AsyncEngine] = None
+    _session_factory: Optional[async_sessionmaker] = None
+
+    def __new__(cls) -> "AsyncDatabaseManager":
+        """Implementación del patrón Singleton."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def initialize(self) -> None:
+        """Inicializa el motor async y la session factory."""
+        if self._engine is not None:
+            return  # Ya inicializado
+
+        # Con SQLite en memoria ambos motores abren la misma base compartida
+        database_url = url_sqlite_compartida(config.ASYNC_DATABASE_URL or url_async(config.DATABASE_URL))
+
+        self._engine = create_async_engine(
+            database_url,
+            **DatabaseManager._opciones_engine(database_url)
+        )
+
+        if self._engine.dialect.name == "sqlite":
+            event.listen(self._engine.sync_engine, "connect", DatabaseManager._aplicar_pragmas_sqlite)
+
+        self._session_factory = async_sessionmaker(
+            bind=self._engine,
+            autoflush=False,
+            expire_on_commit=False
+        )
+
+        print(f"[DB] Motor async inicializado: {self._engine.url.render_as_string(hide_password=True)}")
+
+    def get_session(self) -> AsyncSession:
+        """
+        Crea y retorna una nueva sesión async.
+        El llamador es responsable de cerrar la sesión.
+        """
+        if self._session_factory is None:
+            raise RuntimeError("Async database not initialized. Call initialize() first.")
+
+        return self._session_factory()
+
+    @property
+    def engine(self) -> AsyncEngine:
+        """Retorna el motor async."""
+        if self._engine is None:
+            raise RuntimeError("Async database not initialized. Call initialize() first.")
+        return self._engine
+
+    async def close(self) -> None:
+        """Cierra el motor async."""
+        if self._engine is not None:
+            await self._engine.dispose()
+            # Permite volver a inicializarlo (ej. otro event loop)
+            self._engine = None
+            self._session_factory = None
+            print("[DB] Motor async cerrado")
+
+
+# Instancia global para facilitar el acceso
+async_db_manager = AsyncDatabaseManager()
@@ -0,0 +1,77 @@
+"""
+Variante asíncrona del patrón Unit of Work.
+Envuelve una AsyncSession y permite reutilizar repositorios y servicios
+sincrónicos mediante AsyncSession.run_sync, sin bloquear el event loop.
+"""
+from typing import Callable, Optional, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.repositories.async_database import AsyncDatabaseManager
+from src.repositories.unit_of_work import UnitOfWork
+
+R = TypeVar("R")
+
+
+class AsyncUnitOfWork:
+    """
+    Unit of Work async: gestiona una AsyncSession y su transacción.
+    Implementa async context manager para garantizar rollback/cierre.
+    """
+
+    def __init__(self, db_manager: Optional[AsyncDatabaseManager] = None):
+        """
+        Args:
+            db_manager: Gestor de BD async (usa el singleton si no se provee)
+        """
+        self.db_manager = db_manager or AsyncDatabaseManager()
+        self.session: Optional[AsyncSession] = None
+
+    async def __aenter__(self) -> "AsyncUnitOfWork":
+        """Inicia la unidad de trabajo creando la sesión async."""
+        self.session = self.db_manager.get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """
+        Finaliza la unidad de trabajo.
+        Hace rollback si hubo excepción y cierra la sesión.
+        """
+        if exc_type is not None:
+            await self.rollback()
+
+        if self.session is not None:
+            await self.session.close()
+
+    async def run_sync(self, funcion: Callable[[UnitOfWork], R]) -> R:
+        """
+        Ejecuta lógica sincrónica (repositorios, servicios) sobre esta sesión.
+
+        La función recibe un UnitOfWork ligado a la sesión subyacente; la E/S
+        se realiza con el driver async, por lo que el event loop no se bloquea.
+
+        Args:
+            funcion: Función que recibe un UnitOfWork y retorna un resultado
+        """
+        if self.session is None:
+            raise RuntimeError("No active session. Use within async context manager.")
+
+        return await self.session.run_sync(
+            lambda sync_session: funcion(UnitOfWork.desde_sesion(sync_session))
+        )
+
+    async def commit(self) -> None:
+        """Confirma todos los cambios en la BD."""
+        if self.session is None:
+            raise RuntimeError("No active session. Use within async context manager.")
+
+        try:
+            await self.session.commit()
+        except Exception as e:
+            await self.rollback()
+            raise e
+
+    async def rollback(self) -> None:
+        """Revierte todos los cambios no confirmados."""
+        if self.session is not None:
+            await self.session.rollback()
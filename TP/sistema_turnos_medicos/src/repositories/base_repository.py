@@ -2,9 +2,9 @@
 Repositorio base con operaciones CRUD genéricas.
 Patrón Template Method para reutilización de código.
 """
-from typing import Generic, List, Optional, Type, TypeVar
+from typing import Any, Dict, Generic, Iterable, List, Optional, Set, Type, TypeVar
 
-from sqlalchemy import select
+from sqlalchemy import func, insert, select
 from sqlalchemy.orm import Session
 
 from src.domain.base import Base
@@ -40,11 +40,50 @@ class BaseRepository(Generic[T]):
         stmt = select(self.model_class).where(self.model_class.id == entity_id)
         return self.session.scalar(stmt)
 
+    def get_por_ids(self, entity_ids: Iterable[int]) -> List[T]:
+        """Obtiene varias entidades activas por ID en una sola consulta."""
+        entity_ids = set(entity_ids)
+        if not entity_ids:
+            return []
+        stmt = select(self.model_class).where(
+            self.model_class.id.in_(entity_ids),
+            self.model_class.activo == True  # noqa: E712
+        )
+        return list(self.session.scalars(stmt).all())
+
+    def get_ids_existentes(self, entity_ids: Iterable[int]) -> Set[int]:
+        """Retorna cuáles de los IDs dados corresponden a entidades activas (una sola consulta)."""
+        entity_ids = set(entity_ids)
+        if not entity_ids:
+            return set()
+        stmt = select(self.model_class.id).where(
+            self.model_class.id.in_(entity_ids),
+            self.model_class.activo == True  # noqa: E712
+        )
+        return set(self.session.scalars(stmt).all())
+
     def get_all(self, skip: int = 0, limit: int = 100) -> List[T]:
         """Obtiene todas las entidades activas."""
         stmt = select(self.model_class).where(
             self.model_class.activo == True  # noqa: E712
-        ).offset(skip).limit(limit)
+        ).order_by(self.model_class.id).offset(skip).limit(limit)
+        return list(self.session.scalars(stmt).all())
+
+    def get_pagina(self, limit: int = 100, despues_de_id: Optional[int] = None) -> List[T]:
+        """
+        Obtiene una página de entidades activas paginando por clave (ID).
+        A diferencia de OFFSET, el costo no crece con la profundidad de la página.
+        
+        Args:
+            limit: Cantidad máxima de entidades
+            despues_de_id: ID del último elemento de la página anterior
+        """
+        stmt = select(self.model_class).where(
+            self.model_class.activo == True  # noqa: E712
+        )
+        if despues_de_id is not None:
+            stmt = stmt.where(self.model_class.id > despues_de_id)
+        stmt = stmt.order_by(self.model_class.id).limit(limit)
         return list(self.session.scalars(stmt).all())
 
     def get_all_incluye_inactivos(self, skip: int = 0, limit: int = 100) -> List[T]:
@@ -61,6 +100,40 @@ class BaseRepository(Generic[T]):
         self.session.flush()  # Para obtener el ID generado
         return entity
 
+    def add_all(self, entities: List[T]) -> List[T]:
+        """
+        Agrega varias entidades a la sesión con un único flush.
+        No hace commit automático (manejo por Unit of Work).
+        """
+        self.session.add_all(entities)
+        self.session.flush()
+        return entities
+
+    def insertar_lote(self, filas: List[Dict[str, Any]]) -> List[T]:
+        """
+        Inserta varias filas con un INSERT ejecutado como executemany,
+        sin un flush por entidad. No hace commit automático.
+        
+        Si el dialecto admite RETURNING en executemany, las entidades se
+        obtienen del mismo INSERT (en lotes de varias filas por sentencia,
+        con sort_by_parameter_order para que vuelvan en el orden de las
+        filas); si no, se usa add_all (un único flush, que también lo respeta).
+        
+        Args:
+            filas: Valores de columnas de cada entidad
+        
+        Returns:
+            Entidades insertadas, en el mismo orden que las filas
+        """
+        if not filas:
+            return []
+        
+        if self.session.get_bind().dialect.insert_executemany_returning:
+            stmt = insert(self.model_class).returning(self.model_class, sort_by_parameter_order=True)
+            return list(self.session.scalars(stmt, filas).all())
+        
+        return self.add_all([self.model_class(**fila) for fila in filas])
+
     def update(self, entity: T) -> T:
         """
         Actualiza una entidad existente.
@@ -101,7 +174,18 @@ class BaseRepository(Generic[T]):
 
     def count(self) -> int:
         """Cuenta las entidades activas."""
-        stmt = select(self.model_class).where(
-            self.model_class.activo == True  # noqa: E712
+        return self.count_where()
+
+    def count_where(self, *condiciones) -> int:
+        """
+        Cuenta las entidades activas que cumplen las condiciones dadas.
+        Ejecuta SELECT COUNT(*) sin materializar entidades.
+        
+        Args:
+            condiciones: Expresiones de filtro de SQLAlchemy
+        """
+        stmt = select(func.count()).select_from(self.model_class).where(
+            self.model_class.activo == True,  # noqa: E712
+            *condiciones
         )
-        return len(list(self.session.scalars(stmt).all()))
+        return self.session.scalar(stmt) or 0
@@ -5,7 +5,9 @@ from typing import List, Optional
 from sqlalchemy import select
 from sqlalchemy.orm import Session, joinedload
 
+from src.domain.archivo import ConsultaArchivada
 from src.domain.consulta import Consulta
+from src.repositories.archivo_repository import ArchivoRepository
 from src.repositories.base_repository import BaseRepository
 
 
@@ -39,6 +41,7 @@ class ConsultaRepository(BaseRepository[Consulta]):
     ) -> List[Consulta]:
         """
         Obtiene historia clínica de un paciente.
+        Incluye consultas archivadas si el rango llega hasta el archivo.
         
         Args:
             paciente_id: ID del paciente
@@ -46,26 +49,24 @@ class ConsultaRepository(BaseRepository[Consulta]):
             fecha_hasta: Fecha final (opcional)
         
         Returns:
-            Lista de consultas ordenadas por fecha descendente
+            Lista de consultas (Consulta o ConsultaArchivada) ordenadas por fecha descendente
         """
-        stmt = select(Consulta).join(
-            Consulta.turno
-        ).options(
-            joinedload(Consulta.turno).joinedload("medico"),
-            joinedload(Consulta.turno).joinedload("especialidad")
-        ).where(
-            Consulta.turno.has(id_paciente=paciente_id),
-            Consulta.activo == True  # noqa: E712
-        )
-        
-        if fecha_desde:
-            stmt = stmt.where(Consulta.fecha_atencion >= fecha_desde)
-        
-        if fecha_hasta:
-            stmt = stmt.where(Consulta.fecha_atencion <= fecha_hasta)
+        def consulta(modelo):
+            turno = modelo.turno.property.mapper.class_
+            stmt = select(modelo).join(
+                modelo.turno
+            ).options(
+                joinedload(modelo.turno).joinedload(turno.medico),
+                joinedload(modelo.turno).joinedload(turno.especialidad)
+            ).where(
+                turno.id_paciente == paciente_id,
+                modelo.activo == True  # noqa: E712
+            )
+            return self._filtrar_fechas(stmt, modelo, fecha_desde, fecha_hasta)
         
-        stmt = stmt.order_by(Consulta.fecha_atencion.desc())
-        return list(self.session.scalars(stmt).unique().all())
+        return ArchivoRepository(self.session).consultar(
+            consulta, Consulta, ConsultaArchivada, fecha_desde, descendente=True
+        )
 
     def get_por_medico(
         self,
@@ -75,6 +76,7 @@ class ConsultaRepository(BaseRepository[Consulta]):
     ) -> List[Consulta]:
         """
         Obtiene consultas realizadas por un médico.
+        Incluye consultas archivadas si el rango llega hasta el archivo.
         
         Args:
             medico_id: ID del médico
@@ -82,25 +84,34 @@ class ConsultaRepository(BaseRepository[Consulta]):
             fecha_hasta: Fecha final (opcional)
         
         Returns:
-            Lista de consultas ordenadas por fecha descendente
+            Lista de consultas (Consulta o ConsultaArchivada) ordenadas por fecha descendente
         """
-        stmt = select(Consulta).join(
-            Consulta.turno
-        ).options(
-            joinedload(Consulta.turno).joinedload("paciente")
-        ).where(
-            Consulta.turno.has(id_medico=medico_id),
-            Consulta.activo == True  # noqa: E712
-        )
+        def consulta(modelo):
+            turno = modelo.turno.property.mapper.class_
+            stmt = select(modelo).join(
+                modelo.turno
+            ).options(
+                joinedload(modelo.turno).joinedload(turno.paciente)
+            ).where(
+                turno.id_medico == medico_id,
+                modelo.activo == True  # noqa: E712
+            )
+            return self._filtrar_fechas(stmt, modelo, fecha_desde, fecha_hasta)
         
+        return ArchivoRepository(self.session).consultar(
+            consulta, Consulta, ConsultaArchivada, fecha_desde, descendente=True
+        )
+
+    @staticmethod
+    def _filtrar_fechas(stmt, modelo, fecha_desde: Optional[date], fecha_hasta: Optional[date]):
+        """Aplica el rango sobre fecha_atencion y ordena de la más reciente a la más antigua."""
         if fecha_desde:
-            stmt = stmt.where(Consulta.fecha_atencion >= fecha_desde)
+            stmt = stmt.where(modelo.fecha_atencion >= fecha_desde)
         
         if fecha_hasta:
-            stmt = stmt.where(Consulta.fecha_atencion <= fecha_hasta)
+            stmt = stmt.where(modelo.fecha_atencion <= fecha_hasta)
         
-        stmt = stmt.order_by(Consulta.fecha_atencion.desc())
-        return list(self.session.scalars(stmt).unique().all())
+        return stmt.order_by(modelo.fecha_atencion.desc())
 
     def existe_para_turno(self, turno_id: int) -> bool:
         """
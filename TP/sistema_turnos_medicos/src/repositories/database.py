@@ -2,16 +2,64 @@
 Gestión de la base de datos usando el patrón Singleton.
 Proporciona una única instancia de conexión para toda la aplicación.
 """
+import os
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
 
-from sqlalchemy import Engine, create_engine
+from sqlalchemy import Engine, create_engine, event, make_url
+from sqlalchemy.exc import DBAPIError, IntegrityError, OperationalError
+from sqlalchemy.pool import StaticPool
 from sqlalchemy.orm import Session, sessionmaker
 
 from src.config.settings import config
 from src.domain.base import Base
 
 
+# Errores de contención (bloqueo, espera agotada, deadlock) que se resuelven reintentando
+MENSAJES_BLOQUEO = ("database is locked", "database table is locked", "database is busy")
+CODIGOS_BLOQUEO = {
+    "55P03", "40P01", "40001",  # PostgreSQL: lock_not_available, deadlock, serialization_failure
+    1205, 1213,                 # MySQL: lock wait timeout, deadlock
+}
+
+
+def es_conflicto_concurrente(error: DBAPIError) -> bool:
+    """
+    Indica si un error de escritura se debe a otra transacción concurrente y
+    tiene sentido reintentar: un IntegrityError (ej. el índice único de
+    reservas_agenda) o un OperationalError de bloqueo. Cualquier otro
+    OperationalError (tabla inexistente, E/S, conexión caída) no lo es.
+    """
+    if isinstance(error, IntegrityError):
+        return True
+    if not isinstance(error, OperationalError):
+        return False
+
+    original = error.orig
+    codigo = getattr(original, "sqlstate", None) or getattr(original, "pgcode", None)
+    if codigo is None and original is not None and original.args:
+        codigo = original.args[0]
+    if codigo in CODIGOS_BLOQUEO:
+        return True
+    return any(mensaje in str(original).lower() for mensaje in MENSAJES_BLOQUEO)
+
+
+def url_sqlite_compartida(database_url: str) -> str:
+    """
+    Convierte una URL de SQLite en memoria en una base en memoria con nombre
+    y cache compartido, para que el motor sync y el async (ver
+    AsyncDatabaseManager) usen la misma base: cada conexión a ":memory:"
+    abriría una base vacía distinta. Las demás URLs se devuelven sin cambios.
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite" or url.database not in (None, "", ":memory:"):
+        return database_url
+    return url.set(
+        database=f"file:turnos_memoria_{os.getpid()}",
+        query={"mode": "memory", "cache": "shared", "uri": "true"}
+    ).render_as_string(hide_password=False)
+
+
 class DatabaseManager:
     """
     Gestor de base de datos con patrón Singleton.
@@ -34,12 +82,12 @@ class DatabaseManager:
             return  # Ya inicializado
 
         # Crear motor
-        self._engine = create_engine(
-            config.DATABASE_URL,
-            echo=False,
-            pool_pre_ping=True,  # Verifica conexión antes de usar
-            connect_args={"check_same_thread": False}  # Para SQLite
-        )
+        database_url = url_sqlite_compartida(config.DATABASE_URL)
+        self._engine = create_engine(database_url, **self._opciones_engine(database_url))
+        
+        # Perfil de rendimiento: PRAGMAs en cada nueva conexión
+        if self._engine.dialect.name == "sqlite":
+            event.listen(self._engine, "connect", self._aplicar_pragmas_sqlite)
 
         # Crear session factory
         self._session_factory = sessionmaker(
@@ -49,7 +97,62 @@ class DatabaseManager:
             expire_on_commit=False
         )
 
-        print(f"[DB] Base de datos inicializada: {config.DATABASE_URL}")
+        print(f"[DB] Base de datos inicializada: {self._engine.url.render_as_string(hide_password=True)}")
+        print(f"[DB] Pool de conexiones: {self._engine.pool.status()}")
+        
+        if self._engine.dialect.name == "sqlite":
+            efectivos = ", ".join(f"{k}={v}" for k, v in self.sqlite_pragmas().items())
+            print(f"[DB] Perfil SQLite: {efectivos}")
+
+    @staticmethod
+    def _opciones_engine(database_url: str) -> Dict[str, Any]:
+        """
+        Arma los parámetros de create_engine según el dialecto de la URL.
+        Los argumentos propios de SQLite solo se aplican a SQLite.
+        """
+        url = make_url(database_url)
+        opciones: Dict[str, Any] = {
+            "echo": config.DB_ECHO,
+            "pool_pre_ping": config.DB_POOL_PRE_PING,  # Verifica conexión antes de usar
+        }
+        
+        if url.get_backend_name() == "sqlite":
+            opciones["connect_args"] = {"check_same_thread": False}
+            if url.database in (None, "", ":memory:") or url.query.get("mode") == "memory":
+                # Una única conexión por motor: la base en memoria vive mientras esté abierta
+                opciones["poolclass"] = StaticPool
+                return opciones
+        
+        opciones.update(
+            pool_size=config.DB_POOL_SIZE,
+            max_overflow=config.DB_MAX_OVERFLOW,
+            pool_timeout=config.DB_POOL_TIMEOUT,
+            pool_recycle=config.DB_POOL_RECYCLE,
+        )
+        return opciones
+
+    @staticmethod
+    def _aplicar_pragmas_sqlite(dbapi_connection, connection_record) -> None:
+        """Aplica el perfil de rendimiento de SQLite configurado en Config."""
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f"PRAGMA busy_timeout={int(config.SQLITE_BUSY_TIMEOUT)}")
+            cursor.execute(f"PRAGMA journal_mode={config.SQLITE_JOURNAL_MODE}")
+            cursor.execute(f"PRAGMA synchronous={config.SQLITE_SYNCHRONOUS}")
+            cursor.execute(f"PRAGMA mmap_size={int(config.SQLITE_MMAP_SIZE)}")
+            cursor.execute(f"PRAGMA cache_size={int(config.SQLITE_CACHE_SIZE)}")
+            cursor.execute(f"PRAGMA temp_store={config.SQLITE_TEMP_STORE}")
+        finally:
+            cursor.close()
+
+    def sqlite_pragmas(self) -> Dict[str, Any]:
+        """Retorna los valores efectivos de los PRAGMAs del perfil de SQLite."""
+        nombres = ["journal_mode", "synchronous", "mmap_size", "cache_size", "temp_store", "busy_timeout"]
+        with self.engine.connect() as conn:
+            return {
+                nombre: conn.exec_driver_sql(f"PRAGMA {nombre}").scalar()
+                for nombre in nombres
+            }
 
     def create_tables(self) -> None:
         """Crea todas las tablas en la base de datos."""
@@ -58,6 +161,24 @@ class DatabaseManager:
         
         Base.metadata.create_all(self._engine)
         print("[DB] Tablas creadas exitosamente")
+        
+        self.run_migrations()
+
+    def run_migrations(self) -> None:
+        """
+        Aplica las migraciones versionadas pendientes (índices, columnas, etc.)
+        sobre bases de datos ya existentes.
+        """
+        if self._engine is None:
+            raise RuntimeError("Database not initialized. Call initialize() first.")
+        
+        from src.repositories.migrations import aplicar_migraciones
+        
+        with self._engine.begin() as conn:
+            aplicadas = aplicar_migraciones(conn)
+        
+        for paso in aplicadas:
+            print(f"[DB] Migración {paso.version} aplicada: {paso.descripcion}")
 
     def drop_tables(self) -> None:
         """Elimina todas las tablas (solo para testing)."""
@@ -24,6 +24,24 @@ class DisponibilidadMedicoRepository(BaseRepository[DisponibilidadMedico]):
         
         return list(self.session.scalars(stmt).all())
 
+    def get_por_medicos(self, medico_ids: List[int]) -> List[DisponibilidadMedico]:
+        """
+        Obtiene las disponibilidades de varios médicos en una sola consulta.
+        
+        Args:
+            medico_ids: IDs de los médicos
+        """
+        stmt = select(DisponibilidadMedico).where(
+            DisponibilidadMedico.id_medico.in_(medico_ids),
+            DisponibilidadMedico.activo == True  # noqa: E712
+        ).order_by(
+            DisponibilidadMedico.id_medico,
+            DisponibilidadMedico.dia_semana,
+            DisponibilidadMedico.hora_desde
+        )
+        
+        return list(self.session.scalars(stmt).all())
+
     def get_por_medico_y_dia(self, medico_id: int, dia_semana: int) -> List[DisponibilidadMedico]:
         """
         Obtiene disponibilidades de un médico para un día específico.
@@ -117,6 +135,29 @@ class BloqueoMedicoRepository(BaseRepository[BloqueoMedico]):
         stmt = stmt.order_by(BloqueoMedico.inicio)
         return list(self.session.scalars(stmt).all())
 
+    def get_por_medicos(
+        self,
+        medico_ids: List[int],
+        fecha_desde: date,
+        fecha_hasta: date
+    ) -> List[BloqueoMedico]:
+        """
+        Obtiene los bloqueos de varios médicos que tocan un rango de fechas.
+        
+        Args:
+            medico_ids: IDs de los médicos
+            fecha_desde: Fecha inicial
+            fecha_hasta: Fecha final
+        """
+        stmt = select(BloqueoMedico).where(
+            BloqueoMedico.id_medico.in_(medico_ids),
+            BloqueoMedico.activo == True,  # noqa: E712
+            BloqueoMedico.fin >= datetime.combine(fecha_desde, time.min),
+            BloqueoMedico.inicio <= datetime.combine(fecha_hasta, time.max)
+        ).order_by(BloqueoMedico.inicio)
+        
+        return list(self.session.scalars(stmt).all())
+
     def verificar_bloqueado(
         self,
         medico_id: int,
@@ -0,0 +1,231 @@
+"""Repositorio para la entidad EstadisticaDiaria (resumen diario de turnos)."""
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from sqlalchemy import Date, bindparam, delete, func, insert, select, tuple_, union_all, update
+from sqlalchemy.orm import Session
+
+from src.domain.archivo import TurnoArchivado
+from src.domain.especialidad import Especialidad
+from src.domain.estadistica_diaria import EstadisticaDiaria
+from src.domain.turno import Turno
+from src.repositories.base_repository import BaseRepository
+
+# (fecha, id_medico, id_especialidad, id_estado)
+ClaveEstadistica = Tuple[date, int, int, int]
+
+
+class EstadisticaDiariaRepository(BaseRepository[EstadisticaDiaria]):
+    """
+    Repositorio del resumen diario de turnos.
+
+    Las altas y cambios de estado se aplican como variaciones (+1/-1) sobre
+    la fila de su clave, dentro de la misma transacción que modifica el turno.
+    """
+
+    def __init__(self, session: Session):
+        super().__init__(session, EstadisticaDiaria)
+
+    @staticmethod
+    def _clave(turno: Turno, estado_id: int) -> ClaveEstadistica:
+        return (turno.fecha_hora.date(), turno.id_medico, turno.id_especialidad, estado_id)
+
+    def registrar_alta(self, turno: Turno) -> None:
+        """Suma un turno nuevo al resumen de su día y estado."""
+        self.registrar_altas([turno])
+
+    def registrar_altas(self, turnos: Iterable[Turno]) -> None:
+        """Suma varios turnos nuevos agrupando por clave."""
+        self.aplicar_variaciones(Counter(self._clave(turno, turno.id_estado) for turno in turnos))
+
+    def registrar_cambio_estado(self, turno: Turno, estado_anterior_id: int) -> None:
+        """
+        Mueve un turno del estado anterior a su estado actual en el resumen.
+
+        Args:
+            turno: Turno con el nuevo id_estado ya asignado
+            estado_anterior_id: ID del estado previo al cambio
+        """
+        self.registrar_cambios_estado([(turno, estado_anterior_id)])
+
+    def registrar_cambios_estado(self, cambios: Iterable[Tuple[Turno, int]]) -> None:
+        """Aplica varios cambios de estado agrupando las variaciones por clave."""
+        variaciones: Counter = Counter()
+        for turno, estado_anterior_id in cambios:
+            if turno.id_estado == estado_anterior_id:
+                continue
+            variaciones[self._clave(turno, estado_anterior_id)] -= 1
+            variaciones[self._clave(turno, turno.id_estado)] += 1
+        self.aplicar_variaciones(variaciones)
+
+    def registrar_transiciones(self, filas: Iterable, estado_id: int) -> None:
+        """
+        Mueve varios turnos a un mismo estado destino sin materializar entidades.
+
+        Args:
+            filas: Filas con fecha_hora, id_medico, id_especialidad e id_estado anterior
+            estado_id: ID del estado destino
+        """
+        variaciones: Counter = Counter()
+        for fila in filas:
+            if fila.id_estado == estado_id:
+                continue
+            variaciones[self._clave(fila, fila.id_estado)] -= 1
+            variaciones[self._clave(fila, estado_id)] += 1
+        self.aplicar_variaciones(variaciones)
+
+    def aplicar_variaciones(self, variaciones: Mapping[ClaveEstadistica, int]) -> None:
+        """
+        Suma cada variación a la fila de su clave; crea las filas que falten.
+        Usa una consulta de claves existentes, un UPDATE y un INSERT (executemany),
+        sin importar cuántas claves haya. No hace commit automático.
+
+        Args:
+            variaciones: Diccionario {(fecha, id_medico, id_especialidad, id_estado): delta}
+
+        Raises:
+            IntegrityError: Si otra transacción creó la misma fila en paralelo
+        """
+        variaciones = {clave: delta for clave, delta in variaciones.items() if delta}
+        if not variaciones:
+            return
+
+        tabla = EstadisticaDiaria.__table__
+        columnas_clave = (tabla.c.fecha, tabla.c.id_medico, tabla.c.id_especialidad, tabla.c.id_estado)
+        existentes = set(
+            self.session.execute(select(*columnas_clave).where(tuple_(*columnas_clave).in_(list(variaciones))))
+        )
+
+        actualizar = [
+            {"b_fecha": fecha, "b_medico": medico_id, "b_especialidad": especialidad_id,
+             "b_estado": estado_id, "b_delta": delta}
+            for (fecha, medico_id, especialidad_id, estado_id), delta in variaciones.items()
+            if (fecha, medico_id, especialidad_id, estado_id) in existentes
+        ]
+        # Sin fila previa solo tiene sentido una variación positiva
+        nuevas = [
+            {"fecha": fecha, "id_medico": medico_id, "id_especialidad": especialidad_id,
+             "id_estado": estado_id, "cantidad": delta}
+            for (fecha, medico_id, especialidad_id, estado_id), delta in variaciones.items()
+            if (fecha, medico_id, especialidad_id, estado_id) not in existentes and delta > 0
+        ]
+
+        if actualizar:
+            self.session.execute(
+                update(tabla)
+                .where(
+                    tabla.c.fecha == bindparam("b_fecha"),
+                    tabla.c.id_medico == bindparam("b_medico"),
+                    tabla.c.id_especialidad == bindparam("b_especialidad"),
+                    tabla.c.id_estado == bindparam("b_estado")
+                )
+                .values(cantidad=tabla.c.cantidad + bindparam("b_delta")),
+                actualizar
+            )
+        if nuevas:
+            self.session.execute(insert(EstadisticaDiaria), nuevas)
+
+    def reconstruir(self, desde: Optional[date] = None, hasta: Optional[date] = None) -> int:
+        """
+        Recalcula el resumen a partir de las tablas turnos y turnos_archivo (backfill).
+        Borra las filas del rango y las vuelve a generar con un único GROUP BY.
+        No hace commit automático.
+
+        Args:
+            desde: Primer día a reconstruir (sin límite si es None)
+            hasta: Último día a reconstruir, inclusive (sin límite si es None)
+
+        Returns:
+            Cantidad de filas generadas
+        """
+        borrar = delete(EstadisticaDiaria)
+        if desde is not None:
+            borrar = borrar.where(EstadisticaDiaria.fecha >= desde)
+        if hasta is not None:
+            borrar = borrar.where(EstadisticaDiaria.fecha <= hasta)
+
+        def turnos_del_rango(modelo):
+            stmt = select(modelo.fecha_hora, modelo.id_medico, modelo.id_especialidad, modelo.id_estado)
+            if desde is not None:
+                stmt = stmt.where(modelo.fecha_hora >= datetime.combine(desde, time.min))
+            if hasta is not None:
+                stmt = stmt.where(modelo.fecha_hora < datetime.combine(hasta + timedelta(days=1), time.min))
+            return stmt
+
+        turnos = union_all(turnos_del_rango(Turno), turnos_del_rango(TurnoArchivado)).subquery()
+        fecha_turno = func.date(turnos.c.fecha_hora, type_=Date)
+        agregar = select(
+            fecha_turno.label("fecha"),
+            turnos.c.id_medico,
+            turnos.c.id_especialidad,
+            turnos.c.id_estado,
+            func.count().label("cantidad")
+        ).group_by(fecha_turno, turnos.c.id_medico, turnos.c.id_especialidad, turnos.c.id_estado)
+
+        self.session.execute(borrar.execution_options(synchronize_session=False))
+
+        filas = [fila._asdict() for fila in self.session.execute(agregar)]
+        if filas:
+            self.session.execute(insert(EstadisticaDiaria), filas)
+        return len(filas)
+
+    def _filtrar(self, stmt, fecha_inicio: date, fecha_fin: date, medico_id: Optional[int], especialidad_id: Optional[int]):
+        """Aplica el rango de días (inclusive) y los filtros opcionales."""
+        stmt = stmt.where(
+            EstadisticaDiaria.fecha >= fecha_inicio,
+            EstadisticaDiaria.fecha <= fecha_fin
+        )
+        if medico_id:
+            stmt = stmt.where(EstadisticaDiaria.id_medico == medico_id)
+        if especialidad_id:
+            stmt = stmt.where(EstadisticaDiaria.id_especialidad == especialidad_id)
+        return stmt
+
+    def contar_por_estado(
+        self,
+        fecha_inicio: date,
+        fecha_fin: date,
+        estado_ids: List[int],
+        medico_id: Optional[int] = None,
+        especialidad_id: Optional[int] = None
+    ) -> Dict[int, int]:
+        """
+        Suma la cantidad de turnos por estado en un rango de días.
+
+        Returns:
+            Diccionario {id_estado: cantidad} (solo estados con turnos)
+        """
+        stmt = select(
+            EstadisticaDiaria.id_estado,
+            func.sum(EstadisticaDiaria.cantidad)
+        ).where(EstadisticaDiaria.id_estado.in_(estado_ids))
+
+        stmt = self._filtrar(stmt, fecha_inicio, fecha_fin, medico_id, especialidad_id)
+        return {
+            estado_id: cantidad
+            for estado_id, cantidad in self.session.execute(stmt.group_by(EstadisticaDiaria.id_estado))
+            if cantidad
+        }
+
+    def contar_por_especialidad(
+        self,
+        fecha_inicio: date,
+        fecha_fin: date,
+        medico_id: Optional[int] = None,
+        especialidad_id: Optional[int] = None
+    ) -> List[Tuple[str, int]]:
+        """
+        Suma la cantidad de turnos por especialidad en un rango de días.
+
+        Returns:
+            Lista de (nombre de especialidad, cantidad)
+        """
+        total = func.sum(EstadisticaDiaria.cantidad)
+        stmt = select(Especialidad.nombre, total).select_from(EstadisticaDiaria).join(
+            Especialidad, EstadisticaDiaria.id_especialidad == Especialidad.id
+        )
+
+        stmt = self._filtrar(stmt, fecha_inicio, fecha_fin, medico_id, especialidad_id)
+        stmt = stmt.group_by(Especialidad.id, Especialidad.nombre).having(total > 0)
+        return [(nombre, cantidad) for nombre, cantidad in self.session.execute(stmt)]
@@ -1,5 +1,7 @@
 """Repositorio para la entidad EstadoTurno."""
-from typing import Optional
+import threading
+from types import MappingProxyType
+from typing import Iterable, List, Mapping, Optional
 
 from sqlalchemy import select
 from sqlalchemy.orm import Session
@@ -8,6 +10,62 @@ from src.domain.estado_turno import EstadoTurno
 from src.repositories.base_repository import BaseRepository
 
 
+class CacheEstadosTurno:
+    """
+    Cache en proceso de los estados de turno (patrón Singleton).
+    
+    Los estados son datos de referencia estáticos (ver
+    init_data.inicializar_estados_turno), por lo que se cargan una vez y se
+    resuelven sin consultar la BD. Los mapas son inmutables y se reemplazan
+    completos al recargar; invalidar() fuerza una recarga en el próximo uso.
+    """
+
+    _instance: Optional["CacheEstadosTurno"] = None
+
+    def __new__(cls) -> "CacheEstadosTurno":
+        """Implementación del patrón Singleton."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._lock = threading.Lock()
+            cls._instance._por_codigo = MappingProxyType({})
+            cls._instance._por_id = MappingProxyType({})
+        return cls._instance
+
+    @property
+    def cargado(self) -> bool:
+        """Indica si el cache tiene estados cargados."""
+        return bool(self._por_codigo)
+
+    def cargar(self, session: Session) -> None:
+        """Carga (o recarga) los estados activos desde la BD."""
+        filas = session.execute(
+            select(EstadoTurno.id, EstadoTurno.codigo).where(EstadoTurno.activo.is_(True))
+        ).all()
+        with self._lock:
+            self._por_codigo = MappingProxyType({codigo: estado_id for estado_id, codigo in filas})
+            self._por_id = MappingProxyType({estado_id: codigo for estado_id, codigo in filas})
+
+    def invalidar(self) -> None:
+        """Descarta los estados cargados (se recargan en el próximo acceso)."""
+        with self._lock:
+            self._por_codigo = MappingProxyType({})
+            self._por_id = MappingProxyType({})
+
+    @property
+    def por_codigo(self) -> Mapping[str, int]:
+        """Mapa inmutable codigo → id."""
+        return self._por_codigo
+
+    @property
+    def por_id(self) -> Mapping[int, str]:
+        """Mapa inmutable id → codigo."""
+        return self._por_id
+
+
+# Instancia global del cache
+cache_estados_turno = CacheEstadosTurno()
+
+
 class EstadoTurnoRepository(BaseRepository[EstadoTurno]):
     """Repositorio específico para Estados de Turno."""
 
@@ -30,6 +88,33 @@ class EstadoTurnoRepository(BaseRepository[EstadoTurno]):
         )
         return self.session.scalar(stmt)
 
+    def _cache(self) -> CacheEstadosTurno:
+        """Retorna el cache de estados, cargándolo si está vacío."""
+        if not cache_estados_turno.cargado:
+            cache_estados_turno.cargar(self.session)
+        return cache_estados_turno
+
+    def get_id_por_codigo(self, codigo: str) -> Optional[int]:
+        """
+        Resuelve el ID de un estado a partir de su código usando el cache.
+        
+        Args:
+            codigo: Código del estado
+        
+        Returns:
+            ID del estado o None si no existe
+        """
+        return self._cache().por_codigo.get(codigo)
+
+    def get_ids_por_codigos(self, codigos: Iterable[str]) -> List[int]:
+        """Resuelve los IDs de varios códigos de estado (ignora los inexistentes)."""
+        por_codigo = self._cache().por_codigo
+        return [por_codigo[c] for c in codigos if c in por_codigo]
+
+    def get_codigo_por_id(self, estado_id: int) -> Optional[str]:
+        """Resuelve el código de un estado a partir de su ID usando el cache."""
+        return self._cache().por_id.get(estado_id)
+
     def get_pendiente(self) -> Optional[EstadoTurno]:
         """Obtiene el estado PENDIENTE."""
         return self.get_by_codigo("PEND")
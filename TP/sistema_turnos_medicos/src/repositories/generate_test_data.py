@@ -138,6 +138,8 @@ if __name__ == "__main__":
         try:
             generar_pacientes_extra(uow)
             generar_turnos_masivos(uow)
+            uow.estadisticas.reconstruir()
+            uow.reservas.reconstruir(datetime.now())
             uow.commit()
             print("\n[SUCCESS] Datos generados exitosamente.")
         except Exception as e:
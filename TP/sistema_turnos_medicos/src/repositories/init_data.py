@@ -6,6 +6,7 @@ from src.domain.estado_turno import EstadoTurno
 from src.domain.medico import Medico
 from src.domain.paciente import Paciente
 from src.domain.disponibilidad import DisponibilidadMedico
+from src.repositories.estado_turno_repository import cache_estados_turno
 from src.repositories.unit_of_work import UnitOfWork
 
 
@@ -265,6 +266,10 @@ def inicializar_datos_base() -> None:
             # Commit de todos los cambios
             uow.commit()
             
+            # Recargar el cache de estados con los datos confirmados
+            cache_estados_turno.invalidar()
+            cache_estados_turno.cargar(uow.session)
+            
             print("\n" + "="*60)
             print("INICIALIZACIÓN COMPLETADA EXITOSAMENTE")
             print("="*60 + "\n")
@@ -1,5 +1,5 @@
 """Repositorio para la entidad Médico."""
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
 from sqlalchemy import or_, select
 from sqlalchemy.orm import Session, joinedload
@@ -32,6 +32,16 @@ class MedicoRepository(BaseRepository[Medico]):
         )
         return self.session.scalar(stmt)
 
+    def get_por_ids_con_especialidades(self, medico_ids: Iterable[int]) -> List[Medico]:
+        """Obtiene varios médicos activos con sus especialidades en una sola consulta."""
+        stmt = select(Medico).options(
+            joinedload(Medico.especialidades)
+        ).where(
+            Medico.id.in_(set(medico_ids)),
+            Medico.activo == True  # noqa: E712
+        )
+        return list(self.session.scalars(stmt).unique().all())
+
     def exists_matricula(self, matricula: str, exclude_id: Optional[int] = None) -> bool:
         """
         Verifica si existe un médico activo con la matrícula dada.
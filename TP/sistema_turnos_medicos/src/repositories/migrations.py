@@ -0,0 +1,115 @@
+"""
+Migraciones versionadas del esquema de base de datos.
+
+Base.metadata.create_all solo crea tablas inexistentes: nunca agrega índices
+ni columnas a tablas que ya existen. Cada migración registrada aquí se aplica
+una única vez por base de datos y su versión queda registrada en la tabla
+schema_version.
+"""
+from datetime import datetime
+from typing import Callable, List, NamedTuple
+
+from sqlalchemy import Column, Connection, DateTime, Integer, MetaData, String, Table, select
+from sqlalchemy.orm import Session
+
+from src.domain.recordatorio import Recordatorio
+from src.domain.turno import Turno
+from src.repositories.estadistica_diaria_repository import EstadisticaDiariaRepository
+from src.repositories.reserva_agenda_repository import ReservaAgendaRepository
+
+metadata_migraciones = MetaData()
+
+schema_version = Table(
+    "schema_version",
+    metadata_migraciones,
+    Column("version", Integer, primary_key=True),
+    Column("descripcion", String(200), nullable=False),
+    Column("aplicada_en", DateTime, nullable=False, default=datetime.now),
+)
+
+
+class Migracion(NamedTuple):
+    """Paso de migración: versión, descripción y función a ejecutar."""
+    version: int
+    descripcion: str
+    aplicar: Callable[[Connection], None]
+
+
+MIGRACIONES: List[Migracion] = []
+
+
+def migracion(version: int, descripcion: str):
+    """Decorador que registra una función como paso de migración."""
+    def decorador(funcion: Callable[[Connection], None]) -> Callable[[Connection], None]:
+        MIGRACIONES.append(Migracion(version, descripcion, funcion))
+        MIGRACIONES.sort(key=lambda m: m.version)
+        return funcion
+    return decorador
+
+
+def _crear_indices_modelo(conn: Connection, tabla: Table) -> None:
+    """Crea los índices declarados en el modelo que todavía no existen."""
+    for index in tabla.indexes:
+        index.create(conn, checkfirst=True)
+
+
+@migracion(1, "Índices compuestos de turnos por médico, paciente y estado")
+def _indices_compuestos_turnos(conn: Connection) -> None:
+    _crear_indices_modelo(conn, Turno.__table__)
+
+
+@migracion(2, "Índices de recordatorios para la cola de envío")
+def _indices_recordatorios(conn: Connection) -> None:
+    _crear_indices_modelo(conn, Recordatorio.__table__)
+
+
+@migracion(3, "Resumen diario de turnos calculado desde los turnos existentes")
+def _backfill_estadisticas_diarias(conn: Connection) -> None:
+    # La tabla la crea create_all; aquí solo se carga con los turnos previos
+    with Session(bind=conn) as session:
+        EstadisticaDiariaRepository(session).reconstruir()
+        session.flush()
+
+
+@migracion(4, "Reservas de agenda de los turnos activos futuros")
+def _backfill_reservas_agenda(conn: Connection) -> None:
+    # Solo importan los turnos reservables: desde hoy en adelante
+    with Session(bind=conn) as session:
+        ReservaAgendaRepository(session).reconstruir(datetime.now())
+        session.flush()
+
+
+@migracion(5, "Reservas de agenda solo con bloques cubiertos por completo")
+def _reservas_agenda_bloques_completos(conn: Connection) -> None:
+    # Las reservas previas incluían bloques cubiertos en parte, que chocaban con turnos contiguos
+    with Session(bind=conn) as session:
+        ReservaAgendaRepository(session).reconstruir(datetime.now())
+        session.flush()
+
+
+def aplicar_migraciones(conn: Connection) -> List[Migracion]:
+    """
+    Aplica en orden las migraciones pendientes.
+
+    Args:
+        conn: Conexión dentro de una transacción
+
+    Returns:
+        Lista de migraciones aplicadas en esta ejecución
+    """
+    metadata_migraciones.create_all(conn)
+    aplicadas = set(conn.scalars(select(schema_version.c.version)).all())
+
+    nuevas = []
+    for paso in MIGRACIONES:
+        if paso.version in aplicadas:
+            continue
+        paso.aplicar(conn)
+        conn.execute(schema_version.insert().values(
+            version=paso.version,
+            descripcion=paso.descripcion,
+            aplicada_en=datetime.now()
+        ))
+        nuevas.append(paso)
+
+    return nuevas
@@ -1,14 +1,22 @@
 """Repositorio para la entidad Recordatorio."""
 from datetime import datetime
-from typing import List, Optional
+from typing import Iterable, List, Optional, Set, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import Row, func, select, update
 from sqlalchemy.orm import Session, joinedload
 
+from src.domain.especialidad import Especialidad
+from src.domain.medico import Medico
+from src.domain.paciente import Paciente
 from src.domain.recordatorio import Recordatorio
+from src.domain.turno import Turno
 from src.repositories.base_repository import BaseRepository
 
 
+# Recordatorios todavía en la cola (aún no enviados ni descartados)
+ESTADOS_EN_COLA = ("PENDIENTE", "ENVIANDO")
+
+
 class RecordatorioRepository(BaseRepository[Recordatorio]):
     """Repositorio para Recordatorios de turnos."""
 
@@ -34,35 +42,195 @@ class RecordatorioRepository(BaseRepository[Recordatorio]):
 
     def get_pendientes_de_envio(
         self,
-        hasta: Optional[datetime] = None
+        hasta: Optional[datetime] = None,
+        limite: Optional[int] = None
     ) -> List[Recordatorio]:
         """
         Obtiene recordatorios pendientes de envío.
         
         Args:
             hasta: Fecha/hora límite para envío (opcional, por defecto ahora)
+            limite: Cantidad máxima de recordatorios (opcional)
         
         Returns:
-            Lista de recordatorios PENDIENTE que deben enviarse
+            Lista de recordatorios PENDIENTE que deben enviarse, del más antiguo al más nuevo
         """
         if hasta is None:
             hasta = datetime.now()
         
         stmt = select(Recordatorio).options(
-            joinedload(Recordatorio.turno).joinedload("paciente"),
-            joinedload(Recordatorio.turno).joinedload("medico"),
-            joinedload(Recordatorio.turno).joinedload("especialidad")
+            joinedload(Recordatorio.turno).joinedload(Turno.paciente),
+            joinedload(Recordatorio.turno).joinedload(Turno.medico),
+            joinedload(Recordatorio.turno).joinedload(Turno.especialidad)
         ).where(
             Recordatorio.activo == True,  # noqa: E712
             Recordatorio.estado == "PENDIENTE",
             Recordatorio.programado_para <= hasta
-        ).order_by(Recordatorio.programado_para)
+        ).order_by(Recordatorio.programado_para, Recordatorio.id)
+        
+        if limite is not None:
+            stmt = stmt.limit(limite)
         
         return list(self.session.scalars(stmt).unique().all())
 
+    def reclamar_pendientes(self, hasta: datetime, limite: int) -> List[int]:
+        """
+        Toma un lote de recordatorios vencidos y los pasa a ENVIANDO.
+        Solo se devuelven los que seguían PENDIENTE al momento del UPDATE.
+        
+        Args:
+            hasta: Fecha/hora límite para envío
+            limite: Tamaño máximo del lote
+        
+        Returns:
+            IDs de los recordatorios reclamados, del más antiguo al más nuevo
+        """
+        ids = list(self.session.scalars(
+            select(Recordatorio.id).where(
+                Recordatorio.activo == True,  # noqa: E712
+                Recordatorio.estado == "PENDIENTE",
+                Recordatorio.programado_para <= hasta
+            ).order_by(Recordatorio.programado_para, Recordatorio.id).limit(limite)
+        ).all())
+        if not ids:
+            return []
+        
+        stmt = (
+            update(Recordatorio)
+            .where(Recordatorio.id.in_(ids), Recordatorio.estado == "PENDIENTE")
+            .values(estado="ENVIANDO")
+            .execution_options(synchronize_session=False)
+        )
+        
+        if self.session.get_bind().dialect.update_returning:
+            reclamados = set(self.session.scalars(stmt.returning(Recordatorio.id)).all())
+            return [recordatorio_id for recordatorio_id in ids if recordatorio_id in reclamados]
+        
+        # Sin RETURNING: la exclusividad la garantiza el bloqueo de líder del scheduler
+        self.session.execute(stmt)
+        return ids
+
+    def get_datos_envio(self, ids: List[int]) -> List[Row]:
+        """
+        Obtiene en una sola consulta los datos necesarios para enviar los recordatorios.
+        Devuelve filas planas (sin entidades) para no disparar cargas perezosas.
+        
+        Args:
+            ids: IDs de recordatorios
+        
+        Returns:
+            Filas con id, email, paciente_nombre, fecha_hora, medico_nombre,
+            medico_apellido, especialidad, turno_activo e id_estado
+        """
+        if not ids:
+            return []
+        
+        stmt = (
+            select(
+                Recordatorio.id,
+                Paciente.email,
+                Paciente.nombre.label("paciente_nombre"),
+                Turno.fecha_hora,
+                Medico.nombre.label("medico_nombre"),
+                Medico.apellido.label("medico_apellido"),
+                Especialidad.nombre.label("especialidad"),
+                Turno.activo.label("turno_activo"),
+                Turno.id_estado
+            )
+            .join(Turno, Recordatorio.id_turno == Turno.id)
+            .join(Paciente, Turno.id_paciente == Paciente.id)
+            .join(Medico, Turno.id_medico == Medico.id)
+            .join(Especialidad, Turno.id_especialidad == Especialidad.id)
+            .where(Recordatorio.id.in_(ids))
+            .order_by(Recordatorio.programado_para, Recordatorio.id)
+        )
+        return list(self.session.execute(stmt).all())
+
+    def marcar_enviados(self, ids: List[int], enviado_en: datetime) -> None:
+        """Marca como ENVIADO los recordatorios reclamados indicados."""
+        if not ids:
+            return
+        self.session.execute(
+            update(Recordatorio)
+            .where(Recordatorio.id.in_(ids), Recordatorio.estado == "ENVIANDO")
+            .values(estado="ENVIADO", enviado_en=enviado_en)
+            .execution_options(synchronize_session=False)
+        )
+
+    def marcar_con_error(self, ids: List[int], mensaje: str) -> None:
+        """Marca como ERROR los recordatorios reclamados indicados."""
+        if not ids:
+            return
+        self.session.execute(
+            update(Recordatorio)
+            .where(Recordatorio.id.in_(ids), Recordatorio.estado == "ENVIANDO")
+            .values(estado="ERROR", error_mensaje=mensaje[:200])
+            .execution_options(synchronize_session=False)
+        )
+
+    def liberar_reclamados(self) -> int:
+        """
+        Devuelve a PENDIENTE los recordatorios que quedaron en ENVIANDO
+        (por ejemplo, si el proceso terminó a mitad de un lote).
+        
+        Returns:
+            Cantidad de recordatorios liberados
+        """
+        resultado = self.session.execute(
+            update(Recordatorio)
+            .where(Recordatorio.estado == "ENVIANDO")
+            .values(estado="PENDIENTE")
+            .execution_options(synchronize_session=False)
+        )
+        return resultado.rowcount
+
+    def get_proximo_programado(self) -> Optional[datetime]:
+        """Obtiene la fecha/hora del próximo recordatorio PENDIENTE, o None si no hay."""
+        stmt = select(func.min(Recordatorio.programado_para)).where(
+            Recordatorio.activo == True,  # noqa: E712
+            Recordatorio.estado == "PENDIENTE"
+        )
+        return self.session.scalar(stmt)
+
+    def get_turnos_sin_recordatorio(
+        self,
+        estado_id: int,
+        desde: datetime,
+        canal: str = "EMAIL"
+    ) -> List[Tuple[int, datetime]]:
+        """
+        Obtiene los turnos futuros en un estado dado que no tienen recordatorio para el canal.
+        A diferencia de existe_para_turno, cuenta recordatorios en cualquier
+        estado: se usa al tomar el liderazgo y no debe reenviar los ya enviados.
+        
+        Args:
+            estado_id: ID del estado de turno (por ejemplo CONF)
+            desde: Solo turnos posteriores a esta fecha/hora
+            canal: Canal de envío
+        
+        Returns:
+            Lista de tuplas (id_turno, fecha_hora)
+        """
+        tiene_recordatorio = select(Recordatorio.id).where(
+            Recordatorio.id_turno == Turno.id,
+            Recordatorio.canal == canal,
+            Recordatorio.activo == True  # noqa: E712
+        ).exists()
+        
+        stmt = select(Turno.id, Turno.fecha_hora).where(
+            Turno.activo == True,  # noqa: E712
+            Turno.id_estado == estado_id,
+            Turno.fecha_hora > desde,
+            ~tiene_recordatorio
+        ).order_by(Turno.fecha_hora)
+        
+        return [(fila.id, fila.fecha_hora) for fila in self.session.execute(stmt)]
+
     def existe_para_turno(self, turno_id: int, canal: str) -> bool:
         """
-        Verifica si ya existe un recordatorio para el turno y canal dados.
+        Verifica si el turno ya tiene un recordatorio en cola (PENDIENTE o
+        ENVIANDO) para el canal. Los enviados o con error no cuentan: un turno
+        que se vuelve a confirmar debe recibir un recordatorio nuevo.
         
         Args:
             turno_id: ID del turno
@@ -71,13 +239,38 @@ class RecordatorioRepository(BaseRepository[Recordatorio]):
         Returns:
             True si existe, False en caso contrario
         """
-        stmt = select(Recordatorio).where(
+        stmt = select(Recordatorio.id).where(
             Recordatorio.id_turno == turno_id,
             Recordatorio.canal == canal,
+            Recordatorio.estado.in_(ESTADOS_EN_COLA),
             Recordatorio.activo == True  # noqa: E712
-        )
+        ).limit(1)
         return self.session.scalar(stmt) is not None
 
+    def get_turnos_con_recordatorio(self, turno_ids: Iterable[int], canal: str) -> Set[int]:
+        """
+        Obtiene en una sola consulta cuáles de los turnos ya tienen un
+        recordatorio en cola para el canal (ver existe_para_turno).
+        
+        Args:
+            turno_ids: IDs de los turnos
+            canal: Canal de envío (EMAIL, PUSH, SMS)
+        
+        Returns:
+            Conjunto de IDs de turno con recordatorio en cola
+        """
+        turno_ids = list(turno_ids)
+        if not turno_ids:
+            return set()
+        
+        stmt = select(Recordatorio.id_turno).where(
+            Recordatorio.id_turno.in_(turno_ids),
+            Recordatorio.canal == canal,
+            Recordatorio.estado.in_(ESTADOS_EN_COLA),
+            Recordatorio.activo == True  # noqa: E712
+        )
+        return set(self.session.scalars(stmt).all())
+
     def get_enviados_hoy(self) -> List[Recordatorio]:
         """Obtiene recordatorios enviados hoy."""
         hoy_inicio = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
@@ -0,0 +1,147 @@
+"""Repositorio para la entidad ReservaAgenda (bloques de agenda ocupados)."""
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from src.config.settings import config
+from src.domain.reserva_agenda import ReservaAgenda
+from src.domain.turno import Turno
+from src.repositories.base_repository import BaseRepository
+from src.repositories.estado_turno_repository import EstadoTurnoRepository
+
+
+def alineado_a_bloques(fecha_hora: datetime, duracion_minutos: int) -> bool:
+    """
+    Indica si un turno empieza y dura múltiplos de RESERVA_BLOQUE_MINUTOS.
+    crear_turno y la reserva por lote solo aceptan turnos alineados (ver bloques_agenda).
+    """
+    bloque = config.RESERVA_BLOQUE_MINUTOS
+    return (
+        fecha_hora.second == 0 and fecha_hora.microsecond == 0
+        and fecha_hora.minute % bloque == 0 and duracion_minutos % bloque == 0
+    )
+
+
+def bloques_agenda(fecha_hora: datetime, duracion_minutos: int) -> Iterator[datetime]:
+    """
+    Inicios de los bloques de RESERVA_BLOQUE_MINUTOS contenidos por completo
+    en [fecha_hora, fin) del turno.
+
+    Los turnos nuevos están alineados a los bloques (ver alineado_a_bloques),
+    así que cubren por completo cada bloque que tocan: dos turnos del mismo
+    médico que se solapan comparten al menos un bloque y el índice único
+    rechaza el segundo. Para turnos anteriores no alineados solo se reservan
+    los bloques enteros, para que dos contiguos (ej. 10:00+17 y 10:17+30)
+    no choquen al reconstruir las reservas.
+
+    Args:
+        fecha_hora: Inicio del turno
+        duracion_minutos: Duración del turno
+    """
+    paso = timedelta(minutes=config.RESERVA_BLOQUE_MINUTOS)
+    bloque = fecha_hora.replace(second=0, microsecond=0) - timedelta(
+        minutes=fecha_hora.minute % config.RESERVA_BLOQUE_MINUTOS
+    )
+    if bloque < fecha_hora:
+        bloque += paso
+    fin = fecha_hora + timedelta(minutes=duracion_minutos)
+    while bloque + paso <= fin:
+        yield bloque
+        bloque += paso
+
+
+class ReservaAgendaRepository(BaseRepository[ReservaAgenda]):
+    """
+    Repositorio de reservas de agenda.
+
+    reservar() inserta los bloques de un turno (ver bloques_agenda): si otro
+    turno ya ocupa alguno, la base de datos lo rechaza con IntegrityError (al
+    hacer flush o commit).
+    """
+
+    def __init__(self, session: Session):
+        super().__init__(session, ReservaAgenda)
+
+    def reservar(self, turno: Turno) -> None:
+        """
+        Reserva los bloques de agenda del turno (el turno ya debe tener ID).
+        No hace commit automático.
+
+        Raises:
+            IntegrityError: Si algún bloque ya está reservado por otro turno
+        """
+        self.reservar_lote([turno])
+
+    def reservar_lote(self, turnos: Iterable[Turno]) -> None:
+        """
+        Reserva los bloques de varios turnos con un único INSERT executemany.
+        No hace commit automático.
+
+        Raises:
+            IntegrityError: Si algún bloque ya está reservado
+        """
+        filas = [
+            {"id_medico": turno.id_medico, "inicio": inicio, "id_turno": turno.id}
+            for turno in turnos
+            for inicio in bloques_agenda(turno.fecha_hora, turno.duracion_minutos)
+        ]
+        if filas:
+            self.session.execute(insert(ReservaAgenda), filas)
+
+    def liberar(self, turno_ids: Iterable[int]) -> None:
+        """Libera los bloques reservados por los turnos indicados. No hace commit."""
+        turno_ids = list(turno_ids)
+        if not turno_ids:
+            return
+        self.session.execute(
+            delete(ReservaAgenda)
+            .where(ReservaAgenda.id_turno.in_(turno_ids))
+            .execution_options(synchronize_session=False)
+        )
+
+    def reconstruir(self, desde: Optional[datetime] = None) -> int:
+        """
+        Regenera las reservas de los turnos activos (PEND, CONF, ASIS) que
+        empiezan desde la fecha indicada. Si datos previos tienen turnos
+        superpuestos, conserva el de menor ID. No hace commit automático.
+
+        Args:
+            desde: Fecha/hora mínima de los turnos (todos si es None)
+
+        Returns:
+            Cantidad de bloques reservados
+        """
+        estados_activos = EstadoTurnoRepository(self.session).get_ids_por_codigos(["PEND", "CONF", "ASIS"])
+
+        borrar = delete(ReservaAgenda)
+        turnos = select(
+            Turno.id, Turno.id_medico, Turno.fecha_hora, Turno.duracion_minutos
+        ).where(
+            Turno.activo.is_(True),
+            Turno.id_estado.in_(estados_activos)
+        ).order_by(Turno.id)
+
+        if desde is not None:
+            # Incluye turnos del día anterior que pueden cruzar la medianoche
+            borrar = borrar.where(ReservaAgenda.inicio >= desde - timedelta(days=1))
+            turnos = turnos.where(Turno.fecha_hora >= desde - timedelta(days=1))
+
+        self.session.execute(borrar.execution_options(synchronize_session=False))
+
+        ocupados: Set[Tuple[int, datetime]] = set()
+        filas: List[dict] = []
+        for turno_id, medico_id, fecha_hora, duracion in self.session.execute(turnos):
+            bloques = [(medico_id, inicio) for inicio in bloques_agenda(fecha_hora, duracion)]
+            if any(bloque in ocupados for bloque in bloques):
+                continue
+            ocupados.update(bloques)
+            filas.extend(
+                {"id_medico": medico_id, "inicio": inicio, "id_turno": turno_id}
+                for medico_id, inicio in bloques
+            )
+
+        if filas:
+            self.session.execute(insert(ReservaAgenda), filas)
+        return len(filas)
@@ -1,12 +1,43 @@
 """Repositorio para la entidad Turno."""
 from datetime import date, datetime, timedelta
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from sqlalchemy import and_, or_, select, String
+from sqlalchemy import DateTime, Row, and_, or_, select, String, update
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.sql.functions import FunctionElement
 
+from src.domain.archivo import TurnoArchivado
 from src.domain.turno import Turno
+from src.repositories.archivo_repository import ArchivoRepository
 from src.repositories.base_repository import BaseRepository
+from src.repositories.estadistica_diaria_repository import EstadisticaDiariaRepository
+from src.repositories.estado_turno_repository import EstadoTurnoRepository
+from src.repositories.reserva_agenda_repository import ReservaAgendaRepository
+
+
+class sumar_minutos(FunctionElement):
+    """Expresión SQL portable: fecha_hora + N minutos."""
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(sumar_minutos)
+def _sumar_minutos_default(element, compiler, **kw):
+    fecha_hora, minutos = (compiler.process(arg, **kw) for arg in element.clauses)
+    return f"({fecha_hora} + {minutos} * INTERVAL '1 minute')"
+
+
+@compiles(sumar_minutos, "sqlite")
+def _sumar_minutos_sqlite(element, compiler, **kw):
+    fecha_hora, minutos = (compiler.process(arg, **kw) for arg in element.clauses)
+    return f"datetime({fecha_hora}, '+' || {minutos} || ' minutes')"
+
+
+@compiles(sumar_minutos, "mysql")
+def _sumar_minutos_mysql(element, compiler, **kw):
+    fecha_hora, minutos = (compiler.process(arg, **kw) for arg in element.clauses)
+    return f"DATE_ADD({fecha_hora}, INTERVAL {minutos} MINUTE)"
 
 
 class TurnoRepository(BaseRepository[Turno]):
@@ -15,6 +46,10 @@ class TurnoRepository(BaseRepository[Turno]):
     def __init__(self, session: Session):
         super().__init__(session, Turno)
 
+    def _ids_estados_activos(self) -> List[int]:
+        """IDs de los estados que ocupan agenda (PEND, CONF, ASIS), resueltos por cache."""
+        return EstadoTurnoRepository(self.session).get_ids_por_codigos(["PEND", "CONF", "ASIS"])
+
     def get_by_id_completo(self, turno_id: int) -> Optional[Turno]:
         """Obtiene turno por ID con todas las relaciones cargadas."""
         stmt = select(Turno).options(
@@ -28,6 +63,230 @@ class TurnoRepository(BaseRepository[Turno]):
         )
         return self.session.scalar(stmt)
 
+    def agregar(self, turno: Turno) -> Turno:
+        """
+        Agrega un turno nuevo manteniendo las tablas derivadas: reserva sus
+        bloques de agenda (si su estado ocupa agenda) y lo suma al resumen diario.
+        No hace commit automático.
+        
+        Raises:
+            IntegrityError: Si otro turno ya reservó alguno de sus bloques
+        """
+        self.add(turno)
+        if turno.id_estado in self._ids_estados_activos():
+            ReservaAgendaRepository(self.session).reservar(turno)
+        EstadisticaDiariaRepository(self.session).registrar_alta(turno)
+        return turno
+
+    def agregar_lote(self, filas: List[Dict[str, Any]]) -> List[Turno]:
+        """
+        Inserta varios turnos con un único INSERT executemany y mantiene las
+        tablas derivadas con una sentencia por tabla (ver agregar).
+        No hace commit automático.
+        
+        Args:
+            filas: Valores de columnas de cada turno
+        
+        Returns:
+            Turnos insertados, en el mismo orden que las filas
+        
+        Raises:
+            IntegrityError: Si otro turno ya reservó alguno de los bloques
+        """
+        turnos = self.insertar_lote(filas)
+        activos = set(self._ids_estados_activos())
+        ReservaAgendaRepository(self.session).reservar_lote([t for t in turnos if t.id_estado in activos])
+        EstadisticaDiariaRepository(self.session).registrar_altas(turnos)
+        return turnos
+
+    def cambiar_estado(self, turno: Turno, estado_id: int) -> None:
+        """
+        Cambia el estado de un turno manteniendo el resumen diario y las
+        reservas de agenda (se liberan al pasar a CANC/INAS y se vuelven a
+        tomar si el turno se reactiva). No hace commit automático.
+        
+        Raises:
+            IntegrityError: Si al reactivarse su horario ya fue reservado por otro turno
+        """
+        estado_anterior_id = turno.id_estado
+        if estado_id == estado_anterior_id:
+            return
+        
+        turno.id_estado = estado_id
+        EstadisticaDiariaRepository(self.session).registrar_cambio_estado(turno, estado_anterior_id)
+        
+        activos = self._ids_estados_activos()
+        reservas = ReservaAgendaRepository(self.session)
+        if estado_anterior_id in activos and estado_id not in activos:
+            reservas.liberar([turno.id])
+        elif estado_anterior_id not in activos and estado_id in activos:
+            reservas.reservar(turno)
+        self.session.flush()
+
+    def cambiar_estado_lote(
+        self,
+        turno_ids: List[int],
+        estado_id: int,
+        estados_origen_ids: List[int],
+        solo_futuros: bool = False
+    ) -> List[Row]:
+        """
+        Cambia el estado de varios turnos con un único UPDATE ... WHERE id IN (...).
+        La transición se valida en SQL: solo cambian los turnos activos cuyo
+        estado actual está en estados_origen_ids (y futuros, si se pide).
+        Mantiene el resumen diario y las reservas de agenda como cambiar_estado,
+        con una sentencia por tabla. No hace commit automático.
+        
+        Los candidatos se leen con SELECT ... FOR UPDATE (donde el motor lo
+        soporta) para conocer su estado anterior sin que cambie hasta el UPDATE.
+        
+        Args:
+            turno_ids: IDs de los turnos a modificar
+            estado_id: ID del estado destino
+            estados_origen_ids: IDs de los estados desde los que se permite la transición
+            solo_futuros: Si es True, solo se modifican turnos que aún no empezaron
+        
+        Returns:
+            Filas (id, id_medico, id_especialidad, fecha_hora, duracion_minutos,
+            id_estado anterior) de los turnos modificados
+        
+        Raises:
+            IntegrityError: Si al reactivarse algún horario ya fue reservado por otro turno
+        """
+        turno_ids = list(set(turno_ids))
+        if not turno_ids or not estados_origen_ids:
+            return []
+        
+        condiciones = [
+            Turno.id.in_(turno_ids),
+            Turno.activo.is_(True),
+            Turno.id_estado.in_(estados_origen_ids),
+            Turno.id_estado != estado_id
+        ]
+        if solo_futuros:
+            condiciones.append(Turno.fecha_hora > datetime.now())
+        
+        candidatos = {
+            fila.id: fila
+            for fila in self.session.execute(
+                select(
+                    Turno.id, Turno.id_medico, Turno.id_especialidad,
+                    Turno.fecha_hora, Turno.duracion_minutos, Turno.id_estado
+                ).where(*condiciones).with_for_update()
+            )
+        }
+        if not candidatos:
+            return []
+        
+        stmt = (
+            update(Turno)
+            .where(Turno.id.in_(list(candidatos)), *condiciones[1:])
+            .values(id_estado=estado_id)
+            .execution_options(synchronize_session=False)
+        )
+        if self.session.get_bind().dialect.update_returning:
+            modificados = set(self.session.scalars(stmt.returning(Turno.id)).all())
+            filas = [fila for turno_id, fila in candidatos.items() if turno_id in modificados]
+        else:
+            # Sin RETURNING, el bloqueo de la lectura garantiza que cambian todos los candidatos
+            self.session.execute(stmt)
+            filas = list(candidatos.values())
+        
+        EstadisticaDiariaRepository(self.session).registrar_transiciones(filas, estado_id)
+        
+        activos = self._ids_estados_activos()
+        reservas = ReservaAgendaRepository(self.session)
+        if estado_id in activos:
+            reservas.reservar_lote([fila for fila in filas if fila.id_estado not in activos])
+        else:
+            reservas.liberar([fila.id for fila in filas if fila.id_estado in activos])
+        return filas
+
+    def get_ids_vencidos(self, estado_ids: List[int], antes_de: datetime, limite: int) -> List[int]:
+        """
+        Obtiene IDs de turnos activos en alguno de los estados dados que
+        empezaron antes de una fecha/hora (recorre el índice (id_estado, fecha_hora)).
+
+        Args:
+            estado_ids: IDs de los estados a considerar
+            antes_de: Fecha/hora límite (exclusiva)
+            limite: Cantidad máxima de IDs
+
+        Returns:
+            IDs de los turnos, del más antiguo al más reciente
+        """
+        stmt = select(Turno.id).where(
+            Turno.id_estado.in_(estado_ids),
+            Turno.fecha_hora < antes_de,
+            Turno.activo.is_(True)
+        ).order_by(Turno.fecha_hora).limit(limite)
+        return list(self.session.scalars(stmt).all())
+
+    def eliminar(self, turno: Turno) -> None:
+        """Baja lógica del turno liberando su agenda. No hace commit automático."""
+        ReservaAgendaRepository(self.session).liberar([turno.id])
+        self.delete(turno)
+
+    def get_pagina_turnos(
+        self,
+        condiciones: List,
+        limit: int = 100,
+        cursor: Optional[Tuple[datetime, int]] = None,
+        descendente: bool = False,
+        offset: int = 0
+    ) -> List[Turno]:
+        """
+        Obtiene una página de turnos activos ordenada por (fecha_hora, id).
+        
+        Con cursor se pagina por clave: se continúa estrictamente después del
+        último (fecha_hora, id) entregado, con costo constante para cualquier
+        página. Sin cursor se aplica offset (compatibilidad).
+        
+        Args:
+            condiciones: Filtros adicionales de SQLAlchemy
+            limit: Cantidad máxima de turnos
+            cursor: (fecha_hora, id) del último turno de la página anterior
+            descendente: Si es True, ordena de más reciente a más antiguo
+            offset: Desplazamiento cuando no se usa cursor
+        
+        Returns:
+            Lista de turnos con paciente, médico, especialidad y estado cargados
+        """
+        from src.domain.medico import Medico
+        
+        stmt = select(Turno).options(
+            joinedload(Turno.paciente),
+            joinedload(Turno.medico).joinedload(Medico.especialidades),
+            joinedload(Turno.especialidad),
+            joinedload(Turno.estado)
+        ).where(
+            Turno.activo.is_(True),
+            *condiciones
+        )
+        
+        if cursor is not None:
+            fecha_hora, turno_id = cursor
+            if descendente:
+                stmt = stmt.where(or_(
+                    Turno.fecha_hora < fecha_hora,
+                    and_(Turno.fecha_hora == fecha_hora, Turno.id < turno_id)
+                ))
+            else:
+                stmt = stmt.where(or_(
+                    Turno.fecha_hora > fecha_hora,
+                    and_(Turno.fecha_hora == fecha_hora, Turno.id > turno_id)
+                ))
+        elif offset:
+            stmt = stmt.offset(offset)
+        
+        if descendente:
+            stmt = stmt.order_by(Turno.fecha_hora.desc(), Turno.id.desc())
+        else:
+            stmt = stmt.order_by(Turno.fecha_hora, Turno.id)
+        
+        stmt = stmt.limit(limit)
+        return list(self.session.scalars(stmt).unique().all())
+
     def get_por_medico(
         self,
         medico_id: int,
@@ -37,6 +296,7 @@ class TurnoRepository(BaseRepository[Turno]):
     ) -> List[Turno]:
         """
         Obtiene turnos de un médico en un rango de fechas.
+        Incluye turnos archivados si el rango llega hasta el archivo.
         
         Args:
             medico_id: ID del médico
@@ -45,32 +305,31 @@ class TurnoRepository(BaseRepository[Turno]):
             solo_activos: Si es True, solo estados PEND, CONF, ASIS
         
         Returns:
-            Lista de turnos
+            Lista de turnos (Turno o TurnoArchivado)
         """
-        stmt = select(Turno).options(
-            joinedload(Turno.paciente),
-            joinedload(Turno.especialidad),
-            joinedload(Turno.estado)
-        ).where(
-            Turno.id_medico == medico_id,
-            Turno.activo.is_(True)
-        )
-        
-        if fecha_desde:
-            stmt = stmt.where(Turno.fecha_hora >= datetime.combine(fecha_desde, datetime.min.time()))
-        
-        if fecha_hasta:
-            stmt = stmt.where(Turno.fecha_hora <= datetime.combine(fecha_hasta, datetime.max.time()))
-        
-        if solo_activos:
-            # Estados activos: PEND, CONF, ASIS
-            from src.domain.estado_turno import EstadoTurno
-            stmt = stmt.join(Turno.estado).where(
-                EstadoTurno.codigo.in_(["PEND", "CONF", "ASIS"])
+        def consulta(modelo):
+            stmt = select(modelo).options(
+                joinedload(modelo.paciente),
+                joinedload(modelo.especialidad),
+                joinedload(modelo.estado)
+            ).where(
+                modelo.id_medico == medico_id,
+                modelo.activo.is_(True)
             )
+            
+            if fecha_desde:
+                stmt = stmt.where(modelo.fecha_hora >= datetime.combine(fecha_desde, datetime.min.time()))
+            
+            if fecha_hasta:
+                stmt = stmt.where(modelo.fecha_hora <= datetime.combine(fecha_hasta, datetime.max.time()))
+            
+            if solo_activos:
+                # Estados activos: PEND, CONF, ASIS
+                stmt = stmt.where(modelo.id_estado.in_(self._ids_estados_activos()))
+            
+            return stmt.order_by(modelo.fecha_hora)
         
-        stmt = stmt.order_by(Turno.fecha_hora)
-        return list(self.session.scalars(stmt).unique().all())
+        return ArchivoRepository(self.session).consultar(consulta, Turno, TurnoArchivado, fecha_desde)
 
     def get_por_paciente(
         self,
@@ -80,6 +339,7 @@ class TurnoRepository(BaseRepository[Turno]):
     ) -> List[Turno]:
         """
         Obtiene turnos de un paciente en un rango de fechas.
+        Incluye turnos archivados si el rango llega hasta el archivo.
         
         Args:
             paciente_id: ID del paciente
@@ -87,25 +347,29 @@ class TurnoRepository(BaseRepository[Turno]):
             fecha_hasta: Fecha final (opcional)
         
         Returns:
-            Lista de turnos
+            Lista de turnos (Turno o TurnoArchivado), del más reciente al más antiguo
         """
-        stmt = select(Turno).options(
-            joinedload(Turno.medico),
-            joinedload(Turno.especialidad),
-            joinedload(Turno.estado)
-        ).where(
-            Turno.id_paciente == paciente_id,
-            Turno.activo.is_(True)
-        )
-        
-        if fecha_desde:
-            stmt = stmt.where(Turno.fecha_hora >= datetime.combine(fecha_desde, datetime.min.time()))
-        
-        if fecha_hasta:
-            stmt = stmt.where(Turno.fecha_hora <= datetime.combine(fecha_hasta, datetime.max.time()))
+        def consulta(modelo):
+            stmt = select(modelo).options(
+                joinedload(modelo.medico),
+                joinedload(modelo.especialidad),
+                joinedload(modelo.estado)
+            ).where(
+                modelo.id_paciente == paciente_id,
+                modelo.activo.is_(True)
+            )
+            
+            if fecha_desde:
+                stmt = stmt.where(modelo.fecha_hora >= datetime.combine(fecha_desde, datetime.min.time()))
+            
+            if fecha_hasta:
+                stmt = stmt.where(modelo.fecha_hora <= datetime.combine(fecha_hasta, datetime.max.time()))
+            
+            return stmt.order_by(modelo.fecha_hora.desc())
         
-        stmt = stmt.order_by(Turno.fecha_hora.desc())
-        return list(self.session.scalars(stmt).unique().all())
+        return ArchivoRepository(self.session).consultar(
+            consulta, Turno, TurnoArchivado, fecha_desde, descendente=True
+        )
 
     def get_por_medico_y_fecha(
         self,
@@ -134,30 +398,122 @@ class TurnoRepository(BaseRepository[Turno]):
         
         return list(self.session.scalars(stmt).all())
 
+    def get_intervalos_ocupados(
+        self,
+        medico_ids: List[int],
+        fecha_desde: datetime,
+        fecha_hasta: datetime
+    ) -> List[Tuple[int, datetime, int]]:
+        """
+        Obtiene los intervalos ocupados por turnos activos (PEND, CONF, ASIS).
+        Solo selecciona columnas, sin materializar entidades.
+        
+        Incluye turnos iniciados hasta un día antes de fecha_desde para
+        contemplar los que se extienden más allá de la medianoche.
+        
+        Args:
+            medico_ids: IDs de los médicos
+            fecha_desde: Inicio del rango
+            fecha_hasta: Fin del rango (exclusivo)
+        
+        Returns:
+            Lista de tuplas (id_medico, fecha_hora, duracion_minutos) ordenadas por fecha
+        """
+        return self._intervalos_ocupados(Turno.id_medico, medico_ids, fecha_desde, fecha_hasta)
+
+    def get_intervalos_ocupados_pacientes(
+        self,
+        paciente_ids: List[int],
+        fecha_desde: datetime,
+        fecha_hasta: datetime
+    ) -> List[Tuple[int, datetime, int]]:
+        """
+        Igual que get_intervalos_ocupados, pero para la agenda de los pacientes.
+        
+        Returns:
+            Lista de tuplas (id_paciente, fecha_hora, duracion_minutos) ordenadas por fecha
+        """
+        return self._intervalos_ocupados(Turno.id_paciente, paciente_ids, fecha_desde, fecha_hasta)
+
+    def _intervalos_ocupados(
+        self,
+        columna,
+        ids: List[int],
+        fecha_desde: datetime,
+        fecha_hasta: datetime
+    ) -> List[Tuple[int, datetime, int]]:
+        """Consulta por columnas común a get_intervalos_ocupados y su variante por paciente."""
+        stmt = select(
+            columna,
+            Turno.fecha_hora,
+            Turno.duracion_minutos
+        ).where(
+            columna.in_(ids),
+            Turno.activo.is_(True),
+            Turno.id_estado.in_(self._ids_estados_activos()),
+            Turno.fecha_hora >= fecha_desde - timedelta(days=1),
+            Turno.fecha_hora < fecha_hasta
+        ).order_by(Turno.fecha_hora)
+        
+        return [tuple(fila) for fila in self.session.execute(stmt).all()]
+
     def get_por_especialidad(
         self,
         especialidad_id: int,
         fecha_desde: Optional[date] = None,
         fecha_hasta: Optional[date] = None
     ) -> List[Turno]:
-        """Obtiene turnos por especialidad en un rango de fechas."""
-        stmt = select(Turno).options(
-            joinedload(Turno.paciente),
-            joinedload(Turno.medico),
-            joinedload(Turno.estado)
-        ).where(
-            Turno.id_especialidad == especialidad_id,
-            Turno.activo.is_(True)
-        )
+        """Obtiene turnos por especialidad en un rango de fechas (incluye archivados si corresponde)."""
+        def consulta(modelo):
+            stmt = select(modelo).options(
+                joinedload(modelo.paciente),
+                joinedload(modelo.medico),
+                joinedload(modelo.estado)
+            ).where(
+                modelo.id_especialidad == especialidad_id,
+                modelo.activo.is_(True)
+            )
+            
+            if fecha_desde:
+                stmt = stmt.where(modelo.fecha_hora >= datetime.combine(fecha_desde, datetime.min.time()))
+            
+            if fecha_hasta:
+                stmt = stmt.where(modelo.fecha_hora <= datetime.combine(fecha_hasta, datetime.max.time()))
+            
+            return stmt.order_by(modelo.fecha_hora)
         
-        if fecha_desde:
-            stmt = stmt.where(Turno.fecha_hora >= datetime.combine(fecha_desde, datetime.min.time()))
+        return ArchivoRepository(self.session).consultar(consulta, Turno, TurnoArchivado, fecha_desde)
+
+    def _existe_solapamiento(
+        self,
+        columna,
+        valor: int,
+        fecha_hora_inicio: datetime,
+        fecha_hora_fin: datetime,
+        exclude_turno_id: Optional[int] = None
+    ) -> bool:
+        """
+        Verifica con una única consulta EXISTS si hay turnos activos que se
+        solapen con [fecha_hora_inicio, fecha_hora_fin).
         
-        if fecha_hasta:
-            stmt = stmt.where(Turno.fecha_hora <= datetime.combine(fecha_hasta, datetime.max.time()))
+        El fin de cada turno se calcula en SQL (fecha_hora + duracion_minutos),
+        por lo que también se detectan turnos iniciados el día anterior que
+        cruzan la medianoche. La cota inferior sobre fecha_hora mantiene la
+        consulta dentro del índice compuesto (columna, activo, fecha_hora).
+        """
+        stmt = select(Turno.id).where(
+            columna == valor,
+            Turno.activo.is_(True),
+            Turno.id_estado.in_(self._ids_estados_activos()),
+            Turno.fecha_hora < fecha_hora_fin,
+            Turno.fecha_hora >= fecha_hora_inicio - timedelta(days=1),
+            sumar_minutos(Turno.fecha_hora, Turno.duracion_minutos) > fecha_hora_inicio
+        )
         
-        stmt = stmt.order_by(Turno.fecha_hora)
-        return list(self.session.scalars(stmt).unique().all())
+        if exclude_turno_id is not None:
+            stmt = stmt.where(Turno.id != exclude_turno_id)
+        
+        return bool(self.session.scalar(select(stmt.exists())))
 
     def verificar_solapamiento_medico(
         self,
@@ -178,30 +534,9 @@ class TurnoRepository(BaseRepository[Turno]):
         Returns:
             True si hay solapamiento, False en caso contrario
         """
-        from src.domain.estado_turno import EstadoTurno
-        
-        # Obtener todos los turnos activos del médico en el día
-        fecha_dia = fecha_hora_inicio.date()
-        stmt = select(Turno).join(Turno.estado).where(
-            Turno.id_medico == medico_id,
-            Turno.activo.is_(True),
-            EstadoTurno.codigo.in_(["PEND", "CONF", "ASIS"]),
-            Turno.fecha_hora >= datetime.combine(fecha_dia, datetime.min.time()),
-            Turno.fecha_hora < datetime.combine(fecha_dia, datetime.max.time())
+        return self._existe_solapamiento(
+            Turno.id_medico, medico_id, fecha_hora_inicio, fecha_hora_fin, exclude_turno_id
         )
-        
-        if exclude_turno_id is not None:
-            stmt = stmt.where(Turno.id != exclude_turno_id)
-        
-        turnos = list(self.session.scalars(stmt).all())
-        
-        # Verificar solapamiento en Python
-        for turno in turnos:
-            turno_fin = turno.fecha_hora + timedelta(minutes=turno.duracion_minutos)
-            if turno.fecha_hora < fecha_hora_fin and turno_fin > fecha_hora_inicio:
-                return True
-        
-        return False
 
     def verificar_solapamiento_paciente(
         self,
@@ -222,30 +557,9 @@ class TurnoRepository(BaseRepository[Turno]):
         Returns:
             True si hay solapamiento, False en caso contrario
         """
-        from src.domain.estado_turno import EstadoTurno
-        
-        # Obtener todos los turnos activos del paciente en el día
-        fecha_dia = fecha_hora_inicio.date()
-        stmt = select(Turno).join(Turno.estado).where(
-            Turno.id_paciente == paciente_id,
-            Turno.activo.is_(True),
-            EstadoTurno.codigo.in_(["PEND", "CONF", "ASIS"]),
-            Turno.fecha_hora >= datetime.combine(fecha_dia, datetime.min.time()),
-            Turno.fecha_hora < datetime.combine(fecha_dia, datetime.max.time())
+        return self._existe_solapamiento(
+            Turno.id_paciente, paciente_id, fecha_hora_inicio, fecha_hora_fin, exclude_turno_id
         )
-        
-        if exclude_turno_id is not None:
-            stmt = stmt.where(Turno.id != exclude_turno_id)
-        
-        turnos = list(self.session.scalars(stmt).all())
-        
-        # Verificar solapamiento en Python
-        for turno in turnos:
-            turno_fin = turno.fecha_hora + timedelta(minutes=turno.duracion_minutos)
-            if turno.fecha_hora < fecha_hora_fin and turno_fin > fecha_hora_inicio:
-                return True
-        
-        return False
 
     def contar_por_estado(
         self,
@@ -2,10 +2,11 @@
 Patrón Unit of Work para gestión transaccional.
 Coordina múltiples repositorios en una sola transacción.
 """
-from typing import Optional
+from typing import Generic, Optional, Type, TypeVar
 
 from sqlalchemy.orm import Session
 
+from src.repositories.archivo_repository import ArchivoRepository
 from src.repositories.consulta_repository import ConsultaRepository
 from src.repositories.database import DatabaseManager
 from src.repositories.disponibilidad_repository import (
@@ -13,58 +14,100 @@ from src.repositories.disponibilidad_repository import (
     DisponibilidadMedicoRepository,
 )
 from src.repositories.especialidad_repository import EspecialidadRepository
+from src.repositories.estadistica_diaria_repository import EstadisticaDiariaRepository
 from src.repositories.estado_turno_repository import EstadoTurnoRepository
 from src.repositories.medico_repository import MedicoRepository
 from src.repositories.paciente_repository import PacienteRepository
 from src.repositories.receta_repository import ItemRecetaRepository, RecetaRepository
 from src.repositories.recordatorio_repository import RecordatorioRepository
+from src.repositories.reserva_agenda_repository import ReservaAgendaRepository
 from src.repositories.turno_repository import TurnoRepository
 
 
+R = TypeVar("R")
+
+
+class _RepositorioLazy(Generic[R]):
+    """
+    Descriptor que construye el repositorio en el primer acceso
+    y lo guarda en la instancia del Unit of Work.
+    """
+
+    def __init__(self, clase: Type[R]):
+        self.clase = clase
+        self.nombre: Optional[str] = None
+
+    def __set_name__(self, owner, nombre: str) -> None:
+        self.nombre = nombre
+
+    def __get__(self, uow: Optional["UnitOfWork"], owner=None) -> R:
+        if uow is None:
+            return self
+        repositorio = self.clase(uow.session)
+        uow.__dict__[self.nombre] = repositorio
+        return repositorio
+
+
 class UnitOfWork:
     """
     Unit of Work: gestiona transacciones y coordina repositorios.
     Implementa context manager para garantizar commit/rollback.
+    
+    Los repositorios se crean en el primer acceso y la sesión se abre
+    recién cuando algún repositorio la necesita.
     """
 
+    pacientes = _RepositorioLazy(PacienteRepository)
+    medicos = _RepositorioLazy(MedicoRepository)
+    especialidades = _RepositorioLazy(EspecialidadRepository)
+    estados_turno = _RepositorioLazy(EstadoTurnoRepository)
+    turnos = _RepositorioLazy(TurnoRepository)
+    disponibilidades = _RepositorioLazy(DisponibilidadMedicoRepository)
+    bloqueos = _RepositorioLazy(BloqueoMedicoRepository)
+    consultas = _RepositorioLazy(ConsultaRepository)
+    recetas = _RepositorioLazy(RecetaRepository)
+    items_receta = _RepositorioLazy(ItemRecetaRepository)
+    recordatorios = _RepositorioLazy(RecordatorioRepository)
+    estadisticas = _RepositorioLazy(EstadisticaDiariaRepository)
+    reservas = _RepositorioLazy(ReservaAgendaRepository)
+    archivo = _RepositorioLazy(ArchivoRepository)
+
     def __init__(self, db_manager: Optional[DatabaseManager] = None):
         """
         Args:
             db_manager: Gestor de base de datos (usa el singleton si no se provee)
         """
         self.db_manager = db_manager or DatabaseManager()
-        self.session: Optional[Session] = None
-        
-        # Repositorios (se inicializan al entrar al context)
-        self.pacientes: Optional[PacienteRepository] = None
-        self.medicos: Optional[MedicoRepository] = None
-        self.especialidades: Optional[EspecialidadRepository] = None
-        self.estados_turno: Optional[EstadoTurnoRepository] = None
-        self.turnos: Optional[TurnoRepository] = None
-        self.disponibilidades: Optional[DisponibilidadMedicoRepository] = None
-        self.bloqueos: Optional[BloqueoMedicoRepository] = None
-        self.consultas: Optional[ConsultaRepository] = None
-        self.recetas: Optional[RecetaRepository] = None
-        self.items_receta: Optional[ItemRecetaRepository] = None
-        self.recordatorios: Optional[RecordatorioRepository] = None
+        self._session: Optional[Session] = None
+        self._activo = False
+
+    @classmethod
+    def desde_sesion(cls, session: Session) -> "UnitOfWork":
+        """
+        Crea una unidad de trabajo sobre una sesión ya abierta.
+        La sesión la gestiona el llamador (por ejemplo AsyncUnitOfWork.run_sync).
+
+        Args:
+            session: Sesión sincrónica existente
+        """
+        uow = cls.__new__(cls)
+        uow.db_manager = None
+        uow._session = session
+        uow._activo = True
+        return uow
+
+    @property
+    def session(self) -> Session:
+        """Sesión de la unidad de trabajo; se abre en el primer uso."""
+        if self._session is None:
+            if not self._activo:
+                raise RuntimeError("No active session. Use within context manager.")
+            self._session = self.db_manager.get_session()
+        return self._session
 
     def __enter__(self) -> "UnitOfWork":
-        """Inicia la unidad de trabajo creando sesión y repositorios."""
-        self.session = self.db_manager.get_session()
-        
-        # Inicializar todos los repositorios
-        self.pacientes = PacienteRepository(self.session)
-        self.medicos = MedicoRepository(self.session)
-        self.especialidades = EspecialidadRepository(self.session)
-        self.estados_turno = EstadoTurnoRepository(self.session)
-        self.turnos = TurnoRepository(self.session)
-        self.disponibilidades = DisponibilidadMedicoRepository(self.session)
-        self.bloqueos = BloqueoMedicoRepository(self.session)
-        self.consultas = ConsultaRepository(self.session)
-        self.recetas = RecetaRepository(self.session)
-        self.items_receta = ItemRecetaRepository(self.session)
-        self.recordatorios = RecordatorioRepository(self.session)
-        
+        """Inicia la unidad de trabajo (la sesión y los repositorios se crean bajo demanda)."""
+        self._activo = True
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -75,26 +118,35 @@ class UnitOfWork:
         if exc_type is not None:
             self.rollback()
         
-        if self.session is not None:
-            self.session.close()
+        if self._session is not None:
+            self._session.close()
+        
+        self._session = None
+        self._activo = False
+        for nombre, atributo in vars(type(self)).items():
+            if isinstance(atributo, _RepositorioLazy):
+                self.__dict__.pop(nombre, None)
 
     def commit(self) -> None:
         """Confirma todos los cambios en la BD."""
-        if self.session is None:
+        if not self._activo:
             raise RuntimeError("No active session. Use within context manager.")
         
+        if self._session is None:
+            return  # Nada que confirmar: no se abrió sesión
+        
         try:
-            self.session.commit()
+            self._session.commit()
         except Exception as e:
             self.rollback()
             raise e
 
     def rollback(self) -> None:
         """Revierte todos los cambios no confirmados."""
-        if self.session is not None:
-            self.session.rollback()
+        if self._session is not None:
+            self._session.rollback()
 
     def flush(self) -> None:
         """Envía los cambios a la BD sin hacer commit."""
-        if self.session is not None:
-            self.session.flush()
+        if self._session is not None:
+            self._session.flush()
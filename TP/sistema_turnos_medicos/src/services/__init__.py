@@ -2,8 +2,18 @@
 Módulo de servicios.
 Exports para facilitar el acceso a los servicios.
 """
+from src.services.archivo_service import ArchivoService, ResultadoArchivo
+from src.services.cache_reportes import CacheReportes, cache_reportes
+from src.services.motor_disponibilidad import MotorDisponibilidad
+from src.services.recordatorio_service import RecordatorioService
 from src.services.turno_service import TurnoService
 
 __all__ = [
+    "ArchivoService",
+    "ResultadoArchivo",
+    "CacheReportes",
+    "cache_reportes",
+    "MotorDisponibilidad",
+    "RecordatorioService",
     "TurnoService",
 ]
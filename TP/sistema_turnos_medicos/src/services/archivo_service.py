@@ -0,0 +1,69 @@
+"""
+Servicio de archivo histórico.
+Mueve los turnos cerrados más viejos que el horizonte configurado a las
+tablas *_archivo, para que las tablas de trabajo y sus índices contengan
+solo turnos recientes y futuros.
+"""
+import time
+from datetime import datetime
+from typing import NamedTuple
+
+from src.repositories.unit_of_work import UnitOfWork
+
+
+class ResultadoArchivo(NamedTuple):
+    """Métricas de una corrida de archivo (ver ArchivoService.archivar)."""
+    turnos: int
+    consultas: int
+    recordatorios: int
+    lotes: int
+    segundos: float
+
+
+class ArchivoService:
+    """Servicio para mover turnos históricos al archivo."""
+
+    def __init__(self, uow: UnitOfWork):
+        """
+        Inicializa el servicio con una unidad de trabajo.
+
+        Args:
+            uow: Unidad de trabajo para acceso a repositorios
+        """
+        self.uow = uow
+
+    def archivar(self, antes_de: datetime, lote: int) -> ResultadoArchivo:
+        """
+        Archiva los turnos cerrados anteriores a la fecha/hora indicada.
+
+        Cada lote (ver ArchivoRepository.archivar_lote) se confirma en su
+        propia transacción, de modo que un corte deja movidos los lotes ya
+        confirmados y la corrida siguiente continúa desde ahí. El resumen
+        diario no cambia: cuenta turnos vigentes y archivados.
+
+        Args:
+            antes_de: Solo turnos con fecha_hora anterior a este momento
+            lote: Cantidad máxima de turnos por lote
+
+        Returns:
+            Métricas de la corrida (filas movidas, lotes y duración)
+        """
+        inicio = time.perf_counter()
+        turnos = consultas = recordatorios = lotes = 0
+        if lote <= 0:
+            return ResultadoArchivo(0, 0, 0, 0, 0.0)
+
+        while True:
+            movidos = self.uow.archivo.archivar_lote(antes_de, lote)
+            if not movidos.turnos:
+                break
+            self.uow.commit()
+
+            turnos += movidos.turnos
+            consultas += movidos.consultas
+            recordatorios += movidos.recordatorios
+            lotes += 1
+            if movidos.turnos < lote:
+                break
+
+        return ResultadoArchivo(turnos, consultas, recordatorios, lotes, time.perf_counter() - inicio)
@@ -0,0 +1,130 @@
+"""
+Cache en proceso de resultados de reportes.
+Evita recalcular la misma respuesta cada vez que se recarga la página de reportes.
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Callable, NamedTuple, Optional
+
+from src.config.settings import config
+
+
+class ClaveReporte(NamedTuple):
+    """Clave de una entrada: reporte y sus parámetros."""
+    reporte: str
+    fecha_inicio: date
+    fecha_fin: date
+    medico_id: Optional[int]
+    especialidad_id: Optional[int]
+
+    def cubre(self, fecha: date, medico_id: int, especialidad_id: int) -> bool:
+        """Indica si un turno de esa fecha, médico y especialidad entra en el reporte."""
+        return (
+            self.fecha_inicio <= fecha <= self.fecha_fin
+            and (not self.medico_id or self.medico_id == medico_id)
+            and (not self.especialidad_id or self.especialidad_id == especialidad_id)
+        )
+
+
+class CacheReportes:
+    """
+    Cache LRU con TTL de resultados de reportes (patrón Singleton).
+
+    - Las entradas vencen a los REPORTES_CACHE_TTL segundos, también las de
+      rangos pasados: el barrido de inasistencias los modifica y puede correr
+      en otro proceso (--solo-scheduler, --barrer-inasistencias).
+    - Se conservan a lo sumo REPORTES_CACHE_MAXIMO entradas; al superarlo se
+      descarta la menos usada recientemente.
+    - invalidar_turno() descarta solo las entradas cuyo rango y filtros cubren
+      el turno modificado.
+
+    Es local a cada proceso: una escritura hecha en otro proceso no lo
+    invalida y solo se ve al vencer el TTL.
+    """
+
+    _instance: Optional["CacheReportes"] = None
+
+    def __new__(cls) -> "CacheReportes":
+        """Implementación del patrón Singleton."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._lock = threading.Lock()
+            cls._instance._entradas = OrderedDict()
+            cls._instance._generacion = 0
+        return cls._instance
+
+    @staticmethod
+    def _vencimiento() -> float:
+        """Momento (time.monotonic) en que vence una entrada guardada ahora."""
+        return time.monotonic() + config.REPORTES_CACHE_TTL
+
+    def obtener(self, clave: ClaveReporte, calcular: Callable[[], Any]) -> Any:
+        """
+        Retorna el resultado cacheado de la clave o lo calcula y lo guarda.
+        El resultado se comparte entre llamadas: no debe modificarse.
+
+        Args:
+            clave: Reporte y parámetros
+            calcular: Función que calcula el resultado si no está en cache
+        """
+        if config.REPORTES_CACHE_MAXIMO <= 0:
+            return calcular()
+
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is not None:
+                valor, vence = entrada
+                if vence > time.monotonic():
+                    self._entradas.move_to_end(clave)
+                    return valor
+                del self._entradas[clave]
+            generacion = self._generacion
+
+        valor = calcular()
+
+        with self._lock:
+            # Si hubo una invalidación mientras se calculaba, el valor puede estar desactualizado
+            if generacion == self._generacion:
+                self._entradas[clave] = (valor, self._vencimiento())
+                self._entradas.move_to_end(clave)
+                while len(self._entradas) > config.REPORTES_CACHE_MAXIMO:
+                    self._entradas.popitem(last=False)
+        return valor
+
+    def invalidar_turno(self, fecha: date, medico_id: int, especialidad_id: int) -> int:
+        """
+        Descarta las entradas afectadas por un cambio en un turno.
+        Llamar después del commit.
+
+        Args:
+            fecha: Día del turno
+            medico_id: ID del médico del turno
+            especialidad_id: ID de la especialidad del turno
+
+        Returns:
+            Cantidad de entradas descartadas
+        """
+        with self._lock:
+            self._generacion += 1
+            afectadas = [
+                clave for clave in self._entradas
+                if clave.cubre(fecha, medico_id, especialidad_id)
+            ]
+            for clave in afectadas:
+                del self._entradas[clave]
+            return len(afectadas)
+
+    def limpiar(self) -> None:
+        """Descarta todas las entradas."""
+        with self._lock:
+            self._generacion += 1
+            self._entradas.clear()
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+
+# Instancia global del cache
+cache_reportes = CacheReportes()
@@ -2,10 +2,36 @@
 Servicio para envío de correos electrónicos.
 """
 import smtplib
+import time
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import os
-from typing import List
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from src.domain.base import formatear_nombre_completo
+from src.services.plantillas_correo import RECORDATORIO_ASUNTO, RECORDATORIO_HTML, RECORDATORIO_TEXTO
+
+
+class MensajeCorreo(NamedTuple):
+    """
+    Correo a enviar. cuerpo_html es una variante opcional (multipart/alternative);
+    clave permite al llamador asociar el resultado (ej. el ID de un Recordatorio).
+    """
+    destinatario: str
+    asunto: str
+    cuerpo: str
+    cuerpo_html: Optional[str] = None
+    clave: Any = None
+
+
+class ResultadoEnvio(NamedTuple):
+    """Resultado del envío de un mensaje."""
+    mensaje: MensajeCorreo
+    enviado: bool
+    intentos: int
+    error: Optional[str] = None
+
 
 class EmailService:
     def __init__(self):
@@ -14,46 +40,192 @@ class EmailService:
         self.smtp_user = os.getenv("SMTP_USER", "")
         self.smtp_password = os.getenv("SMTP_PASSWORD", "")
         self.from_email = os.getenv("FROM_EMAIL", self.smtp_user)
+        self.usar_starttls = os.getenv("SMTP_STARTTLS", "true").lower() == "true"
+        self.timeout = int(os.getenv("SMTP_TIMEOUT", "30"))  # segundos
+        # Envío por lotes: conexiones simultáneas, reintentos y espera base entre reintentos
+        self.concurrencia = max(int(os.getenv("SMTP_CONCURRENCIA", "4")), 1)
+        self.reintentos = max(int(os.getenv("SMTP_REINTENTOS", "3")), 1)
+        self.backoff = float(os.getenv("SMTP_BACKOFF", "1.0"))  # segundos
+        # Sin credenciales los envíos se simulan, salvo que se indique un servidor sin login
+        # (ej. un relay local o aiosmtpd para pruebas)
+        self.sin_autenticacion = os.getenv("SMTP_SIN_AUTENTICACION", "false").lower() == "true"
+        self.simular = not (self.smtp_user and self.smtp_password) and not self.sin_autenticacion
 
-    def enviar_correo(self, destinatario: str, asunto: str, cuerpo: str):
-        """Envía un correo electrónico simple."""
-        if not self.smtp_user or not self.smtp_password:
-            print(f"Simulando envío de correo a {destinatario}: {asunto}")
-            return
+    def enviar_correo(self, destinatario: str, asunto: str, cuerpo: str) -> bool:
+        """Envía un correo electrónico simple. Retorna True si se envió (o simuló)."""
+        resultado = self.enviar_lote([MensajeCorreo(destinatario, asunto, cuerpo)])[0]
+        if resultado.enviado and not self.simular:
+            print(f"Correo enviado exitosamente a {destinatario}")
+        elif not resultado.enviado:
+            print(f"Error al enviar correo: {resultado.error}")
+        return resultado.enviado
+
+    def enviar_lote(self, mensajes: List[MensajeCorreo]) -> List[ResultadoEnvio]:
+        """
+        Envía un lote de correos y reporta el resultado de cada uno.
+
+        Los mensajes se reparten entre hasta SMTP_CONCURRENCIA hilos; cada hilo
+        abre una sola sesión SMTP (STARTTLS + login) y la reutiliza para toda su
+        parte del lote. Los errores transitorios se reintentan con espera
+        exponencial. Es bloqueante: desde código async usar asyncio.to_thread.
+
+        Args:
+            mensajes: Correos a enviar
+
+        Returns:
+            Resultados en el mismo orden que los mensajes
+        """
+        if not mensajes:
+            return []
+
+        if self.simular:
+            for mensaje in mensajes:
+                print(f"Simulando envío de correo a {mensaje.destinatario}: {mensaje.asunto}")
+            return [ResultadoEnvio(mensaje, True, 1) for mensaje in mensajes]
+
+        hilos = min(self.concurrencia, len(mensajes))
+        if hilos == 1:
+            return self._enviar_secuencia(mensajes)
+
+        tramos = [mensajes[i::hilos] for i in range(hilos)]
+        with ThreadPoolExecutor(max_workers=hilos, thread_name_prefix="smtp") as pool:
+            resultados_tramos = list(pool.map(self._enviar_secuencia, tramos))
 
+        # Reordenar: el mensaje j del tramo k es mensajes[k + j * hilos]
+        resultados: List[Optional[ResultadoEnvio]] = [None] * len(mensajes)
+        for k, resultados_tramo in enumerate(resultados_tramos):
+            for j, resultado in enumerate(resultados_tramo):
+                resultados[k + j * hilos] = resultado
+        return resultados
+
+    def _conectar(self) -> smtplib.SMTP:
+        """Abre una sesión SMTP autenticada."""
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.timeout)
+        try:
+            if self.usar_starttls:
+                server.starttls()
+            if self.smtp_user and self.smtp_password:
+                server.login(self.smtp_user, self.smtp_password)
+        except Exception:
+            self._cerrar(server)
+            raise
+        return server
+
+    @staticmethod
+    def _cerrar(server: Optional[smtplib.SMTP]) -> None:
+        """Cierra la sesión SMTP sin propagar errores."""
+        if server is None:
+            return
         try:
-            msg = MIMEMultipart()
-            msg['From'] = self.from_email
-            msg['To'] = destinatario
-            msg['Subject'] = asunto
-
-            msg.attach(MIMEText(cuerpo, 'plain'))
-
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            server.login(self.smtp_user, self.smtp_password)
-            text = msg.as_string()
-            server.sendmail(self.from_email, destinatario, text)
             server.quit()
-            print(f"Correo enviado exitosamente a {destinatario}")
-        except Exception as e:
-            print(f"Error al enviar correo: {e}")
-
-    def enviar_recordatorio_turno(self, turno, paciente):
-        """Envía un recordatorio de turno."""
-        asunto = "Recordatorio de Turno Médico"
-        cuerpo = f"""
-        Hola {paciente.nombre},
-        
-        Te recordamos que tienes un turno médico programado para mañana.
-        
-        Fecha y Hora: {turno.fecha_hora.strftime('%d/%m/%Y %H:%M')}
-        Médico: Dr/a. {turno.medico.nombre_completo}
-        Especialidad: {turno.especialidad.nombre}
-        
-        Por favor, si no puedes asistir, recuerda cancelar el turno con anticipación.
-        
-        Saludos,
-        Sistema de Turnos Médicos
+        except Exception:
+            server.close()
+
+    @staticmethod
+    def _es_transitorio(error: Exception) -> bool:
+        """Indica si conviene reintentar: errores de red y respuestas 4xx del servidor."""
+        if isinstance(error, smtplib.SMTPRecipientsRefused):
+            return all(400 <= codigo < 500 for codigo, _ in error.recipients.values())
+        if isinstance(error, smtplib.SMTPResponseException):
+            return 400 <= error.smtp_code < 500
+        return isinstance(error, (smtplib.SMTPException, OSError))
+
+    def _construir(self, mensaje: MensajeCorreo) -> str:
+        """Arma el MIME del mensaje (texto plano y, si hay, HTML como alternativa)."""
+        msg = MIMEMultipart('alternative' if mensaje.cuerpo_html else 'mixed')
+        msg['From'] = self.from_email
+        msg['To'] = mensaje.destinatario
+        msg['Subject'] = mensaje.asunto
+        msg.attach(MIMEText(mensaje.cuerpo, 'plain'))
+        if mensaje.cuerpo_html:
+            msg.attach(MIMEText(mensaje.cuerpo_html, 'html'))
+        return msg.as_string()
+
+    def _enviar_secuencia(self, mensajes: List[MensajeCorreo]) -> List[ResultadoEnvio]:
+        """Envía mensajes en orden reutilizando una sesión SMTP (se reabre si se cae)."""
+        resultados: List[ResultadoEnvio] = []
+        server: Optional[smtplib.SMTP] = None
+        try:
+            for mensaje in mensajes:
+                intentos = 0
+                while True:
+                    intentos += 1
+                    try:
+                        if server is None:
+                            server = self._conectar()
+                        server.sendmail(self.from_email, [mensaje.destinatario], self._construir(mensaje))
+                        resultados.append(ResultadoEnvio(mensaje, True, intentos))
+                        break
+                    except smtplib.SMTPAuthenticationError as e:
+                        # Credenciales inválidas: fallan todos los mensajes restantes del tramo
+                        pendientes = mensajes[len(resultados):]
+                        resultados.extend(
+                            ResultadoEnvio(m, False, intentos if m is mensaje else 0, str(e))
+                            for m in pendientes
+                        )
+                        return resultados
+                    except Exception as e:
+                        if not self._es_transitorio(e) or intentos >= self.reintentos:
+                            resultados.append(ResultadoEnvio(mensaje, False, intentos, str(e)))
+                            break
+                        # La sesión puede haber quedado inutilizable: se reabre en el reintento
+                        self._cerrar(server)
+                        server = None
+                        time.sleep(self.backoff * 2 ** (intentos - 1))
+        finally:
+            self._cerrar(server)
+        return resultados
+
+    @staticmethod
+    def _datos_recordatorio(paciente_nombre: str, fecha_hora, medico: str, especialidad: str) -> Dict[str, str]:
+        """Valores de la plantilla de recordatorio (medico ya formateado, ver formatear_nombre_completo)."""
+        return {
+            "paciente_nombre": paciente_nombre,
+            "fecha_hora": fecha_hora.strftime('%d/%m/%Y %H:%M'),
+            "medico": medico,
+            "especialidad": especialidad,
+        }
+
+    def mensajes_recordatorio(self, filas: Iterable) -> List[MensajeCorreo]:
+        """
+        Renderiza en bloque los recordatorios a partir de filas planas
+        (ver RecordatorioRepository.get_datos_envio), sin acceder a entidades.
+
+        Args:
+            filas: Filas con id, email, paciente_nombre, fecha_hora, medico_nombre,
+                medico_apellido y especialidad
+
+        Returns:
+            Mensajes con clave = ID del recordatorio
         """
-        self.enviar_correo(paciente.email, asunto, cuerpo)
+        filas = list(filas)
+        datos = [
+            self._datos_recordatorio(
+                fila.paciente_nombre, fila.fecha_hora,
+                formatear_nombre_completo(fila.medico_apellido, fila.medico_nombre), fila.especialidad
+            )
+            for fila in filas
+        ]
+        textos = RECORDATORIO_TEXTO.renderizar_lote(datos)
+        htmls = RECORDATORIO_HTML.renderizar_lote(datos)
+        return [
+            MensajeCorreo(fila.email, RECORDATORIO_ASUNTO, texto, html, fila.id)
+            for fila, texto, html in zip(filas, textos, htmls)
+        ]
+
+    def mensaje_recordatorio(self, turno, paciente, clave: Any = None) -> MensajeCorreo:
+        """Arma el correo de recordatorio de un turno a partir de las entidades."""
+        datos = self._datos_recordatorio(
+            paciente.nombre, turno.fecha_hora, turno.medico.nombre_completo, turno.especialidad.nombre
+        )
+        return MensajeCorreo(
+            paciente.email,
+            RECORDATORIO_ASUNTO,
+            RECORDATORIO_TEXTO.renderizar(datos),
+            RECORDATORIO_HTML.renderizar(datos),
+            clave
+        )
+
+    def enviar_recordatorio_turno(self, turno, paciente) -> bool:
+        """Envía un recordatorio de turno. Retorna True si se envió."""
+        return self.enviar_lote([self.mensaje_recordatorio(turno, paciente)])[0].enviado
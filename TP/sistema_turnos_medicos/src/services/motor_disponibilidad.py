@@ -0,0 +1,146 @@
+"""
+Motor de disponibilidad de agendas médicas.
+Calcula horarios libres a partir de disponibilidades, bloqueos y turnos activos
+usando intervalos ordenados y un único barrido por jornada.
+"""
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+from src.domain.disponibilidad import BloqueoMedico, DisponibilidadMedico
+
+# Intervalo semiabierto [inicio, fin)
+Intervalo = Tuple[datetime, datetime]
+
+
+def fusionar_intervalos(intervalos: Iterable[Intervalo]) -> List[Intervalo]:
+    """
+    Ordena y fusiona intervalos solapados o contiguos.
+
+    Args:
+        intervalos: Intervalos (inicio, fin) en cualquier orden
+
+    Returns:
+        Lista de intervalos disjuntos ordenados por inicio (y por fin)
+    """
+    fusionados: List[Intervalo] = []
+    for inicio, fin in sorted(intervalos):
+        if fusionados and inicio <= fusionados[-1][1]:
+            if fin > fusionados[-1][1]:
+                fusionados[-1] = (fusionados[-1][0], fin)
+        else:
+            fusionados.append((inicio, fin))
+    return fusionados
+
+
+class MotorDisponibilidad:
+    """
+    Estructura de intervalos para responder consultas de horarios libres.
+
+    Indexa las disponibilidades por (médico, día de la semana) y mantiene,
+    por médico, la lista ordenada y fusionada de intervalos ocupados
+    (turnos activos y bloqueos). Cada consulta ubica el primer intervalo
+    relevante con búsqueda binaria y recorre slots e intervalos en paralelo,
+    por lo que el costo es O(log n + slots) en lugar de O(slots × turnos).
+    """
+
+    def __init__(
+        self,
+        disponibilidades: Iterable[DisponibilidadMedico],
+        bloqueos: Iterable[BloqueoMedico] = (),
+        ocupados: Iterable[Tuple[int, datetime, int]] = ()
+    ):
+        """
+        Args:
+            disponibilidades: Disponibilidades semanales activas
+            bloqueos: Bloqueos activos de agenda
+            ocupados: Tuplas (id_medico, fecha_hora, duracion_minutos) de turnos activos
+        """
+        self._disponibilidades: Dict[Tuple[int, int], List[DisponibilidadMedico]] = defaultdict(list)
+        for disp in disponibilidades:
+            self._disponibilidades[(disp.id_medico, disp.dia_semana)].append(disp)
+        for lista in self._disponibilidades.values():
+            lista.sort(key=lambda d: d.hora_desde)
+
+        por_medico: Dict[int, List[Intervalo]] = defaultdict(list)
+        for bloqueo in bloqueos:
+            por_medico[bloqueo.id_medico].append((bloqueo.inicio, bloqueo.fin))
+        for medico_id, fecha_hora, duracion in ocupados:
+            por_medico[medico_id].append((fecha_hora, fecha_hora + timedelta(minutes=duracion)))
+
+        self._ocupados: Dict[int, List[Intervalo]] = {
+            medico_id: fusionar_intervalos(intervalos)
+            for medico_id, intervalos in por_medico.items()
+        }
+        # Fines ordenados para la búsqueda binaria (los intervalos son disjuntos)
+        self._fines: Dict[int, List[datetime]] = {
+            medico_id: [fin for _, fin in intervalos]
+            for medico_id, intervalos in self._ocupados.items()
+        }
+
+    def atiende(self, medico_id: int, fecha: date) -> bool:
+        """Indica si el médico tiene disponibilidad configurada para el día de la fecha."""
+        return (medico_id, fecha.weekday()) in self._disponibilidades
+
+    def atiende_en(self, medico_id: int, fecha_hora: datetime) -> bool:
+        """Indica si la hora cae dentro de alguna franja de atención del médico para ese día."""
+        hora = fecha_hora.time()
+        return any(
+            disp.hora_desde <= hora < disp.hora_hasta
+            for disp in self._disponibilidades.get((medico_id, fecha_hora.weekday()), [])
+        )
+
+    def ocupar(self, medico_id: int, inicio: datetime, fin: datetime) -> None:
+        """
+        Agrega [inicio, fin) a los intervalos ocupados del médico,
+        por ejemplo al aceptar un turno de un lote en memoria.
+        """
+        self._ocupados[medico_id] = fusionar_intervalos(self._ocupados.get(medico_id, []) + [(inicio, fin)])
+        self._fines[medico_id] = [f for _, f in self._ocupados[medico_id]]
+
+    def esta_bloqueado(self, medico_id: int, inicio: datetime, fin: datetime) -> bool:
+        """Indica si [inicio, fin) se solapa con algún intervalo ocupado del médico."""
+        ocupados = self._ocupados.get(medico_id, [])
+        i = bisect_right(self._fines.get(medico_id, []), inicio)
+        return i < len(ocupados) and ocupados[i][0] < fin
+
+    def horarios_libres(
+        self,
+        medico_id: int,
+        fecha: date,
+        duracion_minutos: int = 30
+    ) -> List[datetime]:
+        """
+        Obtiene los horarios libres del médico para una fecha.
+
+        Args:
+            medico_id: ID del médico
+            fecha: Fecha a consultar
+            duracion_minutos: Duración del turno en minutos
+
+        Returns:
+            Lista ordenada de fechas/horas de inicio libres
+        """
+        ocupados = self._ocupados.get(medico_id, [])
+        fines = self._fines.get(medico_id, [])
+        duracion = timedelta(minutes=duracion_minutos)
+        horarios: List[datetime] = []
+
+        for disp in self._disponibilidades.get((medico_id, fecha.weekday()), []):
+            hora_actual = datetime.combine(fecha, disp.hora_desde)
+            hora_fin = datetime.combine(fecha, disp.hora_hasta)
+            paso = timedelta(minutes=disp.duracion_slot or duracion_minutos)
+
+            # Primer intervalo ocupado que termina después del inicio de la franja
+            i = bisect_right(fines, hora_actual)
+
+            while hora_actual + duracion <= hora_fin:
+                fin_slot = hora_actual + duracion
+                while i < len(ocupados) and ocupados[i][1] <= hora_actual:
+                    i += 1
+                if i >= len(ocupados) or ocupados[i][0] >= fin_slot:
+                    horarios.append(hora_actual)
+                hora_actual += paso
+
+        return horarios
@@ -0,0 +1,93 @@
+"""
+Plantillas de correo precompiladas.
+Cada plantilla se analiza una sola vez al importarse el módulo; renderizar
+solo concatena segmentos ya separados, sin volver a interpretar el texto.
+"""
+from html import escape
+from string import Formatter
+from typing import Iterable, List, Mapping, Optional, Tuple
+
+
+class PlantillaCorreo:
+    """
+    Plantilla con campos {nombre}. Las llaves literales se escriben {{ y }}.
+    En plantillas HTML los valores se escapan al renderizar.
+    """
+
+    def __init__(self, texto: str, html: bool = False):
+        """
+        Args:
+            texto: Texto de la plantilla
+            html: Si es True, los valores se escapan como HTML
+
+        Raises:
+            ValueError: Si la plantilla usa campos vacíos, formatos o conversiones
+        """
+        self.html = html
+        self._segmentos: List[Tuple[str, Optional[str]]] = []
+        for literal, campo, formato, conversion in Formatter().parse(texto):
+            if campo == "" or formato or conversion:
+                raise ValueError(f"Campo de plantilla no soportado: {{{campo}}}")
+            self._segmentos.append((literal, campo))
+        self.campos = frozenset(campo for _, campo in self._segmentos if campo)
+
+    def renderizar(self, datos: Mapping[str, str]) -> str:
+        """
+        Renderiza la plantilla.
+
+        Args:
+            datos: Valores para cada campo de la plantilla
+
+        Raises:
+            KeyError: Si falta algún campo
+        """
+        partes = []
+        for literal, campo in self._segmentos:
+            partes.append(literal)
+            if campo is not None:
+                valor = str(datos[campo])
+                partes.append(escape(valor) if self.html else valor)
+        return "".join(partes)
+
+    def renderizar_lote(self, filas: Iterable[Mapping[str, str]]) -> List[str]:
+        """Renderiza la plantilla para cada conjunto de datos."""
+        return [self.renderizar(datos) for datos in filas]
+
+
+# ============================================================
+# RECORDATORIO DE TURNO
+# Campos: paciente_nombre, fecha_hora, medico, especialidad
+# ============================================================
+
+RECORDATORIO_ASUNTO = "Recordatorio de Turno Médico"
+
+RECORDATORIO_TEXTO = PlantillaCorreo("""
+Hola {paciente_nombre},
+
+Te recordamos que tienes un turno médico programado para mañana.
+
+Fecha y Hora: {fecha_hora}
+Médico: Dr/a. {medico}
+Especialidad: {especialidad}
+
+Por favor, si no puedes asistir, recuerda cancelar el turno con anticipación.
+
+Saludos,
+Sistema de Turnos Médicos
+""")
+
+RECORDATORIO_HTML = PlantillaCorreo("""\
+<html>
+  <body style="font-family: Arial, sans-serif; color: #333;">
+    <p>Hola {paciente_nombre},</p>
+    <p>Te recordamos que tienes un turno médico programado para mañana.</p>
+    <table style="border-collapse: collapse;">
+      <tr><td><strong>Fecha y Hora:</strong></td><td>{fecha_hora}</td></tr>
+      <tr><td><strong>Médico:</strong></td><td>Dr/a. {medico}</td></tr>
+      <tr><td><strong>Especialidad:</strong></td><td>{especialidad}</td></tr>
+    </table>
+    <p>Por favor, si no puedes asistir, recuerda cancelar el turno con anticipación.</p>
+    <p>Saludos,<br>Sistema de Turnos Médicos</p>
+  </body>
+</html>
+""", html=True)
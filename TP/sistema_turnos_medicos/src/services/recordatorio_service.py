@@ -0,0 +1,172 @@
+"""
+Servicio de recordatorios de turnos.
+Los recordatorios se encolan como filas de Recordatorio al confirmar un turno
+y un despachador los envía por lotes cuando vence su programado_para.
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from src.config.settings import config
+from src.domain.recordatorio import Recordatorio
+from src.repositories.unit_of_work import UnitOfWork
+from src.services.email_service import EmailService
+
+
+class RecordatorioService:
+    """Servicio para programar y despachar recordatorios de turnos."""
+
+    def __init__(self, uow: UnitOfWork):
+        """
+        Inicializa el servicio con una unidad de trabajo.
+
+        Args:
+            uow: Unidad de trabajo para acceso a repositorios
+        """
+        self.uow = uow
+
+    @staticmethod
+    def _programado_para(fecha_hora: datetime, ahora: datetime) -> datetime:
+        """Momento de envío: ANTICIPACION_RECORDATORIO horas antes, o ya si el turno es más cercano."""
+        return max(fecha_hora - timedelta(hours=config.ANTICIPACION_RECORDATORIO), ahora)
+
+    def programar_recordatorio(
+        self,
+        turno_id: int,
+        fecha_hora: datetime,
+        canal: str = "EMAIL"
+    ) -> Optional[Recordatorio]:
+        """
+        Encola el recordatorio de un turno (no hace commit).
+
+        Args:
+            turno_id: ID del turno
+            fecha_hora: Fecha y hora del turno
+            canal: Canal de envío (EMAIL, PUSH, SMS)
+
+        Returns:
+            Recordatorio creado, o None si el turno ya pasó o ya tenía uno
+        """
+        ahora = datetime.now()
+        if fecha_hora <= ahora:
+            return None
+
+        if self.uow.recordatorios.existe_para_turno(turno_id, canal):
+            return None
+
+        return self.uow.recordatorios.add(Recordatorio(
+            id_turno=turno_id,
+            canal=canal,
+            programado_para=self._programado_para(fecha_hora, ahora),
+            estado="PENDIENTE"
+        ))
+
+    def programar_recordatorios(
+        self,
+        turnos: List[Tuple[int, datetime]],
+        canal: str = "EMAIL"
+    ) -> int:
+        """
+        Encola los recordatorios de varios turnos (no hace commit).
+        Igual que programar_recordatorio, pero con una consulta de existentes
+        y un INSERT executemany para todo el lote.
+
+        Args:
+            turnos: Tuplas (id_turno, fecha_hora)
+            canal: Canal de envío (EMAIL, PUSH, SMS)
+
+        Returns:
+            Cantidad de recordatorios creados
+        """
+        ahora = datetime.now()
+        futuros = [(turno_id, fecha_hora) for turno_id, fecha_hora in turnos if fecha_hora > ahora]
+        existentes = self.uow.recordatorios.get_turnos_con_recordatorio(
+            [turno_id for turno_id, _ in futuros], canal
+        )
+
+        nuevos = [
+            {
+                "id_turno": turno_id,
+                "canal": canal,
+                "programado_para": self._programado_para(fecha_hora, ahora),
+                "estado": "PENDIENTE"
+            }
+            for turno_id, fecha_hora in futuros
+            if turno_id not in existentes
+        ]
+        if nuevos:
+            self.uow.recordatorios.insertar_lote(nuevos)
+        return len(nuevos)
+
+    def programar_faltantes(self, canal: str = "EMAIL") -> int:
+        """
+        Encola recordatorios para turnos confirmados futuros que no tienen uno
+        (por ejemplo, confirmados antes de existir la cola). No hace commit.
+
+        Returns:
+            Cantidad de recordatorios creados
+        """
+        estado_conf_id = self.uow.estados_turno.get_id_por_codigo("CONF")
+        if estado_conf_id is None:
+            return 0
+
+        ahora = datetime.now()
+        turnos = self.uow.recordatorios.get_turnos_sin_recordatorio(estado_conf_id, ahora, canal)
+
+        self.uow.recordatorios.add_all([
+            Recordatorio(
+                id_turno=turno_id,
+                canal=canal,
+                programado_para=self._programado_para(fecha_hora, ahora),
+                estado="PENDIENTE"
+            )
+            for turno_id, fecha_hora in turnos
+        ])
+        return len(turnos)
+
+    def despachar_pendientes(self, email_service: EmailService, limite: int) -> Tuple[int, int]:
+        """
+        Reclama un lote de recordatorios vencidos, los envía y los marca
+        ENVIADO o ERROR. Confirma la transacción al reclamar y al finalizar.
+
+        Args:
+            email_service: Servicio de envío de correos
+            limite: Tamaño máximo del lote
+
+        Returns:
+            Tupla (enviados, con_error)
+        """
+        recordatorios = self.uow.recordatorios
+        ids = recordatorios.reclamar_pendientes(datetime.now(), limite)
+        if not ids:
+            return 0, 0
+        self.uow.commit()
+
+        # Una sola consulta con join: filas planas, sin cargas perezosas por correo
+        estado_conf_id = self.uow.estados_turno.get_id_por_codigo("CONF")
+        filas = recordatorios.get_datos_envio(ids)
+        a_enviar = [f for f in filas if f.turno_activo and f.id_estado == estado_conf_id]
+        recordatorios.marcar_con_error(
+            [f.id for f in filas if not (f.turno_activo and f.id_estado == estado_conf_id)],
+            "El turno ya no está confirmado"
+        )
+
+        # Un único envío por lote: sesiones SMTP reutilizadas y resultado por mensaje
+        resultados = email_service.enviar_lote(email_service.mensajes_recordatorio(a_enviar))
+
+        enviados = [r.mensaje.clave for r in resultados if r.enviado]
+        recordatorios.marcar_enviados(enviados, datetime.now())
+
+        errores: Dict[str, List[int]] = defaultdict(list)
+        for resultado in resultados:
+            if not resultado.enviado:
+                errores[f"No se pudo enviar el correo: {resultado.error}"].append(resultado.mensaje.clave)
+        for mensaje, ids_error in errores.items():
+            recordatorios.marcar_con_error(ids_error, mensaje)
+
+        self.uow.commit()
+        return len(enviados), len(ids) - len(enviados)
+
+    def proximo_envio(self) -> Optional[datetime]:
+        """Fecha/hora del próximo recordatorio pendiente, o None si la cola está vacía."""
+        return self.uow.recordatorios.get_proximo_programado()
@@ -1,126 +1,290 @@
-from datetime import date, datetime, timedelta
-from typing import List, Dict, Any, Optional
-from sqlalchemy import func, case, desc
+import csv
+import io
+import json
+from datetime import date, datetime, time, timedelta
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple
+from sqlalchemy import Row, Select, select, union_all
 from sqlalchemy.orm import Session
 
+from src.repositories.archivo_repository import ArchivoRepository
 from src.repositories.database import DatabaseManager
+from src.repositories.estadistica_diaria_repository import EstadisticaDiariaRepository
+from src.repositories.estado_turno_repository import EstadoTurnoRepository
+from src.domain.archivo import TurnoArchivado
 from src.domain.turno import Turno
 from src.domain.medico import Medico
 from src.domain.paciente import Paciente
 from src.domain.especialidad import Especialidad
 from src.domain.estado_turno import EstadoTurno
+from src.services.cache_reportes import ClaveReporte, cache_reportes
+
+COLUMNAS_TURNOS_MEDICO = ["fecha_hora", "paciente", "medico", "especialidad", "estado"]
+COLUMNAS_PACIENTES_ATENDIDOS = ["fecha", "paciente", "dni", "medico", "especialidad"]
+
+FORMATOS_EXPORTACION = ("csv", "ndjson")
+
 
 class ReporteService:
+    # Filas leídas por viaje al cursor del servidor y escritas por bloque de salida
+    FILAS_POR_LOTE = 1000
+
     def __init__(self):
         self.db = DatabaseManager()
 
+    @staticmethod
+    def _rango(fecha_inicio: date, fecha_fin: date) -> Tuple[datetime, datetime]:
+        """
+        Convierte el rango de días [fecha_inicio, fecha_fin] en el intervalo semiabierto
+        [inicio, fin) sobre fecha_hora, comparable directamente contra el índice.
+        """
+        return (
+            datetime.combine(fecha_inicio, time.min),
+            datetime.combine(fecha_fin + timedelta(days=1), time.min)
+        )
+
+    def _filtrar(self, stmt: Select, modelo, fecha_inicio: date, fecha_fin: date, medico_id: Optional[int], especialidad_id: Optional[int]) -> Select:
+        """Aplica el rango de fechas y los filtros opcionales de médico y especialidad."""
+        desde, hasta = self._rango(fecha_inicio, fecha_fin)
+        stmt = stmt.where(modelo.fecha_hora >= desde, modelo.fecha_hora < hasta)
+
+        if medico_id:
+            stmt = stmt.where(modelo.id_medico == medico_id)
+
+        if especialidad_id:
+            stmt = stmt.where(modelo.id_especialidad == especialidad_id)
+
+        return stmt
+
+    @staticmethod
+    def _con_archivo(session: Session, consulta: Callable[[type], Select], fecha_inicio: date) -> Select:
+        """
+        Arma la consulta sobre turnos y, solo si el rango alcanza el archivo
+        histórico, la combina con UNION ALL con la misma consulta sobre turnos_archivo.
+        Las consultas deben incluir las columnas fecha_hora y turno_id para ordenar.
+        """
+        if not ArchivoRepository(session).alcanza(fecha_inicio):
+            return consulta(Turno).order_by(Turno.fecha_hora, Turno.id)
+
+        union = union_all(consulta(Turno), consulta(TurnoArchivado))
+        return union.order_by(union.selected_columns.fecha_hora, union.selected_columns.turno_id)
+
+    def _consulta_turnos_por_medico(self, session: Session, fecha_inicio: date, fecha_fin: date, medico_id: Optional[int] = None, especialidad_id: Optional[int] = None) -> Select:
+        """Consulta por columnas del listado de turnos (ver _fila_turno_por_medico)."""
+        def consulta(modelo):
+            stmt = select(
+                modelo.id.label("turno_id"),
+                modelo.fecha_hora,
+                Paciente.nombre.label("paciente_nombre"),
+                Paciente.apellido.label("paciente_apellido"),
+                Medico.nombre.label("medico_nombre"),
+                Medico.apellido.label("medico_apellido"),
+                Especialidad.nombre.label("especialidad"),
+                EstadoTurno.descripcion.label("estado")
+            ).select_from(modelo).join(
+                Paciente, modelo.id_paciente == Paciente.id
+            ).join(
+                Medico, modelo.id_medico == Medico.id
+            ).join(
+                Especialidad, modelo.id_especialidad == Especialidad.id
+            ).join(
+                EstadoTurno, modelo.id_estado == EstadoTurno.id
+            )
+            return self._filtrar(stmt, modelo, fecha_inicio, fecha_fin, medico_id, especialidad_id)
+
+        return self._con_archivo(session, consulta, fecha_inicio)
+
+    @staticmethod
+    def _fila_turno_por_medico(fila: Row) -> Dict[str, Any]:
+        """Formatea una fila de _consulta_turnos_por_medico."""
+        return {
+            "fecha_hora": fila.fecha_hora.isoformat(),
+            "paciente": f"{fila.paciente_nombre} {fila.paciente_apellido}",
+            "medico": f"{fila.medico_nombre} {fila.medico_apellido}",
+            "especialidad": fila.especialidad,
+            "estado": fila.estado
+        }
+
     def get_turnos_por_medico(self, fecha_inicio: date, fecha_fin: date, medico_id: Optional[int] = None, especialidad_id: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Obtiene el listado de turnos en un rango de fechas, con filtros opcionales de médico y especialidad.
         """
-        with self.db.get_session() as session:
-            query = session.query(Turno).join(Paciente).join(Especialidad).join(Medico).filter(
-                func.date(Turno.fecha_hora) >= fecha_inicio,
-                func.date(Turno.fecha_hora) <= fecha_fin
-            )
+        def calcular():
+            with self.db.get_session() as session:
+                stmt = self._consulta_turnos_por_medico(session, fecha_inicio, fecha_fin, medico_id, especialidad_id)
+                return [self._fila_turno_por_medico(fila) for fila in session.execute(stmt)]
 
-            if medico_id:
-                query = query.filter(Turno.id_medico == medico_id)
-            
-            if especialidad_id:
-                query = query.filter(Turno.id_especialidad == especialidad_id)
-
-            turnos = query.order_by(Turno.fecha_hora).all()
-
-            resultado = []
-            for turno in turnos:
-                resultado.append({
-                    "fecha_hora": turno.fecha_hora.isoformat(),
-                    "paciente": f"{turno.paciente.nombre} {turno.paciente.apellido}",
-                    "medico": f"{turno.medico.nombre} {turno.medico.apellido}",
-                    "especialidad": turno.especialidad.nombre,
-                    "estado": turno.estado.descripcion
-                })
-            return resultado
+        return cache_reportes.obtener(
+            ClaveReporte("turnos_por_medico", fecha_inicio, fecha_fin, medico_id, especialidad_id),
+            calcular
+        )
 
     def get_turnos_por_especialidad(self, fecha_inicio: date, fecha_fin: date, medico_id: Optional[int] = None, especialidad_id: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Cuenta la cantidad de turnos por especialidad en un rango de fechas, con filtros opcionales.
+        Lee el resumen diario (estadisticas_diarias) en lugar de recorrer los turnos.
         """
-        with self.db.get_session() as session:
-            query = session.query(
-                Especialidad.nombre,
-                func.count(Turno.id)
-            ).join(Turno).filter(
-                func.date(Turno.fecha_hora) >= fecha_inicio,
-                func.date(Turno.fecha_hora) <= fecha_fin
-            )
+        def calcular():
+            with self.db.get_session() as session:
+                results = EstadisticaDiariaRepository(session).contar_por_especialidad(
+                    fecha_inicio, fecha_fin, medico_id, especialidad_id
+                )
+                return [{"especialidad": nombre, "cantidad": cantidad} for nombre, cantidad in results]
 
-            if medico_id:
-                query = query.filter(Turno.id_medico == medico_id)
-            
-            if especialidad_id:
-                query = query.filter(Turno.id_especialidad == especialidad_id)
+        return cache_reportes.obtener(
+            ClaveReporte("turnos_por_especialidad", fecha_inicio, fecha_fin, medico_id, especialidad_id),
+            calcular
+        )
 
-            results = query.group_by(Especialidad.nombre).all()
+    def _consulta_pacientes_atendidos(self, session: Session, fecha_inicio: date, fecha_fin: date, medico_id: Optional[int] = None, especialidad_id: Optional[int] = None) -> Select:
+        """Consulta por columnas de turnos asistidos (ver _fila_paciente_atendido)."""
+        estado_asis_id = EstadoTurnoRepository(session).get_id_por_codigo("ASIS")
 
-            return [{"especialidad": nombre, "cantidad": cantidad} for nombre, cantidad in results]
+        def consulta(modelo):
+            stmt = select(
+                modelo.id.label("turno_id"),
+                modelo.fecha_hora,
+                Paciente.nombre.label("paciente_nombre"),
+                Paciente.apellido.label("paciente_apellido"),
+                Paciente.dni,
+                Medico.nombre.label("medico_nombre"),
+                Medico.apellido.label("medico_apellido"),
+                Especialidad.nombre.label("especialidad")
+            ).select_from(modelo).join(
+                Paciente, modelo.id_paciente == Paciente.id
+            ).join(
+                Medico, modelo.id_medico == Medico.id
+            ).join(
+                Especialidad, modelo.id_especialidad == Especialidad.id
+            ).where(
+                modelo.id_estado == estado_asis_id
+            )
+            return self._filtrar(stmt, modelo, fecha_inicio, fecha_fin, medico_id, especialidad_id)
+
+        return self._con_archivo(session, consulta, fecha_inicio)
+
+    @staticmethod
+    def _fila_paciente_atendido(fila: Row) -> Dict[str, Any]:
+        """Formatea una fila de _consulta_pacientes_atendidos."""
+        return {
+            "fecha": fila.fecha_hora.date().isoformat(),
+            "paciente": f"{fila.paciente_nombre} {fila.paciente_apellido}",
+            "dni": fila.dni,
+            "medico": f"{fila.medico_nombre} {fila.medico_apellido}",
+            "especialidad": fila.especialidad
+        }
 
     def get_pacientes_atendidos(self, fecha_inicio: date, fecha_fin: date, medico_id: Optional[int] = None, especialidad_id: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Obtiene los pacientes atendidos (turnos con estado 'ASIS') en un rango de fechas.
         """
-        with self.db.get_session() as session:
-            query = session.query(Turno).join(Paciente).join(Medico).join(Especialidad).join(EstadoTurno).filter(
-                EstadoTurno.codigo == "ASIS",
-                func.date(Turno.fecha_hora) >= fecha_inicio,
-                func.date(Turno.fecha_hora) <= fecha_fin
-            )
+        def calcular():
+            with self.db.get_session() as session:
+                stmt = self._consulta_pacientes_atendidos(session, fecha_inicio, fecha_fin, medico_id, especialidad_id)
+                return [self._fila_paciente_atendido(fila) for fila in session.execute(stmt)]
 
-            if medico_id:
-                query = query.filter(Turno.id_medico == medico_id)
-            
-            if especialidad_id:
-                query = query.filter(Turno.id_especialidad == especialidad_id)
-
-            turnos = query.order_by(Turno.fecha_hora).all()
-
-            resultado = []
-            for turno in turnos:
-                resultado.append({
-                    "fecha": turno.fecha_hora.date().isoformat(),
-                    "paciente": f"{turno.paciente.nombre} {turno.paciente.apellido}",
-                    "dni": turno.paciente.dni,
-                    "medico": f"{turno.medico.nombre} {turno.medico.apellido}",
-                    "especialidad": turno.especialidad.nombre
-                })
-            return resultado
+        return cache_reportes.obtener(
+            ClaveReporte("pacientes_atendidos", fecha_inicio, fecha_fin, medico_id, especialidad_id),
+            calcular
+        )
 
     def get_estadisticas_asistencia(self, fecha_inicio: date, fecha_fin: date, medico_id: Optional[int] = None, especialidad_id: Optional[int] = None) -> Dict[str, int]:
         """
         Calcula la cantidad de asistencias e inasistencias con filtros opcionales.
         Asistencias: Estado 'ASIS'
         Inasistencias: Estado 'INAS'
+        Lee el resumen diario (estadisticas_diarias) en lugar de recorrer los turnos.
+        """
+        def calcular():
+            with self.db.get_session() as session:
+                estados = EstadoTurnoRepository(session)
+                asis_id = estados.get_id_por_codigo("ASIS")
+                inas_id = estados.get_id_por_codigo("INAS")
+
+                conteos = EstadisticaDiariaRepository(session).contar_por_estado(
+                    fecha_inicio, fecha_fin, [asis_id, inas_id], medico_id, especialidad_id
+                )
+
+                return {
+                    "asistencias": conteos.get(asis_id, 0),
+                    "inasistencias": conteos.get(inas_id, 0)
+                }
+
+        return cache_reportes.obtener(
+            ClaveReporte("estadisticas_asistencia", fecha_inicio, fecha_fin, medico_id, especialidad_id),
+            calcular
+        )
+
+    # ============================================================
+    # EXPORTACIÓN EN STREAMING (CSV / NDJSON)
+    # ============================================================
+
+    def exportar_turnos_por_medico(self, formato: str, fecha_inicio: date, fecha_fin: date, medico_id: Optional[int] = None, especialidad_id: Optional[int] = None) -> Iterator[str]:
+        """
+        Genera el listado de turnos en CSV o NDJSON, bloque por bloque.
+        La memoria usada no depende del rango de fechas.
         """
+        return self._exportar(
+            formato,
+            lambda session: self._consulta_turnos_por_medico(session, fecha_inicio, fecha_fin, medico_id, especialidad_id),
+            self._fila_turno_por_medico,
+            COLUMNAS_TURNOS_MEDICO
+        )
+
+    def exportar_pacientes_atendidos(self, formato: str, fecha_inicio: date, fecha_fin: date, medico_id: Optional[int] = None, especialidad_id: Optional[int] = None) -> Iterator[str]:
+        """
+        Genera el listado de pacientes atendidos en CSV o NDJSON, bloque por bloque.
+        La memoria usada no depende del rango de fechas.
+        """
+        return self._exportar(
+            formato,
+            lambda session: self._consulta_pacientes_atendidos(session, fecha_inicio, fecha_fin, medico_id, especialidad_id),
+            self._fila_paciente_atendido,
+            COLUMNAS_PACIENTES_ATENDIDOS
+        )
+
+    def _exportar(self, formato: str, consulta: Callable[[Session], Select], formatear: Callable[[Row], Dict[str, Any]], columnas: List[str]) -> Iterator[str]:
+        """
+        Recorre la consulta con un cursor del servidor (yield_per) y serializa
+        las filas a medida que llegan. La sesión se cierra al agotar o cerrar el generador.
+        """
+        if formato not in FORMATOS_EXPORTACION:
+            raise ValueError(f"Formato de exportación no soportado: {formato}")
+
+        return self._generar_exportacion(formato, consulta, formatear, columnas)
+
+    def _generar_exportacion(self, formato: str, consulta: Callable[[Session], Select], formatear: Callable[[Row], Dict[str, Any]], columnas: List[str]) -> Iterator[str]:
         with self.db.get_session() as session:
-            base_query = session.query(func.count(Turno.id)).join(EstadoTurno).filter(
-                func.date(Turno.fecha_hora) >= fecha_inicio,
-                func.date(Turno.fecha_hora) <= fecha_fin
-            )
+            stmt = consulta(session).execution_options(yield_per=self.FILAS_POR_LOTE)
+            filas = (formatear(fila) for fila in session.execute(stmt))
+
+            if formato == "csv":
+                yield from self._como_csv(filas, columnas)
+            else:
+                yield from self._como_ndjson(filas)
+
+    def _como_csv(self, filas: Iterable[Dict[str, Any]], columnas: List[str]) -> Iterator[str]:
+        """Serializa filas a CSV (con encabezado) en bloques de FILAS_POR_LOTE."""
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=columnas)
+        writer.writeheader()
 
-            if medico_id:
-                base_query = base_query.filter(Turno.id_medico == medico_id)
-            
-            if especialidad_id:
-                base_query = base_query.filter(Turno.id_especialidad == especialidad_id)
+        for i, fila in enumerate(filas, 1):
+            writer.writerow(fila)
+            if i % self.FILAS_POR_LOTE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
 
-            # Contar asistencias
-            asistencias = base_query.filter(EstadoTurno.codigo == "ASIS").scalar()
+        yield buffer.getvalue()
 
-            # Contar inasistencias
-            inasistencias = base_query.filter(EstadoTurno.codigo == "INAS").scalar()
+    def _como_ndjson(self, filas: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        """Serializa filas a NDJSON (un objeto JSON por línea) en bloques de FILAS_POR_LOTE."""
+        bloque = []
+        for fila in filas:
+            bloque.append(json.dumps(fila, ensure_ascii=False))
+            if len(bloque) == self.FILAS_POR_LOTE:
+                yield "\n".join(bloque) + "\n"
+                bloque = []
 
-            return {
-                "asistencias": asistencias or 0,
-                "inasistencias": inasistencias or 0
-            }
+        if bloque:
+            yield "\n".join(bloque) + "\n"
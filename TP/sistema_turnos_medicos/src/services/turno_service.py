@@ -2,17 +2,61 @@
 Servicio de gestión de Turnos Médicos.
 Implementa todas las validaciones de negocio para turnos.
 """
-from datetime import datetime, timedelta
-from typing import List, Optional
+import heapq
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
+from sqlalchemy import Row
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from src.config.settings import config
 from src.domain.turno import Turno
+from src.repositories.database import es_conflicto_concurrente
+from src.repositories.reserva_agenda_repository import alineado_a_bloques
 from src.repositories.unit_of_work import UnitOfWork
+from src.services.cache_reportes import cache_reportes
+from src.services.motor_disponibilidad import MotorDisponibilidad
+from src.services.recordatorio_service import RecordatorioService
 from src.utils.exceptions import *
 
 
+class SolicitudTurno(NamedTuple):
+    """Datos de un turno pedido dentro de un lote (ver TurnoService.reservar_turnos_lote)."""
+    paciente_id: int
+    medico_id: int
+    especialidad_id: int
+    fecha_hora: datetime
+    duracion_minutos: int = 30
+    lugar: Optional[str] = None
+    observaciones: Optional[str] = None
+
+
+class ResultadoSolicitudTurno(NamedTuple):
+    """Resultado de una solicitud del lote: el turno creado o el motivo del rechazo."""
+    solicitud: SolicitudTurno
+    turno: Optional[Turno] = None
+    error: Optional[str] = None
+
+
+class ResultadoBarrido(NamedTuple):
+    """Métricas de un barrido de turnos vencidos (ver TurnoService.marcar_inasistidos_vencidos)."""
+    actualizados: int
+    lotes: int
+    segundos: float
+
+
 class TurnoService:
     """Servicio para gestión de turnos con validaciones completas."""
     
+    # Estado destino -> (estados de origen permitidos, solo turnos futuros)
+    TRANSICIONES_LOTE: Dict[str, Tuple[Tuple[str, ...], bool]] = {
+        "CONF": (("PEND",), False),
+        "CANC": (("PEND", "CONF"), True),
+        "ASIS": (("PEND", "CONF"), False),
+        "INAS": (("PEND", "CONF"), False),
+    }
+    
     def __init__(self, uow: UnitOfWork):
         """
         Inicializa el servicio con una unidad de trabajo.
@@ -36,7 +80,7 @@ class TurnoService:
         Crea un nuevo turno con todas las validaciones de negocio.
         
         Validaciones:
-        1. Fecha futura obligatoria
+        1. Fecha futura obligatoria, con inicio y duración múltiplos de RESERVA_BLOQUE_MINUTOS
         2. Verificación de disponibilidad del médico
         3. Médico tiene la especialidad
         4. Anti-solape para el mismo médico
@@ -44,6 +88,10 @@ class TurnoService:
         6. Control de bloqueos del médico
         7. Estado inicial: PEND
         
+        Opera sobre el Unit of Work inyectado; el commit lo hace el llamador,
+        que luego debe invalidar el cache de reportes (cache_reportes.invalidar_turno).
+        reservar_turno hace ambas cosas y reintenta ante reservas concurrentes.
+        
         Args:
             paciente_id: ID del paciente
             medico_id: ID del médico
@@ -60,96 +108,283 @@ class TurnoService:
             ValidationException: Si falla alguna validación
             EntityNotFoundException: Si no existe paciente, médico o especialidad
             TurnoSolapamientoException: Si hay solapamiento
+            DisponibilidadException: Si el médico no atiende o está bloqueado en ese horario
         """
-        with UnitOfWork() as uow:
-            # 1. Validar que fecha sea futura
-            if fecha_hora <= datetime.now():
-                raise ValidationException("La fecha del turno debe ser futura")
-            
-            # 2. Verificar que existan paciente, médico y especialidad
-            paciente = uow.pacientes.get_by_id(paciente_id)
-            if paciente is None:
-                raise EntityNotFoundException(f"Paciente con ID {paciente_id} no encontrado")
-            
-            medico = uow.medicos.get_by_id_con_especialidades(medico_id)
-            if medico is None:
-                raise EntityNotFoundException(f"Médico con ID {medico_id} no encontrado")
-            
-            especialidad = uow.especialidades.get_by_id(especialidad_id)
-            if especialidad is None:
-                raise EntityNotFoundException(f"Especialidad con ID {especialidad_id} no encontrada")
-            
-            # 3. Verificar que el médico tenga la especialidad
-            if not medico.tiene_especialidad(especialidad_id):
-                raise ValidationException(
-                    f"El médico {medico.nombre_completo} no tiene la especialidad {especialidad.nombre}"
-                )
-            
-            # 4. Verificar disponibilidad del médico (día y horario)
-            dia_semana = fecha_hora.weekday()  # 0=Lunes, 6=Domingo
-            hora_turno = fecha_hora.time()
-            
-            disponibilidades = uow.disponibilidades.get_por_medico_y_dia(medico_id, dia_semana)
-            
-            if not disponibilidades:
-                raise DisponibilidadException(
-                    f"El médico no tiene disponibilidad configurada para los días {self._dia_nombre(dia_semana)}"
-                )
-            
-            # Verificar que la hora esté dentro de alguna disponibilidad
-            hora_valida = False
-            for disp in disponibilidades:
-                if disp.hora_desde <= hora_turno < disp.hora_hasta:
-                    hora_valida = True
-                    break
-            
-            if not hora_valida:
-                raise DisponibilidadException(
-                    f"El médico no atiende en ese horario los días {self._dia_nombre(dia_semana)}"
-                )
-            
-            # 5. Verificar bloqueos del médico (TEMPORALMENTE DESHABILITADO)
-            fecha_hora_fin = fecha_hora + timedelta(minutes=duracion_minutos)
-            
-            # TODO: Arreglar verificación de bloqueos con SQLAlchemy 2.0
-            # if uow.bloqueos.verificar_bloqueado(medico_id, fecha_hora, fecha_hora_fin):
-            #     raise DisponibilidadException(
-            #         "El médico tiene un bloqueo en ese horario (vacaciones, capacitación, etc.)"
-            #     )
-            
-            # 6. Verificar anti-solape con otros turnos del médico
-            if uow.turnos.verificar_solapamiento_medico(medico_id, fecha_hora, fecha_hora_fin):
-                raise TurnoSolapamientoException(
-                    "El médico ya tiene un turno asignado en ese horario"
-                )
-            
-            # 7. Verificar anti-solape con otros turnos del paciente
-            if uow.turnos.verificar_solapamiento_paciente(paciente_id, fecha_hora, fecha_hora_fin):
-                raise TurnoSolapamientoException(
-                    "El paciente ya tiene un turno asignado en ese horario"
+        uow = self.uow
+        
+        # 1. Validar que fecha sea futura y alineada a los bloques de agenda
+        if fecha_hora <= datetime.now():
+            raise ValidationException("La fecha del turno debe ser futura")
+        
+        if not alineado_a_bloques(fecha_hora, duracion_minutos):
+            raise ValidationException(self._mensaje_alineacion())
+        
+        # 2. Verificar que existan paciente, médico y especialidad
+        paciente = uow.pacientes.get_by_id(paciente_id)
+        if paciente is None:
+            raise EntityNotFoundException(f"Paciente con ID {paciente_id} no encontrado")
+        
+        medico = uow.medicos.get_by_id_con_especialidades(medico_id)
+        if medico is None:
+            raise EntityNotFoundException(f"Médico con ID {medico_id} no encontrado")
+        
+        especialidad = uow.especialidades.get_by_id(especialidad_id)
+        if especialidad is None:
+            raise EntityNotFoundException(f"Especialidad con ID {especialidad_id} no encontrada")
+        
+        # 3. Verificar que el médico tenga la especialidad
+        if not medico.tiene_especialidad(especialidad_id):
+            raise ValidationException(
+                f"El médico {medico.nombre_completo} no tiene la especialidad {especialidad.nombre}"
+            )
+        
+        # 4. Verificar disponibilidad del médico (día y horario)
+        dia_semana = fecha_hora.weekday()  # 0=Lunes, 6=Domingo
+        hora_turno = fecha_hora.time()
+        
+        disponibilidades = uow.disponibilidades.get_por_medico_y_dia(medico_id, dia_semana)
+        
+        if not disponibilidades:
+            raise DisponibilidadException(
+                f"El médico no tiene disponibilidad configurada para los días {self._dia_nombre(dia_semana)}"
+            )
+        
+        # Verificar que la hora esté dentro de alguna disponibilidad
+        hora_valida = False
+        for disp in disponibilidades:
+            if disp.hora_desde <= hora_turno < disp.hora_hasta:
+                hora_valida = True
+                break
+        
+        if not hora_valida:
+            raise DisponibilidadException(
+                f"El médico no atiende en ese horario los días {self._dia_nombre(dia_semana)}"
+            )
+        
+        # 5. Verificar bloqueos del médico (mismo criterio que _validar_lote)
+        fecha_hora_fin = fecha_hora + timedelta(minutes=duracion_minutos)
+        
+        bloqueos = MotorDisponibilidad(
+            (), uow.bloqueos.get_por_medicos([medico_id], fecha_hora.date(), fecha_hora_fin.date())
+        )
+        if bloqueos.esta_bloqueado(medico_id, fecha_hora, fecha_hora_fin):
+            raise DisponibilidadException(
+                "El médico tiene un bloqueo en ese horario (vacaciones, capacitación, etc.)"
+            )
+        
+        # 6. Verificar anti-solape con otros turnos del médico
+        if uow.turnos.verificar_solapamiento_medico(medico_id, fecha_hora, fecha_hora_fin):
+            raise TurnoSolapamientoException(
+                "El médico ya tiene un turno asignado en ese horario"
+            )
+        
+        # 7. Verificar anti-solape con otros turnos del paciente
+        if uow.turnos.verificar_solapamiento_paciente(paciente_id, fecha_hora, fecha_hora_fin):
+            raise TurnoSolapamientoException(
+                "El paciente ya tiene un turno asignado en ese horario"
+            )
+        
+        # 8. Obtener estado PENDIENTE
+        estado_pend_id = uow.estados_turno.get_id_por_codigo("PEND")
+        if estado_pend_id is None:
+            raise EntityNotFoundException("Estado PENDIENTE no encontrado. Ejecute inicialización de datos.")
+        
+        # 9. Crear turno
+        turno = Turno(
+            id_paciente=paciente_id,
+            id_medico=medico_id,
+            id_especialidad=especialidad_id,
+            id_estado=estado_pend_id,
+            fecha_hora=fecha_hora,
+            duracion_minutos=duracion_minutos,
+            lugar=lugar,
+            observaciones=observaciones
+        )
+        
+        uow.turnos.agregar(turno)
+        
+        return turno
+
+    def reservar_turno(
+        self,
+        paciente_id: int,
+        medico_id: int,
+        especialidad_id: int,
+        fecha_hora: datetime,
+        duracion_minutos: int = 30,
+        lugar: Optional[str] = None,
+        observaciones: Optional[str] = None
+    ) -> Turno:
+        """
+        Crea el turno (ver crear_turno), confirma la transacción e invalida
+        el cache de reportes.
+        
+        Las validaciones son lecturas; la única garantía ante reservas
+        concurrentes es el índice único de reservas_agenda. Si otra transacción
+        tomó el horario (IntegrityError) o la base rechazó la escritura por
+        un bloqueo (ver es_conflicto_concurrente), se revierte y se repite todo
+        hasta RESERVA_REINTENTOS veces: en el reintento las validaciones ya ven
+        el turno ganador y fallan con el mensaje habitual. Los demás errores
+        de la base se propagan.
+        
+        Returns:
+            Turno creado y confirmado
+        
+        Raises:
+            TurnoSolapamientoException: Si el horario se sigue ocupando tras los reintentos
+            (además de las excepciones de crear_turno)
+        """
+        for _ in range(max(config.RESERVA_REINTENTOS, 1)):
+            try:
+                turno = self.crear_turno(
+                    paciente_id, medico_id, especialidad_id, fecha_hora,
+                    duracion_minutos, lugar, observaciones
                 )
-            
-            # 8. Obtener estado PENDIENTE
-            estado_pend = uow.estados_turno.get_pendiente()
-            if estado_pend is None:
-                raise EntityNotFoundException("Estado PENDIENTE no encontrado. Ejecute inicialización de datos.")
-            
-            # 9. Crear turno
-            turno = Turno(
-                id_paciente=paciente_id,
-                id_medico=medico_id,
-                id_especialidad=especialidad_id,
-                id_estado=estado_pend.id,
-                fecha_hora=fecha_hora,
-                duracion_minutos=duracion_minutos,
-                lugar=lugar,
-                observaciones=observaciones
+                self.uow.commit()
+                cache_reportes.invalidar_turno(fecha_hora.date(), medico_id, especialidad_id)
+                return turno
+            except (IntegrityError, OperationalError) as e:
+                self.uow.rollback()
+                if not es_conflicto_concurrente(e):
+                    raise
+        
+        raise TurnoSolapamientoException(
+            "El horario fue reservado por otra solicitud al mismo tiempo. Intente nuevamente."
+        )
+
+    def reservar_turnos_lote(self, solicitudes: List[SolicitudTurno]) -> List[ResultadoSolicitudTurno]:
+        """
+        Crea varios turnos (ej. una serie semanal o una campaña) en una sola transacción.
+        
+        Cada solicitud se valida con las mismas reglas que crear_turno, pero contra
+        una única foto precargada de pacientes, médicos, disponibilidades, bloqueos
+        y turnos existentes (una cantidad fija de consultas para todo el lote).
+        Las solicitudes aceptadas ocupan agenda en la foto, por lo que tampoco
+        pueden solaparse entre sí. Los turnos aceptados se insertan con un único
+        INSERT executemany y se confirma la transacción.
+        
+        Ante conflicto con una reserva concurrente se repite todo el lote (ver
+        reservar_turno); en el reintento la solicitud afectada queda rechazada.
+        
+        Args:
+            solicitudes: Turnos pedidos
+        
+        Returns:
+            Un resultado por solicitud, en el mismo orden
+        
+        Raises:
+            TurnoSolapamientoException: Si el conflicto persiste tras los reintentos
+        """
+        if not solicitudes:
+            return []
+        
+        for _ in range(max(config.RESERVA_REINTENTOS, 1)):
+            try:
+                errores, filas = self._validar_lote(solicitudes)
+                turnos = iter(self.uow.turnos.agregar_lote([fila for fila in filas if fila is not None]))
+                self.uow.commit()
+                break
+            except (IntegrityError, OperationalError) as e:
+                self.uow.rollback()
+                if not es_conflicto_concurrente(e):
+                    raise
+        else:
+            raise TurnoSolapamientoException(
+                "Algún horario del lote fue reservado por otra solicitud al mismo tiempo. Intente nuevamente."
             )
-            
-            uow.turnos.add(turno)
-            uow.commit()
-            
-            return turno
+        
+        resultados = [
+            ResultadoSolicitudTurno(solicitud, error=error) if error else ResultadoSolicitudTurno(solicitud, next(turnos))
+            for solicitud, error in zip(solicitudes, errores)
+        ]
+        for clave in {(r.turno.fecha_hora.date(), r.turno.id_medico, r.turno.id_especialidad) for r in resultados if r.turno}:
+            cache_reportes.invalidar_turno(*clave)
+        return resultados
+
+    def _validar_lote(self, solicitudes: List[SolicitudTurno]) -> Tuple[List[Optional[str]], List[Optional[Dict[str, Any]]]]:
+        """
+        Valida un lote contra una foto precargada de la BD.
+        
+        Returns:
+            Tupla (errores, filas): por cada solicitud, el mensaje de rechazo o
+            None, y los valores del turno a insertar o None si fue rechazada
+        """
+        uow = self.uow
+        ahora = datetime.now()
+        
+        paciente_ids = {s.paciente_id for s in solicitudes}
+        medico_ids = list({s.medico_id for s in solicitudes})
+        inicio = min(s.fecha_hora for s in solicitudes)
+        fin = max(s.fecha_hora + timedelta(minutes=s.duracion_minutos) for s in solicitudes)
+        
+        # Foto del lote: una consulta por tipo de dato
+        pacientes = uow.pacientes.get_ids_existentes(paciente_ids)
+        medicos = {m.id: m for m in uow.medicos.get_por_ids_con_especialidades(medico_ids)}
+        especialidades = {e.id: e for e in uow.especialidades.get_por_ids(s.especialidad_id for s in solicitudes)}
+        agenda = MotorDisponibilidad(
+            uow.disponibilidades.get_por_medicos(medico_ids),
+            uow.bloqueos.get_por_medicos(medico_ids, inicio.date(), fin.date())
+        )
+        # El motor indexa intervalos por ID: se usa también para la agenda de los pacientes
+        turnos_medicos = MotorDisponibilidad((), (), uow.turnos.get_intervalos_ocupados(medico_ids, inicio, fin))
+        turnos_pacientes = MotorDisponibilidad(
+            (), (), uow.turnos.get_intervalos_ocupados_pacientes(list(paciente_ids), inicio, fin)
+        )
+        estado_pend_id = uow.estados_turno.get_id_por_codigo("PEND")
+        if estado_pend_id is None:
+            raise EntityNotFoundException("Estado PENDIENTE no encontrado. Ejecute inicialización de datos.")
+        
+        errores: List[Optional[str]] = []
+        filas: List[Optional[Dict[str, Any]]] = []
+        for s in solicitudes:
+            medico = medicos.get(s.medico_id)
+            especialidad = especialidades.get(s.especialidad_id)
+            fecha_hora_fin = s.fecha_hora + timedelta(minutes=s.duracion_minutos)
+            
+            if s.fecha_hora <= ahora:
+                error = "La fecha del turno debe ser futura"
+            elif not alineado_a_bloques(s.fecha_hora, s.duracion_minutos):
+                error = self._mensaje_alineacion()
+            elif s.paciente_id not in pacientes:
+                error = f"Paciente con ID {s.paciente_id} no encontrado"
+            elif medico is None:
+                error = f"Médico con ID {s.medico_id} no encontrado"
+            elif especialidad is None:
+                error = f"Especialidad con ID {s.especialidad_id} no encontrada"
+            elif not medico.tiene_especialidad(s.especialidad_id):
+                error = f"El médico {medico.nombre_completo} no tiene la especialidad {especialidad.nombre}"
+            elif not agenda.atiende(s.medico_id, s.fecha_hora.date()):
+                error = f"El médico no tiene disponibilidad configurada para los días {self._dia_nombre(s.fecha_hora.weekday())}"
+            elif not agenda.atiende_en(s.medico_id, s.fecha_hora):
+                error = f"El médico no atiende en ese horario los días {self._dia_nombre(s.fecha_hora.weekday())}"
+            elif agenda.esta_bloqueado(s.medico_id, s.fecha_hora, fecha_hora_fin):
+                error = "El médico tiene un bloqueo en ese horario (vacaciones, capacitación, etc.)"
+            elif turnos_medicos.esta_bloqueado(s.medico_id, s.fecha_hora, fecha_hora_fin):
+                error = "El médico ya tiene un turno asignado en ese horario"
+            elif turnos_pacientes.esta_bloqueado(s.paciente_id, s.fecha_hora, fecha_hora_fin):
+                error = "El paciente ya tiene un turno asignado en ese horario"
+            else:
+                error = None
+            
+            errores.append(error)
+            if error:
+                filas.append(None)
+                continue
+            
+            turnos_medicos.ocupar(s.medico_id, s.fecha_hora, fecha_hora_fin)
+            turnos_pacientes.ocupar(s.paciente_id, s.fecha_hora, fecha_hora_fin)
+            filas.append({
+                "id_paciente": s.paciente_id,
+                "id_medico": s.medico_id,
+                "id_especialidad": s.especialidad_id,
+                "id_estado": estado_pend_id,
+                "fecha_hora": s.fecha_hora,
+                "duracion_minutos": s.duracion_minutos,
+                "lugar": s.lugar,
+                "observaciones": s.observaciones
+            })
+        
+        return errores, filas
 
     def cancelar_turno(self, turno_id: int, motivo: Optional[str] = None) -> Turno:
         """
@@ -183,14 +418,14 @@ class TurnoService:
                 )
             
             # Cambiar a estado CANCELADO
-            estado_canc = uow.estados_turno.get_cancelado()
-            turno.id_estado = estado_canc.id
+            uow.turnos.cambiar_estado(turno, uow.estados_turno.get_id_por_codigo("CANC"))
             
             if motivo:
                 turno.observaciones = f"{turno.observaciones or ''}\n[CANCELADO] {motivo}".strip()
             
             uow.turnos.update(turno)
             uow.commit()
+            cache_reportes.invalidar_turno(turno.fecha_hora.date(), turno.id_medico, turno.id_especialidad)
             
             return turno
 
@@ -207,11 +442,12 @@ class TurnoService:
                     f"Solo se pueden confirmar turnos pendientes. Estado actual: {turno.estado.nombre}"
                 )
             
-            estado_conf = uow.estados_turno.get_confirmado()
-            turno.id_estado = estado_conf.id
+            uow.turnos.cambiar_estado(turno, uow.estados_turno.get_id_por_codigo("CONF"))
             
             uow.turnos.update(turno)
+            RecordatorioService(uow).programar_recordatorio(turno.id, turno.fecha_hora)
             uow.commit()
+            cache_reportes.invalidar_turno(turno.fecha_hora.date(), turno.id_medico, turno.id_especialidad)
             
             return turno
 
@@ -228,11 +464,11 @@ class TurnoService:
                     "Solo se pueden marcar como asistidos turnos pendientes o confirmados"
                 )
             
-            estado_asis = uow.estados_turno.get_asistido()
-            turno.id_estado = estado_asis.id
+            uow.turnos.cambiar_estado(turno, uow.estados_turno.get_id_por_codigo("ASIS"))
             
             uow.turnos.update(turno)
             uow.commit()
+            cache_reportes.invalidar_turno(turno.fecha_hora.date(), turno.id_medico, turno.id_especialidad)
             
             return turno
 
@@ -249,14 +485,126 @@ class TurnoService:
                     "Solo se pueden marcar como inasistidos turnos pendientes o confirmados"
                 )
             
-            estado_inas = uow.estados_turno.get_inasistido()
-            turno.id_estado = estado_inas.id
+            uow.turnos.cambiar_estado(turno, uow.estados_turno.get_id_por_codigo("INAS"))
             
             uow.turnos.update(turno)
             uow.commit()
+            cache_reportes.invalidar_turno(turno.fecha_hora.date(), turno.id_medico, turno.id_especialidad)
             
             return turno
 
+    def cambiar_estados_lote(self, cambios: Dict[str, List[int]]) -> Dict[str, List[int]]:
+        """
+        Aplica cambios de estado a muchos turnos en una sola transacción
+        (ej. cierre del día: marcar asistidos e inasistidos de una vez).
+        
+        Se ejecuta un UPDATE ... WHERE id IN (...) por estado destino, en el
+        orden recibido. Las transiciones se validan en SQL con las mismas reglas
+        que confirmar_turno, cancelar_turno y marcar_*: los turnos inexistentes o
+        en un estado que no lo permite simplemente no cambian. Al confirmar se
+        encolan los recordatorios; luego se confirma la transacción y se
+        invalida el cache de reportes.
+        
+        Args:
+            cambios: Diccionario {código de estado destino: IDs de turnos}
+        
+        Returns:
+            Diccionario {código de estado destino: IDs de turnos modificados}
+        
+        Raises:
+            ValidationException: Si algún estado destino no admite cambios por lote
+            TurnoSolapamientoException: Si la escritura sigue en conflicto tras los reintentos
+        """
+        invalidos = [codigo for codigo in cambios if codigo not in self.TRANSICIONES_LOTE]
+        if invalidos:
+            raise ValidationException(
+                f"Estados destino no válidos: {', '.join(invalidos)}. "
+                f"Permitidos: {', '.join(self.TRANSICIONES_LOTE)}"
+            )
+        
+        uow = self.uow
+        for _ in range(max(config.RESERVA_REINTENTOS, 1)):
+            try:
+                modificados: Dict[str, List[Row]] = {}
+                for codigo, turno_ids in cambios.items():
+                    origenes, solo_futuros = self.TRANSICIONES_LOTE[codigo]
+                    estado_id = uow.estados_turno.get_id_por_codigo(codigo)
+                    if estado_id is None:
+                        raise EntityNotFoundException(f"Estado {codigo} no encontrado. Ejecute inicialización de datos.")
+                    modificados[codigo] = uow.turnos.cambiar_estado_lote(
+                        turno_ids, estado_id, uow.estados_turno.get_ids_por_codigos(origenes), solo_futuros
+                    )
+                
+                # Recordatorios solo para los que siguen confirmados al final del lote
+                cambiados_despues = {
+                    fila.id for codigo, filas in modificados.items() if codigo != "CONF" for fila in filas
+                }
+                RecordatorioService(uow).programar_recordatorios([
+                    (fila.id, fila.fecha_hora)
+                    for fila in modificados.get("CONF", [])
+                    if fila.id not in cambiados_despues
+                ])
+                uow.commit()
+                break
+            except (IntegrityError, OperationalError) as e:
+                uow.rollback()
+                if not es_conflicto_concurrente(e):
+                    raise
+        else:
+            raise TurnoSolapamientoException(
+                "Los turnos fueron modificados por otra solicitud al mismo tiempo. Intente nuevamente."
+            )
+        
+        for clave in {
+            (fila.fecha_hora.date(), fila.id_medico, fila.id_especialidad)
+            for filas in modificados.values() for fila in filas
+        }:
+            cache_reportes.invalidar_turno(*clave)
+        return {codigo: sorted(fila.id for fila in filas) for codigo, filas in modificados.items()}
+
+    def marcar_inasistidos_vencidos(self, antes_de: datetime, lote: int) -> ResultadoBarrido:
+        """
+        Marca como INASISTIDO los turnos PEND/CONF que empezaron antes de la
+        fecha/hora indicada y nadie cerró (barrido de fin de día).
+        
+        Trabaja por lotes de a lo sumo `lote` turnos: cada lote es un UPDATE por
+        conjunto (ver TurnoRepository.cambiar_estado_lote) en su propia
+        transacción, de modo que los bloqueos duran poco y un corte deja
+        aplicados los lotes ya confirmados.
+        
+        Args:
+            antes_de: Solo turnos con fecha_hora anterior a este momento
+            lote: Cantidad máxima de turnos por UPDATE
+        
+        Returns:
+            Métricas del barrido (turnos actualizados, lotes y duración)
+        """
+        uow = self.uow
+        inicio = time.perf_counter()
+        estado_inas_id = uow.estados_turno.get_id_por_codigo("INAS")
+        origenes = uow.estados_turno.get_ids_por_codigos(["PEND", "CONF"])
+        if estado_inas_id is None or not origenes or lote <= 0:
+            return ResultadoBarrido(0, 0, 0.0)
+        
+        actualizados = lotes = 0
+        while True:
+            turno_ids = uow.turnos.get_ids_vencidos(origenes, antes_de, lote)
+            if not turno_ids:
+                break
+            
+            filas = uow.turnos.cambiar_estado_lote(turno_ids, estado_inas_id, origenes)
+            uow.commit()
+            for clave in {(f.fecha_hora.date(), f.id_medico, f.id_especialidad) for f in filas}:
+                cache_reportes.invalidar_turno(*clave)
+            
+            actualizados += len(filas)
+            lotes += 1
+            # Un lote incompleto es el último; uno sin cambios indica escrituras concurrentes
+            if len(turno_ids) < lote or not filas:
+                break
+        
+        return ResultadoBarrido(actualizados, lotes, time.perf_counter() - inicio)
+
     def listar_turnos_medico(
         self,
         medico_id: int,
@@ -318,37 +666,158 @@ class TurnoService:
                 f"El médico no tiene disponibilidad para los días {self._dia_nombre(dia_semana)}"
             )
         
-        # Obtener turnos existentes del médico para esa fecha
-        turnos_existentes = self.uow.turnos.get_por_medico_y_fecha(medico_id, fecha)
+        # Obtener bloqueos y turnos activos que pueden afectar la fecha
+        inicio_dia = datetime.combine(fecha, datetime.min.time())
+        fin_dia = inicio_dia + timedelta(days=1)
+        bloqueos = self.uow.bloqueos.get_por_medico(medico_id, fecha, fecha)
+        ocupados = self.uow.turnos.get_intervalos_ocupados([medico_id], inicio_dia, fin_dia)
         
-        # Generar slots disponibles
-        horarios_disponibles = []
+        # Generar slots disponibles con un único barrido sobre la agenda
+        motor = MotorDisponibilidad(disponibilidades, bloqueos, ocupados)
+        return motor.horarios_libres(medico_id, fecha, duracion_minutos)
+
+    def obtener_calendario_disponibilidad(
+        self,
+        medico_id: int,
+        fecha_desde: date,
+        dias: int = 14,
+        duracion_minutos: int = 30
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Obtiene el calendario de horarios disponibles de un médico para N días.
         
-        for disp in disponibilidades:
-            # Crear datetime desde la hora de inicio hasta la hora de fin
-            hora_actual = datetime.combine(fecha, disp.hora_desde)
-            hora_fin = datetime.combine(fecha, disp.hora_hasta)
+        Disponibilidades, bloqueos y turnos de toda la ventana se obtienen con
+        una cantidad fija de consultas y los slots se calculan en memoria,
+        sin importar la cantidad de días solicitados.
+        
+        Args:
+            medico_id: ID del médico
+            fecha_desde: Primer día del calendario
+            dias: Cantidad de días a incluir
+            duracion_minutos: Duración del turno en minutos
+        
+        Returns:
+            Diccionario {fecha ISO: {"horarios", "bloqueado", "motivo_bloqueo"}}
+            con los días bloqueados y los días con al menos un horario libre
+        
+        Raises:
+            EntityNotFoundException: Si el médico no existe
+        """
+        medico = self.uow.medicos.get_by_id(medico_id)
+        if not medico:
+            raise EntityNotFoundException("Médico", str(medico_id))
+        
+        fecha_hasta = fecha_desde + timedelta(days=dias)
+        inicio = datetime.combine(fecha_desde, datetime.min.time())
+        fin = datetime.combine(fecha_hasta, datetime.min.time())
+        
+        # Carga masiva de toda la ventana
+        disponibilidades = self.uow.disponibilidades.get_por_medico(medico_id)
+        bloqueos = self.uow.bloqueos.get_por_medico(medico_id, fecha_desde, fecha_hasta)
+        ocupados = self.uow.turnos.get_intervalos_ocupados([medico_id], inicio, fin)
+        
+        motor = MotorDisponibilidad(disponibilidades, bloqueos, ocupados)
+        calendario: Dict[str, Dict[str, Any]] = {}
+        
+        for i in range(dias):
+            fecha = fecha_desde + timedelta(days=i)
             
-            while hora_actual + timedelta(minutes=duracion_minutos) <= hora_fin:
-                # Verificar si hay solapamiento con turnos existentes
-                hay_solape = False
-                hora_fin_slot = hora_actual + timedelta(minutes=duracion_minutos)
-                
-                for turno in turnos_existentes:
-                    turno_fin = turno.fecha_hora + timedelta(minutes=turno.duracion_minutos)
-                    
-                    # Verificar solapamiento
-                    if not (hora_fin_slot <= turno.fecha_hora or hora_actual >= turno_fin):
-                        hay_solape = True
-                        break
-                
-                if not hay_solape:
-                    horarios_disponibles.append(hora_actual)
-                
-                # Avanzar al siguiente slot
-                hora_actual += timedelta(minutes=disp.duracion_slot or duracion_minutos)
+            bloqueo = next(
+                (b for b in bloqueos if b.inicio.date() <= fecha <= b.fin.date()),
+                None
+            )
+            if bloqueo is not None:
+                calendario[fecha.isoformat()] = {
+                    "horarios": [],
+                    "bloqueado": True,
+                    "motivo_bloqueo": bloqueo.motivo or "Médico no disponible"
+                }
+                continue
+            
+            horarios = motor.horarios_libres(medico_id, fecha, duracion_minutos)
+            if horarios:
+                calendario[fecha.isoformat()] = {
+                    "horarios": [h.isoformat() for h in horarios],
+                    "bloqueado": False,
+                    "motivo_bloqueo": None
+                }
+        
+        return calendario
+
+    def buscar_horarios_por_especialidad(
+        self,
+        especialidad_id: int,
+        fecha_desde: date,
+        dias: int = 14,
+        limite: int = 10,
+        duracion_minutos: int = 30
+    ) -> List[Dict[str, Any]]:
+        """
+        Busca los primeros horarios libres de una especialidad entre todos sus médicos.
+        
+        Las agendas de todos los médicos se cargan con una cantidad fija de
+        consultas y se recorren día por día hasta completar el límite pedido.
+        
+        Args:
+            especialidad_id: ID de la especialidad
+            fecha_desde: Primer día de búsqueda
+            dias: Cantidad de días a explorar
+            limite: Cantidad máxima de horarios a devolver
+            duracion_minutos: Duración del turno en minutos
+        
+        Returns:
+            Lista de {"fecha_hora", "id_medico", "medico"} ordenada por fecha/hora
+        
+        Raises:
+            EntityNotFoundException: Si la especialidad no existe
+        """
+        especialidad = self.uow.especialidades.get_by_id(especialidad_id)
+        if especialidad is None:
+            raise EntityNotFoundException("Especialidad", str(especialidad_id))
+        
+        medicos = {m.id: m for m in self.uow.medicos.get_por_especialidad(especialidad_id)}
+        if not medicos:
+            return []
+        
+        medico_ids = list(medicos)
+        fecha_hasta = fecha_desde + timedelta(days=dias)
+        inicio = datetime.combine(fecha_desde, datetime.min.time())
+        fin = datetime.combine(fecha_hasta, datetime.min.time())
         
-        return horarios_disponibles
+        motor = MotorDisponibilidad(
+            self.uow.disponibilidades.get_por_medicos(medico_ids),
+            self.uow.bloqueos.get_por_medicos(medico_ids, fecha_desde, fecha_hasta),
+            self.uow.turnos.get_intervalos_ocupados(medico_ids, inicio, fin)
+        )
+        
+        ahora = datetime.now()
+        resultado: List[Dict[str, Any]] = []
+        
+        for i in range(dias):
+            fecha = fecha_desde + timedelta(days=i)
+            horarios_dia = heapq.merge(*(
+                ((h, medico_id) for h in motor.horarios_libres(medico_id, fecha, duracion_minutos))
+                for medico_id in medico_ids
+                if motor.atiende(medico_id, fecha)
+            ))
+            
+            for fecha_hora, medico_id in horarios_dia:
+                if fecha_hora <= ahora:
+                    continue
+                resultado.append({
+                    "fecha_hora": fecha_hora,
+                    "id_medico": medico_id,
+                    "medico": medicos[medico_id].nombre_completo
+                })
+                if len(resultado) >= limite:
+                    return resultado
+        
+        return resultado
+
+    @staticmethod
+    def _mensaje_alineacion() -> str:
+        """Error de un turno no alineado a los bloques de agenda (ver alineado_a_bloques)."""
+        return f"El turno debe empezar y durar múltiplos de {config.RESERVA_BLOQUE_MINUTOS} minutos"
 
     @staticmethod
     def _dia_nombre(dia_semana: int) -> str:
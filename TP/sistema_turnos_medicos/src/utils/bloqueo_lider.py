@@ -0,0 +1,70 @@
+"""
+Elección de líder entre procesos mediante un bloqueo de archivo.
+El sistema operativo libera el bloqueo si el proceso termina, por lo que
+otro proceso en espera puede tomar el liderazgo sin intervención manual.
+"""
+import os
+from pathlib import Path
+from typing import IO, Optional
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+class BloqueoArchivo:
+    """Bloqueo exclusivo y no bloqueante sobre un archivo."""
+
+    def __init__(self, ruta: Path):
+        """
+        Args:
+            ruta: Archivo usado como bloqueo (se crea si no existe)
+        """
+        self.ruta = Path(ruta)
+        self._archivo: Optional[IO] = None
+
+    @property
+    def adquirido(self) -> bool:
+        """Indica si este proceso tiene el bloqueo."""
+        return self._archivo is not None
+
+    def adquirir(self) -> bool:
+        """
+        Intenta tomar el bloqueo sin esperar.
+
+        Returns:
+            True si se obtuvo el bloqueo, False si lo tiene otro proceso
+        """
+        if self._archivo is not None:
+            return True
+
+        self.ruta.parent.mkdir(parents=True, exist_ok=True)
+        archivo = open(self.ruta, "a+")
+        try:
+            if os.name == "nt":
+                archivo.seek(0)
+                msvcrt.locking(archivo.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(archivo.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            archivo.close()
+            return False
+
+        self._archivo = archivo
+        return True
+
+    def liberar(self) -> None:
+        """Libera el bloqueo si este proceso lo tiene."""
+        if self._archivo is None:
+            return
+
+        try:
+            if os.name == "nt":
+                self._archivo.seek(0)
+                msvcrt.locking(self._archivo.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._archivo.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._archivo.close()
+            self._archivo = None
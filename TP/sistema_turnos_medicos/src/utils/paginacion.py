@@ -0,0 +1,56 @@
+"""
+Cursores opacos para paginación por clave (keyset pagination).
+El cliente recibe un token y lo devuelve tal cual para pedir la página siguiente.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+from .exceptions import ValidationException
+
+
+def _codificar(valores: list) -> str:
+    datos = json.dumps(valores, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(datos).decode("ascii").rstrip("=")
+
+
+def _decodificar(cursor: str) -> list:
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        valores = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+    except (ValueError, TypeError):
+        raise ValidationException("Cursor de paginación inválido")
+    if not isinstance(valores, list):
+        raise ValidationException("Cursor de paginación inválido")
+    return valores
+
+
+def codificar_cursor_id(entity_id: int) -> str:
+    """Genera un cursor a partir del ID del último elemento de la página."""
+    return _codificar([entity_id])
+
+
+def decodificar_cursor_id(cursor: str) -> int:
+    """Obtiene el ID contenido en un cursor generado por codificar_cursor_id."""
+    valores = _decodificar(cursor)
+    if len(valores) != 1 or not isinstance(valores[0], int):
+        raise ValidationException("Cursor de paginación inválido")
+    return valores[0]
+
+
+def codificar_cursor_turno(fecha_hora: datetime, turno_id: int) -> str:
+    """Genera un cursor a partir de (fecha_hora, id) del último turno de la página."""
+    return _codificar([fecha_hora.isoformat(), turno_id])
+
+
+def decodificar_cursor_turno(cursor: str) -> Tuple[datetime, int]:
+    """Obtiene (fecha_hora, id) de un cursor generado por codificar_cursor_turno."""
+    valores = _decodificar(cursor)
+    try:
+        fecha_iso, turno_id = valores
+        if not isinstance(turno_id, int):
+            raise ValueError
+        return datetime.fromisoformat(fecha_iso), turno_id
+    except (ValueError, TypeError):
+        raise ValidationException("Cursor de paginación inválido")
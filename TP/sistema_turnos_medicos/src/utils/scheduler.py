@@ -2,50 +2,146 @@
 Planificador de tareas en segundo plano.
 """
 import asyncio
-from datetime import datetime, timedelta
+import os
+from datetime import datetime, time, timedelta
+from typing import Optional
+from src.config.settings import config
 from src.repositories.unit_of_work import UnitOfWork
+from src.services.archivo_service import ArchivoService
 from src.services.email_service import EmailService
+from src.services.recordatorio_service import RecordatorioService
+from src.services.turno_service import TurnoService
+from src.utils.bloqueo_lider import BloqueoArchivo
 
-async def check_upcoming_appointments():
+
+def preparar_cola_recordatorios() -> None:
+    """
+    Deja la cola de recordatorios consistente al tomar el liderazgo:
+    devuelve a PENDIENTE los lotes que quedaron a medio enviar y encola
+    los recordatorios faltantes de turnos ya confirmados.
+    """
+    with UnitOfWork() as uow:
+        liberados = uow.recordatorios.liberar_reclamados()
+        creados = RecordatorioService(uow).programar_faltantes()
+        uow.commit()
+    
+    if liberados or creados:
+        print(f"[Scheduler] Recordatorios liberados: {liberados}, encolados: {creados}")
+
+
+def despachar_recordatorios() -> Optional[datetime]:
+    """
+    Envía todos los recordatorios vencidos, lote por lote.
+    
+    Returns:
+        Fecha/hora del próximo recordatorio pendiente, o None si no hay
+    """
+    email_service = EmailService()
+    with UnitOfWork() as uow:
+        servicio = RecordatorioService(uow)
+        while True:
+            enviados, errores = servicio.despachar_pendientes(email_service, config.RECORDATORIOS_LOTE)
+            if enviados or errores:
+                print(f"[Scheduler] Recordatorios enviados: {enviados}, con error: {errores}")
+            if enviados + errores < config.RECORDATORIOS_LOTE:
+                break
+        
+        return servicio.proximo_envio()
+
+
+def barrer_turnos_vencidos() -> None:
     """
-    Verifica turnos próximos (24h) y envía recordatorios.
-    Esta función se ejecutará periódicamente.
+    Marca como INASISTIDO los turnos PEND/CONF que empezaron hace más de
+    BARRIDO_INASISTENCIAS_MARGEN minutos, en lotes de BARRIDO_INASISTENCIAS_LOTE.
     """
-    print("Ejecutando chequeo de recordatorios...")
+    antes_de = datetime.now() - timedelta(minutes=config.BARRIDO_INASISTENCIAS_MARGEN)
+    with UnitOfWork() as uow:
+        resultado = TurnoService(uow).marcar_inasistidos_vencidos(antes_de, config.BARRIDO_INASISTENCIAS_LOTE)
+    
+    print(
+        f"[Scheduler] Barrido de inasistencias: {resultado.actualizados} turnos "
+        f"en {resultado.lotes} lotes ({resultado.segundos:.2f} s)"
+    )
+
+
+def archivar_historicos() -> None:
+    """
+    Mueve al archivo los turnos cerrados más viejos que ARCHIVO_HORIZONTE_DIAS,
+    en lotes de ARCHIVO_LOTE.
+    """
+    if config.ARCHIVO_HORIZONTE_DIAS <= 0:
+        return
+    antes_de = datetime.now() - timedelta(days=config.ARCHIVO_HORIZONTE_DIAS)
+    with UnitOfWork() as uow:
+        resultado = ArchivoService(uow).archivar(antes_de, config.ARCHIVO_LOTE)
+    
+    if resultado.turnos:
+        print(
+            f"[Scheduler] Archivo histórico: {resultado.turnos} turnos, {resultado.consultas} consultas "
+            f"y {resultado.recordatorios} recordatorios en {resultado.lotes} lotes ({resultado.segundos:.2f} s)"
+        )
+
+
+def _proximo_barrido(ahora: datetime) -> Optional[datetime]:
+    """Próxima ejecución del barrido: hoy o mañana a BARRIDO_INASISTENCIAS_HORA (None si está deshabilitado)."""
+    if config.BARRIDO_INASISTENCIAS_LOTE <= 0:
+        return None
+    proximo = datetime.combine(ahora.date(), time(hour=config.BARRIDO_INASISTENCIAS_HORA % 24))
+    if proximo <= ahora:
+        proximo += timedelta(days=1)
+    return proximo
+
+
+def _segundos_hasta(*proximos: Optional[datetime]) -> float:
+    """Tiempo a dormir hasta la próxima tarea, acotado por RECORDATORIOS_ESPERA_MAXIMA."""
+    espera = float(config.RECORDATORIOS_ESPERA_MAXIMA)
+    for proximo in proximos:
+        if proximo is not None:
+            espera = min(espera, (proximo - datetime.now()).total_seconds())
+    return max(espera, 1.0)
+
+
+async def start_scheduler():
+    """
+    Inicia el loop del planificador.
+    Solo corre en el proceso que obtiene el bloqueo de líder; el resto queda
+    en espera y toma el relevo si el líder termina.
+    """
+    bloqueo = BloqueoArchivo(config.SCHEDULER_LOCK_PATH)
+    while not bloqueo.adquirir():
+        await asyncio.sleep(config.SCHEDULER_REINTENTO_LIDER)
+    
+    print(f"[Scheduler] Proceso {os.getpid()} elegido como líder")
+    cola_preparada = False
+    # Al tomar el liderazgo se barre una vez para cubrir los días en que no hubo líder
+    proximo_barrido = datetime.now() if config.BARRIDO_INASISTENCIAS_LOTE > 0 else None
     try:
-        # Usar context manager para inicializar repositorios
-        # UnitOfWork se encarga de obtener la sesión del DatabaseManager singleton
-        with UnitOfWork() as uow:
-            email_service = EmailService()
-            
-            # Definir rango de tiempo (ej. turnos entre 24h y 25h desde ahora)
-            ahora = datetime.now()
-            inicio_ventana = ahora + timedelta(hours=23, minutes=30)
-            fin_ventana = ahora + timedelta(hours=24, minutes=30)
-            
-            # Buscar turnos confirmados en ese rango
-            turnos = uow.turnos.get_turnos_en_rango(
-                fecha_inicio=inicio_ventana,
-                fecha_fin=fin_ventana,
-                solo_confirmados=True
-            )
+        while True:
+            try:
+                # BD y SMTP son bloqueantes: se ejecutan fuera del event loop
+                if not cola_preparada:
+                    await asyncio.to_thread(preparar_cola_recordatorios)
+                    cola_preparada = True
+                proximo = await asyncio.to_thread(despachar_recordatorios)
+            except Exception as e:
+                print(f"Error en job de recordatorios: {e}")
+                proximo = None
+                # Al reintentar se liberan los lotes que quedaron a medio enviar
+                cola_preparada = False
             
-            count = 0
-            for turno in turnos:
-                paciente = uow.pacientes.get_by_id(turno.id_paciente)
-                if paciente:
-                    email_service.enviar_recordatorio_turno(turno, paciente)
-                    count += 1
+            if proximo_barrido is not None and proximo_barrido <= datetime.now():
+                try:
+                    await asyncio.to_thread(barrer_turnos_vencidos)
+                except Exception as e:
+                    print(f"Error en job de barrido de inasistencias: {e}")
+                # El archivo corre después del barrido, con los turnos del día ya cerrados
+                try:
+                    await asyncio.to_thread(archivar_historicos)
+                except Exception as e:
+                    print(f"Error en job de archivo histórico: {e}")
+                proximo_barrido = _proximo_barrido(datetime.now())
             
-            if count > 0:
-                print(f"Se enviaron {count} recordatorios.")
-            
-    except Exception as e:
-        print(f"Error en job de recordatorios: {e}")
-
-async def start_scheduler():
-    """Inicia el loop del planificador."""
-    while True:
-        await check_upcoming_appointments()
-        # Esperar 1 hora antes del próximo chequeo
-        await asyncio.sleep(3600)
+            # Dormir hasta el próximo vencimiento en lugar de un intervalo fijo
+            await asyncio.sleep(_segundos_hasta(proximo, proximo_barrido))
+    finally:
+        bloqueo.liberar()
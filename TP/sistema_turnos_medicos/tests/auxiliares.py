@@ -0,0 +1,41 @@
+"""Funciones auxiliares de los tests."""
+from datetime import date, datetime, time, timedelta
+
+
+def proximo_dia_habil(dias: int = 7) -> date:
+    """Primer lunes a viernes a partir de `dias` días desde hoy."""
+    fecha = date.today() + timedelta(days=dias)
+    while fecha.weekday() > 4:
+        fecha += timedelta(days=1)
+    return fecha
+
+
+def a_las(fecha: date, hora: int, minuto: int = 0) -> datetime:
+    """Fecha/hora de un día a una hora dada."""
+    return datetime.combine(fecha, time(hora, minuto))
+
+
+def resumen_diario() -> list:
+    """Filas con cantidad > 0 del resumen diario, ordenadas."""
+    from sqlalchemy import select
+
+    from src.domain.estadistica_diaria import EstadisticaDiaria
+    from src.repositories.unit_of_work import UnitOfWork
+
+    with UnitOfWork() as uow:
+        return sorted(uow.session.execute(
+            select(
+                EstadisticaDiaria.fecha, EstadisticaDiaria.id_medico, EstadisticaDiaria.id_especialidad,
+                EstadisticaDiaria.id_estado, EstadisticaDiaria.cantidad
+            ).where(EstadisticaDiaria.cantidad > 0)
+        ).all())
+
+
+def resumen_reconstruido() -> list:
+    """Resumen diario recalculado desde cero a partir de los turnos."""
+    from src.repositories.unit_of_work import UnitOfWork
+
+    with UnitOfWork() as uow:
+        uow.estadisticas.reconstruir()
+        uow.commit()
+    return resumen_diario()
@@ -0,0 +1,67 @@
+"""
+Fixtures comunes de los tests.
+Cada test que usa la fixture `bd` corre sobre una base SQLite en memoria
+recién creada y cargada con los datos base (ver init_data).
+"""
+import os
+import sys
+from pathlib import Path
+
+# La configuración se lee al importarla: la URL debe definirse antes
+os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+
+from src.domain.base import Base
+from src.domain.medico import Medico
+from src.repositories.database import db_manager
+from src.repositories.init_data import inicializar_datos_base
+from src.repositories.migrations import metadata_migraciones
+from src.repositories.unit_of_work import UnitOfWork
+from src.services.cache_reportes import cache_reportes
+
+
+@pytest.fixture(scope="session")
+def motor():
+    """Motor SQLite en memoria compartido por toda la sesión de tests."""
+    db_manager.initialize()
+    yield db_manager.engine
+    db_manager.close()
+
+
+@pytest.fixture
+def bd(motor):
+    """Esquema vacío con los datos base; limpia el cache de reportes."""
+    Base.metadata.drop_all(motor)
+    metadata_migraciones.drop_all(motor)
+    db_manager.create_tables()
+    inicializar_datos_base()
+    cache_reportes.limpiar()
+    yield
+    cache_reportes.limpiar()
+
+
+@pytest.fixture
+def datos(bd):
+    """
+    IDs de referencia de los datos base: la médica que atiende de lunes a
+    viernes de 9 a 13 (Traumatología), un paciente y los estados de turno.
+    """
+    with UnitOfWork() as uow:
+        medico = uow.session.scalars(select(Medico).where(Medico.matricula == "MP98765")).one()
+        estados = {
+            codigo: uow.estados_turno.get_id_por_codigo(codigo)
+            for codigo in ("PEND", "CONF", "CANC", "ASIS", "INAS")
+        }
+        return SimpleNamespace(
+            medico_id=medico.id,
+            especialidad_id=medico.especialidades[0].id,
+            paciente_id=uow.pacientes.get_by_dni("35123456").id,
+            otro_paciente_id=uow.pacientes.get_by_dni("40987654").id,
+            estados=estados,
+        )
+
@@ -0,0 +1,132 @@
+"""Tests del archivo histórico de turnos."""
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from src.domain.archivo import ConsultaArchivada, RecordatorioArchivado, TurnoArchivado
+from src.domain.consulta import Consulta
+from src.domain.receta import Receta
+from src.domain.recordatorio import Recordatorio
+from src.domain.turno import Turno
+from src.repositories.unit_of_work import UnitOfWork
+from src.services.archivo_service import ArchivoService
+from src.services.cache_reportes import cache_reportes
+from src.services.reporte_service import ReporteService
+from tests.auxiliares import a_las, resumen_diario
+
+HACE_TRES_ANIOS = date.today() - timedelta(days=3 * 365)
+HACE_UNA_SEMANA = date.today() - timedelta(days=7)
+HORIZONTE = datetime.now() - timedelta(days=730)
+
+
+@pytest.fixture
+def turnos(datos):
+    """
+    Turnos viejos en cada situación más uno reciente. Retorna {nombre: id}:
+    se archivan "asistido" (con consulta), "inasistido", "cancelado" (con
+    recordatorio) y "baja"; quedan "pendiente", "con_receta" y "reciente".
+    """
+    casos = {
+        "asistido": (HACE_TRES_ANIOS, 9, "ASIS"),
+        "inasistido": (HACE_TRES_ANIOS, 10, "INAS"),
+        "cancelado": (HACE_TRES_ANIOS + timedelta(days=1), 9, "CANC"),
+        "baja": (HACE_TRES_ANIOS + timedelta(days=1), 10, "PEND"),
+        "pendiente": (HACE_TRES_ANIOS + timedelta(days=2), 9, "PEND"),
+        "con_receta": (HACE_TRES_ANIOS + timedelta(days=2), 10, "ASIS"),
+        "reciente": (HACE_UNA_SEMANA, 9, "ASIS"),
+    }
+    with UnitOfWork() as uow:
+        creados = uow.turnos.agregar_lote([
+            dict(id_paciente=datos.paciente_id, id_medico=datos.medico_id, id_especialidad=datos.especialidad_id,
+                 id_estado=datos.estados[codigo], fecha_hora=a_las(dia, hora), duracion_minutos=30)
+            for dia, hora, codigo in casos.values()
+        ])
+        ids = {nombre: turno.id for nombre, turno in zip(casos, creados)}
+        creados[list(casos).index("baja")].soft_delete()
+
+        for nombre in ("asistido", "con_receta"):
+            uow.session.add(Consulta(id_turno=ids[nombre], motivo="Control", fecha_atencion=a_las(casos[nombre][0], 9)))
+        uow.flush()
+        consulta_id = uow.session.scalar(select(Consulta.id).where(Consulta.id_turno == ids["con_receta"]))
+        uow.session.add(Receta(id_consulta=consulta_id))
+        uow.session.add(Recordatorio(
+            id_turno=ids["cancelado"], programado_para=a_las(HACE_TRES_ANIOS, 9), estado="ENVIADO"
+        ))
+        uow.commit()
+    return ids
+
+
+def _vigentes_y_archivados():
+    with UnitOfWork() as uow:
+        return (
+            set(uow.session.scalars(select(Turno.id))),
+            set(uow.session.scalars(select(TurnoArchivado.id))),
+        )
+
+
+def _consultas(datos, desde):
+    """Listados y reportes que pueden leer el archivo, calculados sin cache."""
+    cache_reportes.limpiar()
+    hasta = date.today()
+    reportes = ReporteService()
+    with UnitOfWork() as uow:
+        return {
+            "medico": [(t.id, t.fecha_hora, t.estado.codigo) for t in uow.turnos.get_por_medico(
+                datos.medico_id, desde, hasta, solo_activos=False
+            )],
+            "paciente": [(t.id, t.fecha_hora, t.medico.id) for t in uow.turnos.get_por_paciente(
+                datos.paciente_id, desde, hasta
+            )],
+            "turnos_por_medico": reportes.get_turnos_por_medico(desde, hasta, datos.medico_id),
+            "turnos_por_especialidad": reportes.get_turnos_por_especialidad(desde, hasta),
+            "pacientes_atendidos": reportes.get_pacientes_atendidos(desde, hasta),
+            "asistencia": reportes.get_estadisticas_asistencia(desde, hasta),
+        }
+
+
+def test_archiva_solo_turnos_cerrados_sin_recetas(turnos):
+    with UnitOfWork() as uow:
+        resultado = ArchivoService(uow).archivar(HORIZONTE, lote=3)
+
+    assert (resultado.turnos, resultado.consultas, resultado.recordatorios, resultado.lotes) == (4, 1, 1, 2)
+    vigentes, archivados = _vigentes_y_archivados()
+    assert archivados == {turnos[n] for n in ("asistido", "inasistido", "cancelado", "baja")}
+    assert vigentes == {turnos[n] for n in ("pendiente", "con_receta", "reciente")}
+    with UnitOfWork() as uow:
+        assert uow.session.scalar(select(func.count()).select_from(Consulta)) == 1
+        assert uow.session.scalar(select(func.count()).select_from(ConsultaArchivada)) == 1
+        assert uow.session.scalar(select(func.count()).select_from(Recordatorio)) == 0
+        assert uow.session.scalar(select(func.count()).select_from(RecordatorioArchivado)) == 1
+
+    with UnitOfWork() as uow:
+        assert ArchivoService(uow).archivar(HORIZONTE, lote=3).turnos == 0
+
+
+@pytest.mark.parametrize("desde", [None, HACE_TRES_ANIOS, HACE_TRES_ANIOS + timedelta(days=1)])
+def test_listados_y_reportes_no_cambian_al_archivar(datos, turnos, desde):
+    desde = desde or HACE_TRES_ANIOS - timedelta(days=30)
+    antes = _consultas(datos, desde)
+    resumen_antes = resumen_diario()
+    assert turnos["cancelado"] in {turno_id for turno_id, _, _ in antes["medico"]}
+
+    with UnitOfWork() as uow:
+        ArchivoService(uow).archivar(HORIZONTE, lote=2)
+
+    assert _consultas(datos, desde) == antes
+    assert resumen_diario() == resumen_antes
+    with UnitOfWork() as uow:
+        uow.estadisticas.reconstruir()
+        uow.commit()
+    assert resumen_diario() == resumen_antes
+
+
+def test_rangos_recientes_no_leen_el_archivo(turnos):
+    with UnitOfWork() as uow:
+        assert not uow.archivo.alcanza(None)
+        ArchivoService(uow).archivar(HORIZONTE, lote=10)
+
+        assert uow.archivo.alcanza(None)
+        assert uow.archivo.alcanza(HACE_TRES_ANIOS + timedelta(days=1))
+        assert not uow.archivo.alcanza(HACE_TRES_ANIOS + timedelta(days=2))
+        assert not uow.archivo.alcanza(HACE_UNA_SEMANA)
@@ -0,0 +1,91 @@
+"""Tests del barrido de inasistencias (turnos vencidos que nadie cerró)."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from src.config.settings import config
+from src.domain.reserva_agenda import ReservaAgenda
+from src.repositories.unit_of_work import UnitOfWork
+from src.services.turno_service import TurnoService
+from src.utils.scheduler import _proximo_barrido
+from tests.auxiliares import a_las, proximo_dia_habil, resumen_diario, resumen_reconstruido
+
+AHORA = datetime(2026, 3, 10, 15, 0)
+
+
+@pytest.fixture
+def turnos(datos):
+    """
+    Turnos de días pasados en cada estado (cinco PEND/CONF vencidos) más
+    uno pendiente a futuro. Retorna {id: código de estado inicial}.
+    """
+    ayer = datetime.now().replace(hour=9, minute=0, second=0, microsecond=0) - timedelta(days=1)
+    estados = ["PEND", "CONF", "PEND", "CONF", "PEND", "ASIS", "CANC", "INAS"]
+    filas = [
+        dict(id_paciente=datos.paciente_id, id_medico=datos.medico_id, id_especialidad=datos.especialidad_id,
+             id_estado=datos.estados[codigo], fecha_hora=ayer + timedelta(minutes=30 * i), duracion_minutos=30)
+        for i, codigo in enumerate(estados)
+    ]
+    filas.append(dict(filas[0], fecha_hora=a_las(proximo_dia_habil(), 9)))
+    with UnitOfWork() as uow:
+        creados = uow.turnos.agregar_lote(filas)
+        uow.commit()
+        return {t.id: codigo for t, codigo in zip(creados, estados + ["PEND"])}
+
+
+def _barrer(lote: int):
+    with UnitOfWork() as uow:
+        return TurnoService(uow).marcar_inasistidos_vencidos(datetime.now(), lote)
+
+
+def _estados(turno_ids):
+    with UnitOfWork() as uow:
+        return {turno_id: uow.turnos.get_by_id(turno_id).estado.codigo for turno_id in turno_ids}
+
+
+@pytest.mark.parametrize("lote, lotes", [(2, 3), (4, 2), (5, 1), (500, 1)])
+def test_barrido_por_lotes(turnos, lote, lotes):
+    resultado = _barrer(lote)
+
+    assert (resultado.actualizados, resultado.lotes) == (5, lotes)
+    esperados = {
+        turno_id: "INAS" if codigo in ("PEND", "CONF") and i < 8 else codigo
+        for i, (turno_id, codigo) in enumerate(turnos.items())
+    }
+    assert _estados(turnos) == esperados
+    assert _barrer(lote).actualizados == 0
+
+
+def test_barrido_libera_la_agenda_y_mantiene_el_resumen(turnos):
+    _barrer(2)
+
+    # Solo conservan reserva el turno asistido y el futuro (INAS/CANC liberan la agenda)
+    with UnitOfWork() as uow:
+        assert set(uow.session.scalars(select(ReservaAgenda.id_turno))) == {
+            turno_id for i, (turno_id, codigo) in enumerate(turnos.items()) if codigo == "ASIS" or i == 8
+        }
+    assert resumen_diario() == resumen_reconstruido()
+
+
+def test_barrido_deshabilitado(turnos):
+    assert _barrer(0).actualizados == 0
+    assert set(_estados(turnos).values()) == {"PEND", "CONF", "ASIS", "CANC", "INAS"}
+
+
+@pytest.mark.parametrize("hora, esperado", [
+    (23, datetime(2026, 3, 10, 23, 0)),
+    (15, datetime(2026, 3, 11, 15, 0)),
+    (3, datetime(2026, 3, 11, 3, 0)),
+    (24, datetime(2026, 3, 11, 0, 0)),
+])
+def test_proximo_barrido(monkeypatch, hora, esperado):
+    monkeypatch.setattr(config, "BARRIDO_INASISTENCIAS_HORA", hora)
+
+    assert _proximo_barrido(AHORA) == esperado
+
+
+def test_proximo_barrido_deshabilitado(monkeypatch):
+    monkeypatch.setattr(config, "BARRIDO_INASISTENCIAS_LOTE", 0)
+
+    assert _proximo_barrido(AHORA) is None
@@ -0,0 +1,58 @@
+"""Tests de la configuración de los motores de base de datos."""
+import asyncio
+
+from sqlalchemy import create_engine, event, func, inspect, select
+
+from src.domain.base import Base
+from src.domain.paciente import Paciente
+from src.domain.turno import Turno
+from src.repositories.async_database import async_db_manager
+from src.repositories.database import db_manager, url_sqlite_compartida
+from src.repositories.migrations import MIGRACIONES, aplicar_migraciones
+from src.repositories.unit_of_work import UnitOfWork
+
+
+def test_url_en_memoria_se_vuelve_compartida():
+    for url in ("sqlite://", "sqlite:///:memory:", "sqlite+aiosqlite:///:memory:"):
+        compartida = url_sqlite_compartida(url)
+        assert "mode=memory" in compartida and "cache=shared" in compartida
+
+    assert url_sqlite_compartida("sqlite:///data/turnos.db") == "sqlite:///data/turnos.db"
+    assert url_sqlite_compartida("postgresql://u:p@host/db") == "postgresql://u:p@host/db"
+
+
+def test_motor_async_ve_la_misma_base_en_memoria(bd):
+    with UnitOfWork() as uow:
+        uow.pacientes.get_by_dni("35123456").soft_delete()
+        uow.commit()
+        esperados = uow.pacientes.count()
+
+    async def contar():
+        async_db_manager.initialize()
+        try:
+            async with async_db_manager.get_session() as session:
+                return await session.scalar(
+                    select(func.count()).select_from(Paciente).where(Paciente.activo.is_(True))
+                )
+        finally:
+            await async_db_manager.close()
+
+    assert db_manager.engine.url.query.get("mode") == "memory"
+    assert asyncio.run(contar()) == esperados == 3
+
+
+def test_base_nueva_no_crea_indices_para_borrarlos(tmp_path):
+    motor = create_engine(f"sqlite:///{tmp_path / 'nueva.db'}")
+    sentencias = []
+    event.listen(motor, "before_cursor_execute", lambda conn, cursor, sql, *args: sentencias.append(sql))
+    try:
+        Base.metadata.create_all(motor)
+        with motor.begin() as conn:
+            aplicadas = aplicar_migraciones(conn)
+        indices = {i["name"] for i in inspect(motor).get_indexes(Turno.__tablename__)}
+    finally:
+        motor.dispose()
+
+    assert [m.version for m in aplicadas] == [m.version for m in MIGRACIONES]
+    assert not [sql for sql in sentencias if "DROP INDEX" in sql.upper()]
+    assert {i.name for i in Turno.__table__.indexes} <= indices
@@ -0,0 +1,107 @@
+"""Tests del cache de resultados de reportes."""
+import importlib
+from datetime import date
+
+import pytest
+
+from src.config.settings import config
+from src.services.cache_reportes import ClaveReporte, cache_reportes
+
+# El paquete src.services reexporta la instancia con el mismo nombre que el módulo
+modulo = importlib.import_module("src.services.cache_reportes")
+
+ENERO = (date(2025, 1, 1), date(2025, 1, 31))
+
+
+@pytest.fixture(autouse=True)
+def cache_vacio(monkeypatch):
+    monkeypatch.setattr(config, "REPORTES_CACHE_TTL", 60)
+    monkeypatch.setattr(config, "REPORTES_CACHE_MAXIMO", 256)
+    cache_reportes.limpiar()
+    yield
+    cache_reportes.limpiar()
+
+
+def _clave(reporte="asistencia", medico_id=None, especialidad_id=None, rango=ENERO):
+    return ClaveReporte(reporte, *rango, medico_id, especialidad_id)
+
+
+def _contador():
+    """Función de cálculo que cuenta cuántas veces se llamó."""
+    llamadas = []
+
+    def calcular():
+        llamadas.append(1)
+        return len(llamadas)
+    return calcular, llamadas
+
+
+def test_reutiliza_el_resultado():
+    calcular, llamadas = _contador()
+
+    assert cache_reportes.obtener(_clave(), calcular) == 1
+    assert cache_reportes.obtener(_clave(), calcular) == 1
+    assert len(llamadas) == 1
+
+
+def test_rango_pasado_tambien_vence_por_ttl(monkeypatch):
+    ahora = [1000.0]
+    monkeypatch.setattr(modulo.time, "monotonic", lambda: ahora[0])
+    calcular, llamadas = _contador()
+
+    cache_reportes.obtener(_clave(), calcular)
+    ahora[0] += 59
+    cache_reportes.obtener(_clave(), calcular)
+    assert len(llamadas) == 1
+
+    ahora[0] += 2
+    assert cache_reportes.obtener(_clave(), calcular) == 2
+
+
+def test_invalidar_turno_solo_descarta_las_entradas_que_lo_cubren():
+    claves = [
+        _clave("a"),
+        _clave("b", medico_id=1),
+        _clave("c", medico_id=2),
+        _clave("d", especialidad_id=9),
+        _clave("e", rango=(date(2025, 2, 1), date(2025, 2, 28))),
+    ]
+    for clave in claves:
+        cache_reportes.obtener(clave, lambda: "valor")
+
+    assert cache_reportes.invalidar_turno(date(2025, 1, 15), 1, 3) == 2
+    assert len(cache_reportes) == 3
+
+    calcular, llamadas = _contador()
+    for clave in claves:
+        cache_reportes.obtener(clave, calcular)
+    assert len(llamadas) == 2
+
+
+def test_descarta_la_menos_usada(monkeypatch):
+    monkeypatch.setattr(config, "REPORTES_CACHE_MAXIMO", 2)
+    cache_reportes.obtener(_clave("a"), lambda: "a")
+    cache_reportes.obtener(_clave("b"), lambda: "b")
+    cache_reportes.obtener(_clave("a"), lambda: "otro")
+    cache_reportes.obtener(_clave("c"), lambda: "c")
+
+    assert cache_reportes.obtener(_clave("a"), lambda: "otro") == "a"
+    assert cache_reportes.obtener(_clave("b"), lambda: "nuevo") == "nuevo"
+
+
+def test_no_guarda_un_valor_calculado_durante_una_invalidacion():
+    def calcular():
+        cache_reportes.invalidar_turno(date(2025, 1, 10), 1, 1)
+        return "viejo"
+
+    assert cache_reportes.obtener(_clave(), calcular) == "viejo"
+    assert len(cache_reportes) == 0
+
+
+def test_deshabilitado_no_guarda(monkeypatch):
+    monkeypatch.setattr(config, "REPORTES_CACHE_MAXIMO", 0)
+    calcular, llamadas = _contador()
+    cache_reportes.obtener(_clave(), calcular)
+    cache_reportes.obtener(_clave(), calcular)
+
+    assert len(llamadas) == 2
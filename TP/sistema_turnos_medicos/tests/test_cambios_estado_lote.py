@@ -0,0 +1,101 @@
+"""Tests de los cambios de estado por lote (TurnoService.cambiar_estados_lote)."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from src.domain.recordatorio import Recordatorio
+from src.domain.reserva_agenda import ReservaAgenda
+from src.repositories.unit_of_work import UnitOfWork
+from src.services.turno_service import TurnoService
+from src.utils.exceptions import ValidationException
+from tests.auxiliares import a_las, proximo_dia_habil, resumen_diario, resumen_reconstruido
+
+
+@pytest.fixture
+def turno_ids(datos):
+    """Cuatro turnos pendientes consecutivos del próximo día hábil."""
+    inicio = a_las(proximo_dia_habil(), 9)
+    with UnitOfWork() as uow:
+        turnos = uow.turnos.agregar_lote([
+            dict(id_paciente=datos.paciente_id, id_medico=datos.medico_id, id_especialidad=datos.especialidad_id,
+                 id_estado=datos.estados["PEND"], fecha_hora=inicio + timedelta(minutes=30 * i), duracion_minutos=30)
+            for i in range(4)
+        ])
+        uow.commit()
+        return [t.id for t in turnos]
+
+
+def _cambiar(cambios):
+    with UnitOfWork() as uow:
+        return TurnoService(uow).cambiar_estados_lote(cambios)
+
+
+def _estados(turno_ids):
+    with UnitOfWork() as uow:
+        return [uow.turnos.get_by_id(turno_id).estado.codigo for turno_id in turno_ids]
+
+
+def _turnos_con_recordatorio():
+    with UnitOfWork() as uow:
+        return set(uow.session.scalars(select(Recordatorio.id_turno)))
+
+
+def _turnos_con_reserva():
+    with UnitOfWork() as uow:
+        return set(uow.session.scalars(select(ReservaAgenda.id_turno)))
+
+
+def test_estado_destino_invalido(turno_ids):
+    with pytest.raises(ValidationException, match="PEND"):
+        _cambiar({"CONF": turno_ids[:1], "PEND": turno_ids[1:2]})
+
+    assert _estados(turno_ids) == ["PEND"] * 4
+
+
+def test_solo_cambian_las_transiciones_permitidas(turno_ids):
+    assert _cambiar({"ASIS": turno_ids[:2]}) == {"ASIS": turno_ids[:2]}
+
+    # CONF solo desde PEND; CANC/INAS solo desde PEND o CONF; los IDs inexistentes se ignoran
+    modificados = _cambiar({"CONF": turno_ids + [999999], "CANC": turno_ids[:1], "INAS": turno_ids[1:3]})
+
+    assert modificados == {"CONF": turno_ids[2:], "CANC": [], "INAS": turno_ids[2:3]}
+    assert _estados(turno_ids) == ["ASIS", "ASIS", "INAS", "CONF"]
+    assert resumen_diario() == resumen_reconstruido()
+
+
+def test_no_se_cancelan_turnos_pasados(datos):
+    with UnitOfWork() as uow:
+        [turno] = uow.turnos.agregar_lote([dict(
+            id_paciente=datos.paciente_id, id_medico=datos.medico_id, id_especialidad=datos.especialidad_id,
+            id_estado=datos.estados["PEND"], fecha_hora=datetime.now() - timedelta(days=1), duracion_minutos=30
+        )])
+        uow.commit()
+        turno_id = turno.id
+
+    assert _cambiar({"CANC": [turno_id]}) == {"CANC": []}
+    assert _cambiar({"INAS": [turno_id]}) == {"INAS": [turno_id]}
+
+
+def test_cancelar_e_inasistir_liberan_la_agenda(datos, turno_ids):
+    assert _turnos_con_reserva() == set(turno_ids)
+
+    _cambiar({"CONF": turno_ids[:2], "CANC": turno_ids[:1], "INAS": turno_ids[2:3], "ASIS": turno_ids[3:]})
+
+    assert _turnos_con_reserva() == {turno_ids[1], turno_ids[3]}
+    with UnitOfWork() as uow:
+        TurnoService(uow).reservar_turno(
+            datos.otro_paciente_id, datos.medico_id, datos.especialidad_id, a_las(proximo_dia_habil(), 9)
+        )
+
+
+def test_recordatorios_solo_para_los_que_terminan_confirmados(turno_ids):
+    _cambiar({"CONF": turno_ids[:3], "CANC": turno_ids[:1]})
+
+    assert _estados(turno_ids) == ["CANC", "CONF", "CONF", "PEND"]
+    assert _turnos_con_recordatorio() == set(turno_ids[1:3])
+
+    # Volver a confirmar no cambia nada ni duplica recordatorios
+    assert _cambiar({"CONF": turno_ids[1:3]}) == {"CONF": []}
+    with UnitOfWork() as uow:
+        assert len(uow.session.scalars(select(Recordatorio)).all()) == 2
@@ -0,0 +1,58 @@
+"""Tests de los conteos con SELECT COUNT (BaseRepository.count y cantidad_turnos)."""
+from datetime import timedelta
+
+import pytest
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.exc import DetachedInstanceError
+
+from src.domain.medico import Medico
+from src.repositories.unit_of_work import UnitOfWork
+from tests.auxiliares import a_las, proximo_dia_habil
+
+
+@pytest.fixture
+def turnos(datos):
+    """Tres turnos del médico de prueba; el último dado de baja."""
+    inicio = a_las(proximo_dia_habil(), 9)
+    with UnitOfWork() as uow:
+        creados = uow.turnos.agregar_lote([
+            dict(id_paciente=datos.paciente_id, id_medico=datos.medico_id, id_especialidad=datos.especialidad_id,
+                 id_estado=datos.estados["PEND"], fecha_hora=inicio + timedelta(minutes=30 * i), duracion_minutos=30)
+            for i in range(3)
+        ])
+        creados[-1].soft_delete()
+        uow.commit()
+    return creados
+
+
+def test_count_solo_cuenta_activos(datos):
+    with UnitOfWork() as uow:
+        assert uow.pacientes.count() == 4
+        paciente = uow.pacientes.get_by_id(datos.paciente_id)
+        paciente.soft_delete()
+        uow.flush()
+        assert uow.pacientes.count() == 3
+
+
+def test_cantidad_turnos_con_sesion(datos, turnos):
+    with UnitOfWork() as uow:
+        assert uow.medicos.get_by_id(datos.medico_id).cantidad_turnos == 2
+        assert uow.pacientes.get_by_id(datos.paciente_id).cantidad_turnos == 2
+        assert uow.especialidades.get_by_id(datos.especialidad_id).cantidad_turnos == 2
+
+
+def test_cantidad_turnos_con_relacion_cargada_sin_sesion(datos, turnos):
+    with UnitOfWork() as uow:
+        medico = uow.session.get(Medico, datos.medico_id, options=[selectinload(Medico.turnos)])
+        uow.session.expunge(medico)
+
+    assert medico.cantidad_turnos == 2
+
+
+def test_cantidad_turnos_sin_sesion_ni_relacion_cargada(datos):
+    with UnitOfWork() as uow:
+        medico = uow.medicos.get_by_id(datos.medico_id)
+        uow.session.expunge(medico)
+
+    with pytest.raises(DetachedInstanceError):
+        medico.cantidad_turnos
@@ -0,0 +1,166 @@
+"""Tests del envío de correos por lotes contra un servidor SMTP local (aiosmtpd)."""
+import socket
+from email import message_from_bytes
+
+import pytest
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import AuthResult
+
+from src.services.email_service import EmailService, MensajeCorreo
+
+
+class ServidorPrueba:
+    """
+    Handler de aiosmtpd que guarda los mensajes recibidos y la sesión (conexión)
+    de cada uno. `respuestas` fuerza respuestas a RCPT por destinatario: una
+    lista que se consume de a una por intento (ej. ["451 ..."] falla solo el primero).
+    """
+
+    def __init__(self):
+        self.recibidos = []
+        self.sesiones = []
+        self.respuestas = {}
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        pendientes = self.respuestas.get(address)
+        if pendientes:
+            return pendientes.pop(0)
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.recibidos.append(message_from_bytes(envelope.content))
+        if not any(s is session for s in self.sesiones):
+            self.sesiones.append(session)
+        return "250 Message accepted for delivery"
+
+
+def _puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _rechazar_login(server, session, envelope, mechanism, auth_data):
+    return AuthResult(success=False, handled=False)
+
+
+def _levantar(authenticator=None):
+    handler = ServidorPrueba()
+    controller = Controller(
+        handler, hostname="127.0.0.1", port=_puerto_libre(),
+        authenticator=authenticator, auth_require_tls=False
+    )
+    controller.start()
+    return handler, controller
+
+
+@pytest.fixture
+def smtp(monkeypatch):
+    """Servidor SMTP local sin autenticación; retorna el handler."""
+    handler, controller = _levantar()
+    monkeypatch.setenv("SMTP_SERVER", controller.hostname)
+    monkeypatch.setenv("SMTP_PORT", str(controller.port))
+    monkeypatch.setenv("SMTP_STARTTLS", "false")
+    monkeypatch.setenv("SMTP_SIN_AUTENTICACION", "true")
+    monkeypatch.setenv("FROM_EMAIL", "turnos@localhost")
+    monkeypatch.setenv("SMTP_BACKOFF", "0")
+    monkeypatch.delenv("SMTP_USER", raising=False)
+    monkeypatch.delenv("SMTP_PASSWORD", raising=False)
+    yield handler
+    controller.stop()
+
+
+def _mensajes(cantidad: int):
+    return [
+        MensajeCorreo(f"paciente{i}@example.com", f"Asunto {i}", f"Cuerpo {i}", f"<p>Cuerpo {i}</p>", clave=i)
+        for i in range(cantidad)
+    ]
+
+
+def _servicio(monkeypatch, concurrencia: int = 1) -> EmailService:
+    monkeypatch.setenv("SMTP_CONCURRENCIA", str(concurrencia))
+    return EmailService()
+
+
+def test_una_sesion_por_lote(smtp, monkeypatch):
+    resultados = _servicio(monkeypatch).enviar_lote(_mensajes(5))
+
+    assert [r.enviado for r in resultados] == [True] * 5
+    assert [m["Subject"] for m in smtp.recibidos] == [f"Asunto {i}" for i in range(5)]
+    assert len(smtp.sesiones) == 1
+
+
+@pytest.mark.parametrize("concurrencia", [1, 3])
+def test_resultados_en_el_orden_de_los_mensajes(smtp, monkeypatch, concurrencia):
+    mensajes = _mensajes(7)
+
+    resultados = _servicio(monkeypatch, concurrencia).enviar_lote(mensajes)
+
+    assert [r.mensaje for r in resultados] == mensajes
+    assert sorted(m["To"] for m in smtp.recibidos) == sorted(m.destinatario for m in mensajes)
+    assert len(smtp.sesiones) == concurrencia
+
+
+def test_respuesta_4xx_se_reintenta(smtp, monkeypatch):
+    smtp.respuestas["paciente1@example.com"] = ["451 Try again later", "421 Service not available"]
+
+    resultados = _servicio(monkeypatch).enviar_lote(_mensajes(3))
+
+    assert [(r.enviado, r.intentos) for r in resultados] == [(True, 1), (True, 3), (True, 1)]
+    assert [m["To"] for m in smtp.recibidos] == [f"paciente{i}@example.com" for i in range(3)]
+
+
+def test_reintentos_agotados_se_reportan(smtp, monkeypatch):
+    smtp.respuestas["paciente0@example.com"] = ["451 Try again later"] * 3
+
+    [resultado, siguiente] = _servicio(monkeypatch).enviar_lote(_mensajes(2))
+
+    assert (resultado.enviado, resultado.intentos) == (False, 3)
+    assert "451" in resultado.error
+    assert siguiente.enviado
+
+
+def test_respuesta_5xx_falla_solo_ese_mensaje(smtp, monkeypatch):
+    smtp.respuestas["paciente1@example.com"] = ["550 No such user"]
+
+    resultados = _servicio(monkeypatch).enviar_lote(_mensajes(3))
+
+    assert [(r.enviado, r.intentos) for r in resultados] == [(True, 1), (False, 1), (True, 1)]
+    assert "550" in resultados[1].error
+    assert len(smtp.recibidos) == 2
+    assert len(smtp.sesiones) == 1
+
+
+def test_login_rechazado_se_reporta_por_mensaje(monkeypatch):
+    handler, controller = _levantar(authenticator=_rechazar_login)
+    monkeypatch.setenv("SMTP_SERVER", controller.hostname)
+    monkeypatch.setenv("SMTP_PORT", str(controller.port))
+    monkeypatch.setenv("SMTP_STARTTLS", "false")
+    monkeypatch.setenv("SMTP_USER", "turnos")
+    monkeypatch.setenv("SMTP_PASSWORD", "incorrecta")
+    try:
+        resultados = _servicio(monkeypatch).enviar_lote(_mensajes(3))
+    finally:
+        controller.stop()
+
+    assert [r.mensaje.clave for r in resultados] == [0, 1, 2]
+    assert not any(r.enviado for r in resultados)
+    assert all("535" in r.error for r in resultados)
+    assert handler.recibidos == []
+
+
+@pytest.mark.parametrize("variables, simula", [
+    ({}, True),
+    ({"SMTP_SERVER": "localhost"}, True),
+    ({"SMTP_USER": "turnos"}, True),
+    ({"SMTP_USER": "turnos", "SMTP_PASSWORD": "clave"}, False),
+    ({"SMTP_SERVER": "localhost", "SMTP_SIN_AUTENTICACION": "true"}, False),
+])
+def test_sin_credenciales_se_simula(monkeypatch, variables, simula):
+    for nombre in ("SMTP_SERVER", "SMTP_USER", "SMTP_PASSWORD", "SMTP_SIN_AUTENTICACION"):
+        monkeypatch.delenv(nombre, raising=False)
+    for nombre, valor in variables.items():
+        monkeypatch.setenv(nombre, valor)
+
+    assert EmailService().simular is simula
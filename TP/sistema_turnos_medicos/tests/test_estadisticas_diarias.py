@@ -0,0 +1,73 @@
+"""Tests del resumen diario mantenido en cada alta y cambio de estado."""
+from datetime import timedelta
+
+import pytest
+
+from src.repositories.unit_of_work import UnitOfWork
+from src.services.reporte_service import ReporteService
+from src.services.turno_service import TurnoService
+from tests.auxiliares import a_las, proximo_dia_habil, resumen_diario, resumen_reconstruido
+
+
+@pytest.fixture
+def turno_ids(datos):
+    """Seis turnos reservados uno por uno en dos días distintos."""
+    ids = []
+    for dia in (proximo_dia_habil(), proximo_dia_habil(14)):
+        for i in range(3):
+            with UnitOfWork() as uow:
+                turno = TurnoService(uow).reservar_turno(
+                    datos.paciente_id, datos.medico_id, datos.especialidad_id, a_las(dia, 9) + timedelta(minutes=30 * i)
+                )
+                ids.append(turno.id)
+    return ids
+
+
+def test_altas_coinciden_con_reconstruir(turno_ids):
+    incremental = resumen_diario()
+
+    assert sum(fila.cantidad for fila in incremental) == 6
+    assert incremental == resumen_reconstruido()
+
+
+def test_cambios_de_estado_coinciden_con_reconstruir(datos, turno_ids):
+    with UnitOfWork() as uow:
+        servicio = TurnoService(uow)
+        servicio.confirmar_turno(turno_ids[0])
+        servicio.cambiar_estados_lote({"CANC": turno_ids[:1]})
+        servicio.marcar_asistido(turno_ids[1])
+        servicio.marcar_inasistido(turno_ids[2])
+        servicio.cambiar_estados_lote({"CONF": turno_ids[3:5], "ASIS": [turno_ids[5]]})
+        servicio.cambiar_estados_lote({"INAS": turno_ids[3:4], "ASIS": turno_ids[4:5]})
+
+    incremental = resumen_diario()
+    assert incremental == resumen_reconstruido()
+
+    por_estado = {}
+    for fila in incremental:
+        por_estado[fila.id_estado] = por_estado.get(fila.id_estado, 0) + fila.cantidad
+    assert por_estado == {datos.estados["CANC"]: 1, datos.estados["ASIS"]: 3, datos.estados["INAS"]: 2}
+
+
+def test_reportes_leen_el_resumen(datos, turno_ids):
+    with UnitOfWork() as uow:
+        TurnoService(uow).cambiar_estados_lote({"ASIS": turno_ids[:2], "INAS": turno_ids[2:3]})
+
+    reportes = ReporteService()
+    desde, hasta = proximo_dia_habil(), proximo_dia_habil(14)
+
+    assert reportes.get_estadisticas_asistencia(desde, hasta) == {"asistencias": 2, "inasistencias": 1}
+    assert reportes.get_estadisticas_asistencia(desde, desde, medico_id=datos.medico_id) == {
+        "asistencias": 2, "inasistencias": 1
+    }
+    assert reportes.get_turnos_por_especialidad(desde, hasta) == [{"especialidad": "Traumatología", "cantidad": 6}]
+
+
+def test_reconstruir_un_rango_conserva_el_resto(turno_ids):
+    completo = resumen_diario()
+    dia = proximo_dia_habil()
+    with UnitOfWork() as uow:
+        uow.estadisticas.reconstruir(desde=dia, hasta=dia)
+        uow.commit()
+
+    assert resumen_diario() == completo
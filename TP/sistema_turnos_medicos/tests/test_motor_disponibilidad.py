@@ -0,0 +1,73 @@
+"""Tests del motor de disponibilidad por intervalos."""
+from datetime import date, datetime, time
+
+from src.domain.disponibilidad import BloqueoMedico, DisponibilidadMedico
+from src.services.motor_disponibilidad import MotorDisponibilidad, fusionar_intervalos
+
+LUNES = date(2026, 1, 5)
+
+
+def _h(hora: int, minuto: int = 0) -> datetime:
+    return datetime.combine(LUNES, time(hora, minuto))
+
+
+def _motor(ocupados=(), bloqueos=(), duracion_slot=30) -> MotorDisponibilidad:
+    disponibilidad = DisponibilidadMedico(
+        id_medico=1, dia_semana=0, hora_desde=time(9, 0), hora_hasta=time(11, 0), duracion_slot=duracion_slot
+    )
+    return MotorDisponibilidad([disponibilidad], bloqueos, ocupados)
+
+
+def test_fusionar_intervalos_solapados_y_contiguos():
+    intervalos = [(_h(10), _h(11)), (_h(9), _h(9, 30)), (_h(9, 30), _h(9, 45)), (_h(10, 30), _h(10, 45))]
+
+    assert fusionar_intervalos(intervalos) == [(_h(9), _h(9, 45)), (_h(10), _h(11))]
+
+
+def test_fusionar_intervalos_disjuntos_se_conservan():
+    intervalos = [(_h(9), _h(9, 15)), (_h(9, 16), _h(9, 30))]
+
+    assert fusionar_intervalos(intervalos) == intervalos
+
+
+def test_horarios_libres_sin_turnos():
+    assert _motor().horarios_libres(1, LUNES) == [_h(9), _h(9, 30), _h(10), _h(10, 30)]
+
+
+def test_horarios_libres_excluye_turnos_y_bloqueos():
+    bloqueo = BloqueoMedico(id_medico=1, inicio=_h(10, 30), fin=_h(11))
+    motor = _motor(ocupados=[(1, _h(9, 30), 30)], bloqueos=[bloqueo])
+
+    assert motor.horarios_libres(1, LUNES) == [_h(9), _h(10)]
+
+
+def test_slot_adyacente_a_un_turno_queda_libre():
+    # Intervalos semiabiertos: un turno 9:00-9:30 no ocupa el slot de las 9:30
+    motor = _motor(ocupados=[(1, _h(9), 30)])
+
+    assert _h(9, 30) in motor.horarios_libres(1, LUNES)
+    assert not motor.esta_bloqueado(1, _h(9, 30), _h(10))
+    assert motor.esta_bloqueado(1, _h(9, 29), _h(10))
+
+
+def test_turno_parcial_ocupa_los_slots_que_toca():
+    motor = _motor(ocupados=[(1, _h(9, 20), 20)])
+
+    assert motor.horarios_libres(1, LUNES) == [_h(10), _h(10, 30)]
+
+
+def test_ocupar_actualiza_consultas_siguientes():
+    motor = _motor()
+    motor.ocupar(1, _h(10), _h(10, 30))
+
+    assert motor.horarios_libres(1, LUNES) == [_h(9), _h(9, 30), _h(10, 30)]
+    assert motor.esta_bloqueado(1, _h(10, 15), _h(10, 45))
+
+
+def test_dia_sin_disponibilidad():
+    motor = _motor()
+
+    assert not motor.atiende(1, date(2026, 1, 6))
+    assert motor.horarios_libres(1, date(2026, 1, 6)) == []
+    assert motor.atiende_en(1, _h(10, 59))
+    assert not motor.atiende_en(1, _h(11))
@@ -0,0 +1,127 @@
+"""Tests de la paginación por clave (cursores) de turnos y pacientes."""
+from datetime import timedelta
+
+import pytest
+
+from src.api.app import app
+from src.api.routes.turnos import _listar_mis_turnos
+from src.repositories.turno_repository import TurnoRepository
+from src.repositories.unit_of_work import UnitOfWork
+from src.utils.exceptions import ValidationException
+from src.utils.paginacion import (
+    codificar_cursor_id,
+    codificar_cursor_turno,
+    decodificar_cursor_id,
+    decodificar_cursor_turno,
+)
+from tests.auxiliares import a_las, proximo_dia_habil
+
+
+@pytest.fixture
+def turnos_ids(datos):
+    """Once turnos con horarios repetidos (empates en fecha_hora)."""
+    inicio = a_las(proximo_dia_habil(), 9)
+    with UnitOfWork() as uow:
+        turnos = uow.turnos.agregar_lote([
+            dict(id_paciente=datos.paciente_id, id_medico=datos.medico_id, id_especialidad=datos.especialidad_id,
+                 id_estado=datos.estados["CANC"], fecha_hora=inicio + timedelta(minutes=30 * (i // 3)),
+                 duracion_minutos=30)
+            for i in range(11)
+        ])
+        uow.commit()
+        return [t.id for t in turnos]
+
+
+def _recorrer_turnos(tamanio: int, descendente: bool):
+    """Pide páginas pasando el cursor por su forma codificada, como un cliente."""
+    vistos, cursor = [], None
+    with UnitOfWork() as uow:
+        while True:
+            clave = decodificar_cursor_turno(cursor) if cursor else None
+            pagina = uow.turnos.get_pagina_turnos([], limit=tamanio, cursor=clave, descendente=descendente)
+            vistos.extend(pagina)
+            if len(pagina) < tamanio:
+                return vistos
+            cursor = codificar_cursor_turno(pagina[-1].fecha_hora, pagina[-1].id)
+
+
+@pytest.mark.parametrize("descendente", [False, True])
+@pytest.mark.parametrize("tamanio", [1, 4, 11])
+def test_cursor_turnos_recorre_todo_sin_repetir(turnos_ids, tamanio, descendente):
+    vistos = _recorrer_turnos(tamanio, descendente)
+
+    claves = [(t.fecha_hora, t.id) for t in vistos]
+    assert sorted(t.id for t in vistos) == sorted(turnos_ids)
+    assert claves == sorted(claves, reverse=descendente)
+
+
+def test_cursor_pacientes_recorre_todo_sin_repetir(bd):
+    vistos, despues_de_id = [], None
+    with UnitOfWork() as uow:
+        while True:
+            pagina = uow.pacientes.get_pagina(limit=3, despues_de_id=despues_de_id)
+            vistos.extend(p.id for p in pagina)
+            if len(pagina) < 3:
+                break
+            despues_de_id = decodificar_cursor_id(codificar_cursor_id(pagina[-1].id))
+
+        assert vistos == sorted(p.id for p in uow.pacientes.get_all())
+
+
+@pytest.mark.parametrize("cursor", ["no-es-base64!", codificar_cursor_id(5), "W10"])
+def test_cursor_turno_invalido(cursor):
+    with pytest.raises(ValidationException):
+        decodificar_cursor_turno(cursor)
+
+
+@pytest.mark.parametrize("ruta", ["/api/pacientes/", "/api/turnos/"])
+def test_listados_paginados_exigen_limit_positivo(ruta):
+    parametros = {p["name"]: p["schema"] for p in app.openapi()["paths"][ruta]["get"]["parameters"]}
+
+    assert parametros["limit"]["minimum"] == 1
+    assert parametros["skip"]["minimum"] == 0
+
+
+@pytest.fixture
+def conteos(monkeypatch):
+    """Registra cada SELECT COUNT de turnos."""
+    llamadas = []
+    original = TurnoRepository.count_where
+
+    def count_where(repo, *condiciones):
+        llamadas.append(condiciones)
+        return original(repo, *condiciones)
+    monkeypatch.setattr(TurnoRepository, "count_where", count_where)
+    return llamadas
+
+
+def test_mis_turnos_cuenta_solo_si_se_pide_y_sin_cursor(datos, conteos):
+    inicio = a_las(proximo_dia_habil(), 9)
+    with UnitOfWork() as uow:
+        uow.turnos.agregar_lote([
+            dict(id_paciente=datos.paciente_id, id_medico=datos.medico_id, id_especialidad=datos.especialidad_id,
+                 id_estado=datos.estados["PEND"], fecha_hora=inicio + timedelta(minutes=30 * i), duracion_minutos=30)
+            for i in range(6)
+        ])
+        uow.commit()
+
+        sin_total = _listar_mis_turnos(uow, None, 1, 4, None, incluir_total=False)
+        assert (sin_total.total, sin_total.total_pages, len(sin_total.turnos)) == (None, None, 4)
+        assert conteos == []
+
+        primera = _listar_mis_turnos(uow, None, 1, 4, None, incluir_total=True)
+        assert (primera.total, primera.total_pages) == (6, 2)
+        assert len(conteos) == 1
+
+        # Al avanzar por cursor no se vuelve a contar aunque se pida el total
+        siguiente = _listar_mis_turnos(uow, None, 1, 4, primera.next_cursor, incluir_total=True)
+        assert (siguiente.total, len(siguiente.turnos)) == (None, 2)
+        assert len(conteos) == 1
+
+
+def test_mis_turnos_no_cuenta_por_defecto():
+    parametros = {
+        p["name"]: p["schema"] for p in app.openapi()["paths"]["/api/turnos/mis-turnos/listar"]["get"]["parameters"]
+    }
+
+    assert parametros["incluir_total"]["default"] is False
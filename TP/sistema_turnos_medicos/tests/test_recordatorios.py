@@ -0,0 +1,89 @@
+"""Tests de la cola de recordatorios."""
+from datetime import timedelta
+
+import pytest
+
+from src.repositories.unit_of_work import UnitOfWork
+from src.services.email_service import EmailService
+from src.services.recordatorio_service import RecordatorioService
+from tests.auxiliares import a_las, proximo_dia_habil
+
+
+@pytest.fixture
+def turno(datos):
+    """Turno confirmado futuro: (id, fecha_hora)."""
+    with UnitOfWork() as uow:
+        creado, = uow.turnos.agregar_lote([dict(
+            id_paciente=datos.paciente_id, id_medico=datos.medico_id, id_especialidad=datos.especialidad_id,
+            id_estado=datos.estados["CONF"], fecha_hora=a_las(proximo_dia_habil(), 10), duracion_minutos=30
+        )])
+        uow.commit()
+        return creado.id, creado.fecha_hora
+
+
+def _reclamar(uow):
+    """Pasa a ENVIANDO todos los recordatorios pendientes, como el despachador."""
+    return uow.recordatorios.reclamar_pendientes(a_las(proximo_dia_habil(30), 0), 100)
+
+
+def _estados(turno_id):
+    with UnitOfWork() as uow:
+        return sorted(r.estado for r in uow.recordatorios.get_por_turno(turno_id))
+
+
+def test_no_duplica_un_recordatorio_en_cola(turno):
+    with UnitOfWork() as uow:
+        servicio = RecordatorioService(uow)
+        assert servicio.programar_recordatorio(*turno) is not None
+        assert servicio.programar_recordatorio(*turno) is None
+        assert servicio.programar_recordatorios([turno]) == 0
+        uow.commit()
+
+    assert _estados(turno[0]) == ["PENDIENTE"]
+
+
+@pytest.mark.parametrize("marcar", ["marcar_con_error", "marcar_enviados"])
+def test_reconfirmar_encola_otro_si_el_anterior_salio_de_la_cola(turno, marcar):
+    with UnitOfWork() as uow:
+        RecordatorioService(uow).programar_recordatorio(*turno)
+        uow.flush()
+        argumento = "fallo" if marcar == "marcar_con_error" else turno[1] - timedelta(days=1)
+        getattr(uow.recordatorios, marcar)(_reclamar(uow), argumento)
+        uow.commit()
+
+    with UnitOfWork() as uow:
+        assert RecordatorioService(uow).programar_recordatorio(*turno) is not None
+        uow.commit()
+
+    with UnitOfWork() as uow:
+        assert RecordatorioService(uow).programar_recordatorios([turno]) == 0
+
+    assert len(_estados(turno[0])) == 2
+
+
+def test_programar_faltantes_no_reenvia_los_enviados(turno):
+    with UnitOfWork() as uow:
+        servicio = RecordatorioService(uow)
+        assert servicio.programar_faltantes() == 1
+        uow.flush()
+        uow.recordatorios.marcar_enviados(_reclamar(uow), turno[1])
+        uow.commit()
+
+    assert _estados(turno[0]) == ["ENVIADO"]
+
+    with UnitOfWork() as uow:
+        assert RecordatorioService(uow).programar_faltantes() == 0
+
+
+def test_el_correo_por_filas_coincide_con_el_de_entidades(turno):
+    with UnitOfWork() as uow:
+        recordatorio = RecordatorioService(uow).programar_recordatorio(*turno)
+        uow.flush()
+        [fila] = uow.recordatorios.get_datos_envio([recordatorio.id])
+        entidad = uow.turnos.get_by_id_completo(turno[0])
+
+        por_filas, = EmailService().mensajes_recordatorio([fila])
+        por_entidades = EmailService().mensaje_recordatorio(entidad, entidad.paciente, recordatorio.id)
+
+    assert por_filas == por_entidades
+    assert f"Dr/a. {entidad.medico.nombre_completo}" in por_filas.cuerpo
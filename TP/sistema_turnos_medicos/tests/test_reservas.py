@@ -0,0 +1,181 @@
+"""Tests de la reserva de agenda por bloques y de la reserva de turnos."""
+import sqlite3
+from datetime import datetime, time, timedelta
+
+import pytest
+from pydantic import ValidationError as PydanticValidationError
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from src.api.schemas import DisponibilidadCreate, DisponibilidadUpdate, TurnoCreate
+from src.config.settings import config
+from src.domain.reserva_agenda import ReservaAgenda
+from src.domain.turno import Turno
+from src.repositories.database import es_conflicto_concurrente
+from src.repositories.reserva_agenda_repository import bloques_agenda
+from src.repositories.unit_of_work import UnitOfWork
+from src.services.turno_service import SolicitudTurno, TurnoService
+from src.utils.exceptions import TurnoSolapamientoException, ValidationException
+from tests.auxiliares import a_las, proximo_dia_habil
+
+
+def _minutos(fecha_hora: datetime, duracion: int):
+    return [b.strftime("%H:%M") for b in bloques_agenda(fecha_hora, duracion)]
+
+
+def test_bloques_solo_los_cubiertos_por_completo():
+    dia = proximo_dia_habil()
+
+    assert _minutos(a_las(dia, 10), 15) == ["10:00", "10:05", "10:10"]
+    assert _minutos(a_las(dia, 10), 17) == ["10:00", "10:05", "10:10"]
+    assert _minutos(a_las(dia, 10, 17), 30) == ["10:20", "10:25", "10:30", "10:35", "10:40"]
+
+
+def _reservar(datos, fecha_hora, duracion, paciente_id=None):
+    with UnitOfWork() as uow:
+        return TurnoService(uow).reservar_turno(
+            paciente_id or datos.paciente_id, datos.medico_id, datos.especialidad_id, fecha_hora, duracion
+        )
+
+
+@pytest.mark.parametrize("hora, minuto, duracion", [(10, 2, 15), (10, 0, 17), (10, 7, 30)])
+def test_turno_no_alineado_a_los_bloques_se_rechaza(datos, hora, minuto, duracion):
+    fecha_hora = a_las(proximo_dia_habil(), hora, minuto)
+
+    with pytest.raises(ValidationException, match="múltiplos de 5 minutos"):
+        _reservar(datos, fecha_hora, duracion)
+    with UnitOfWork() as uow:
+        [resultado] = TurnoService(uow).reservar_turnos_lote([
+            SolicitudTurno(datos.paciente_id, datos.medico_id, datos.especialidad_id, fecha_hora, duracion)
+        ])
+    assert resultado.error.startswith("El turno debe empezar y durar múltiplos")
+
+
+@pytest.mark.parametrize("inicio, duracion, siguiente, duracion_siguiente", [
+    ((10, 0), 15, (10, 15), 30),
+    ((10, 5), 20, (10, 25), 15),
+    ((11, 0), 45, (11, 45), 15),
+])
+def test_turnos_contiguos_no_comparten_bloques(datos, inicio, duracion, siguiente, duracion_siguiente):
+    dia = proximo_dia_habil()
+    _reservar(datos, a_las(dia, *inicio), duracion)
+    _reservar(datos, a_las(dia, *siguiente), duracion_siguiente, datos.otro_paciente_id)
+
+    with UnitOfWork() as uow:
+        assert uow.turnos.count() == 2
+
+
+def test_turno_superpuesto_se_rechaza(datos):
+    dia = proximo_dia_habil()
+    _reservar(datos, a_las(dia, 10), 20)
+
+    with pytest.raises(TurnoSolapamientoException, match="médico ya tiene un turno"):
+        _reservar(datos, a_las(dia, 10, 15), 30, datos.otro_paciente_id)
+
+
+@pytest.mark.parametrize("inicio, duracion, siguiente", [((10, 0), 30, (10, 10)), ((10, 0), 15, (10, 10))])
+def test_la_bd_rechaza_bloques_compartidos_sin_pasar_por_las_validaciones(datos, inicio, duracion, siguiente):
+    """
+    Simula una reserva concurrente: la segunda no ve el turno de la primera.
+    Con turnos alineados, cualquier solape (aun de un solo bloque) comparte una fila.
+    """
+    dia = proximo_dia_habil()
+    _reservar(datos, a_las(dia, *inicio), duracion)
+
+    with UnitOfWork() as uow:
+        turno = Turno(
+            id_paciente=datos.otro_paciente_id, id_medico=datos.medico_id, id_especialidad=datos.especialidad_id,
+            id_estado=datos.estados["PEND"], fecha_hora=a_las(dia, *siguiente), duracion_minutos=30
+        )
+        with pytest.raises(IntegrityError):
+            uow.turnos.agregar(turno)
+            uow.flush()
+
+
+def test_cancelar_libera_los_bloques(datos):
+    dia = proximo_dia_habil()
+    turno = _reservar(datos, a_las(dia, 10), 30)
+    with UnitOfWork() as uow:
+        TurnoService(uow).cambiar_estados_lote({"CANC": [turno.id]})
+
+    with UnitOfWork() as uow:
+        assert uow.session.scalars(select(ReservaAgenda)).all() == []
+    _reservar(datos, a_las(dia, 10), 30, datos.otro_paciente_id)
+
+
+class _ErrorDriver(Exception):
+    """Error de driver con código, como los de psycopg o pymysql."""
+
+    def __init__(self, *args, pgcode=None):
+        super().__init__(*args)
+        self.pgcode = pgcode
+
+
+@pytest.mark.parametrize("error, reintenta", [
+    (IntegrityError("INSERT", {}, sqlite3.IntegrityError("UNIQUE constraint failed")), True),
+    (OperationalError("INSERT", {}, sqlite3.OperationalError("database is locked")), True),
+    (OperationalError("INSERT", {}, _ErrorDriver("could not obtain lock", pgcode="55P03")), True),
+    (OperationalError("INSERT", {}, _ErrorDriver(1205, "Lock wait timeout exceeded")), True),
+    (OperationalError("INSERT", {}, sqlite3.OperationalError("no such table: turnos")), False),
+    (OperationalError("INSERT", {}, sqlite3.OperationalError("disk I/O error")), False),
+    (OperationalError("SELECT", {}, _ErrorDriver("server closed the connection", pgcode="08006")), False),
+])
+def test_es_conflicto_concurrente(error, reintenta):
+    assert es_conflicto_concurrente(error) is reintenta
+
+
+def _commit_que_falla(monkeypatch, error):
+    """Hace fallar cada commit de UnitOfWork con el error dado; retorna la lista de intentos."""
+    intentos = []
+
+    def commit(uow):
+        intentos.append(1)
+        raise error
+    monkeypatch.setattr(UnitOfWork, "commit", commit)
+    return intentos
+
+
+def test_reservar_reintenta_ante_bloqueo(datos, monkeypatch):
+    intentos = _commit_que_falla(
+        monkeypatch, OperationalError("INSERT", {}, sqlite3.OperationalError("database is locked"))
+    )
+
+    with pytest.raises(TurnoSolapamientoException):
+        _reservar(datos, a_las(proximo_dia_habil(), 10), 30)
+    assert len(intentos) == config.RESERVA_REINTENTOS
+
+
+def test_reservar_propaga_otros_errores_de_la_bd(datos, monkeypatch):
+    intentos = _commit_que_falla(
+        monkeypatch, OperationalError("INSERT", {}, sqlite3.OperationalError("disk I/O error"))
+    )
+
+    with pytest.raises(OperationalError):
+        _reservar(datos, a_las(proximo_dia_habil(), 10), 30)
+    assert len(intentos) == 1
+
+
+@pytest.mark.parametrize("campos", [
+    dict(fecha_hora=a_las(proximo_dia_habil(), 10, 2)),
+    dict(fecha_hora=a_las(proximo_dia_habil(), 10).replace(second=30)),
+    dict(duracion_minutos=17),
+])
+def test_la_api_exige_turnos_alineados(campos):
+    valores = dict(id_paciente=1, id_medico=1, id_especialidad=1, fecha_hora=a_las(proximo_dia_habil(), 10))
+    TurnoCreate(**valores)
+
+    with pytest.raises(PydanticValidationError, match="múltiplo de 5 minutos"):
+        TurnoCreate(**dict(valores, **campos))
+
+
+@pytest.mark.parametrize("campos", [dict(hora_desde=time(9, 10)), dict(duracion_slot=25)])
+def test_la_api_acepta_disponibilidades_alineadas(campos):
+    DisponibilidadCreate(**dict(dict(dia_semana=1, hora_desde=time(9), hora_hasta=time(13)), **campos))
+
+
+@pytest.mark.parametrize("campos", [dict(hora_desde=time(9, 12)), dict(duracion_slot=17)])
+def test_la_api_rechaza_disponibilidades_no_alineadas(campos):
+    with pytest.raises(PydanticValidationError, match="múltiplos de 5 minutos"):
+        DisponibilidadCreate(**dict(dict(dia_semana=1, hora_desde=time(9), hora_hasta=time(13)), **campos))
+    with pytest.raises(PydanticValidationError, match="múltiplos de 5 minutos"):
+        DisponibilidadUpdate(**campos)
@@ -0,0 +1,93 @@
+"""Tests de la reserva de turnos en lote y de los bloqueos de agenda."""
+import pytest
+
+from src.domain.disponibilidad import BloqueoMedico
+from src.repositories.unit_of_work import UnitOfWork
+from src.services.turno_service import SolicitudTurno, TurnoService
+from src.utils.exceptions import DisponibilidadException
+from tests.auxiliares import a_las, proximo_dia_habil
+
+MENSAJE_BLOQUEO = "El médico tiene un bloqueo en ese horario"
+
+
+@pytest.fixture
+def bloqueo(datos):
+    """Bloqueo de la médica de prueba de 10:00 a 11:00 del próximo día hábil."""
+    dia = proximo_dia_habil()
+    with UnitOfWork() as uow:
+        uow.bloqueos.add(BloqueoMedico(
+            id_medico=datos.medico_id, inicio=a_las(dia, 10), fin=a_las(dia, 11), motivo="Capacitación"
+        ))
+        uow.commit()
+    return dia
+
+
+def _solicitud(datos, fecha_hora, duracion=30, paciente_id=None):
+    return SolicitudTurno(paciente_id or datos.paciente_id, datos.medico_id, datos.especialidad_id, fecha_hora, duracion)
+
+
+def _reservar_lote(solicitudes):
+    with UnitOfWork() as uow:
+        return TurnoService(uow).reservar_turnos_lote(solicitudes)
+
+
+@pytest.mark.parametrize("hora, minuto", [(10, 0), (10, 45), (9, 45)])
+def test_turno_en_bloqueo_se_rechaza_individual_y_en_lote(datos, bloqueo, hora, minuto):
+    fecha_hora = a_las(bloqueo, hora, minuto)
+
+    with UnitOfWork() as uow:
+        with pytest.raises(DisponibilidadException, match=MENSAJE_BLOQUEO):
+            TurnoService(uow).crear_turno(datos.paciente_id, datos.medico_id, datos.especialidad_id, fecha_hora)
+
+    [resultado] = _reservar_lote([_solicitud(datos, fecha_hora)])
+    assert resultado.turno is None
+    assert resultado.error.startswith(MENSAJE_BLOQUEO)
+
+
+@pytest.mark.parametrize("individual, en_lote", [((9, 30), (11, 0)), ((11, 0), (9, 30))])
+def test_turno_contiguo_a_un_bloqueo_se_acepta_individual_y_en_lote(datos, bloqueo, individual, en_lote):
+    with UnitOfWork() as uow:
+        TurnoService(uow).reservar_turno(
+            datos.paciente_id, datos.medico_id, datos.especialidad_id, a_las(bloqueo, *individual)
+        )
+
+    [resultado] = _reservar_lote([_solicitud(datos, a_las(bloqueo, *en_lote), paciente_id=datos.otro_paciente_id)])
+    assert resultado.error is None
+
+
+def test_lote_devuelve_un_resultado_por_solicitud_en_orden(datos):
+    dia = proximo_dia_habil()
+    solicitudes = [
+        _solicitud(datos, a_las(dia, 11)),
+        _solicitud(datos, a_las(dia, 9)),
+        _solicitud(datos, a_las(dia, 9, 15), paciente_id=datos.otro_paciente_id),  # se solapa con la anterior
+        _solicitud(datos, a_las(dia, 10), paciente_id=datos.otro_paciente_id),
+    ]
+
+    resultados = _reservar_lote(solicitudes)
+
+    assert [r.solicitud for r in resultados] == solicitudes
+    assert [r.error is None for r in resultados] == [True, True, False, True]
+    for resultado in (r for r in resultados if r.turno):
+        assert (resultado.turno.fecha_hora, resultado.turno.id_paciente) == (
+            resultado.solicitud.fecha_hora, resultado.solicitud.paciente_id
+        )
+
+
+def test_agregar_lote_respeta_el_orden_con_claves_repetidas(datos):
+    # Turnos cancelados: no reservan agenda, así que pueden repetir (médico, fecha_hora)
+    fecha_hora = a_las(proximo_dia_habil(), 9)
+    filas = [
+        dict(id_paciente=paciente_id, id_medico=datos.medico_id, id_especialidad=datos.especialidad_id,
+             id_estado=datos.estados["CANC"], fecha_hora=fecha_hora, duracion_minutos=30, observaciones=str(i))
+        for i, paciente_id in enumerate([datos.paciente_id, datos.otro_paciente_id] * 3)
+    ]
+
+    with UnitOfWork() as uow:
+        turnos = uow.turnos.agregar_lote(filas)
+        uow.commit()
+
+        assert [t.observaciones for t in turnos] == [f["observaciones"] for f in filas]
+        assert [t.id_paciente for t in turnos] == [f["id_paciente"] for f in filas]
+        assert len({t.id for t in turnos}) == len(filas)
+        assert [uow.turnos.get_by_id(t.id).observaciones for t in turnos] == [f["observaciones"] for f in filas]